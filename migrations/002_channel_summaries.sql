@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS channel_summaries (
+    channel_id BIGINT PRIMARY KEY REFERENCES channels(id) ON DELETE CASCADE,
+    summary_text TEXT NOT NULL,
+    post_ids BIGINT[] NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
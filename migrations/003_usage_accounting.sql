@@ -0,0 +1,30 @@
+CREATE TABLE IF NOT EXISTS digest_runs (
+    id BIGSERIAL PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    tg_user_id BIGINT NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL,
+    channels INT NOT NULL,
+    extract_ms INT NOT NULL,
+    summarize_ms INT NOT NULL,
+    total_ms INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id BIGSERIAL PRIMARY KEY,
+    run_key TEXT NULL,
+    tg_user_id BIGINT NULL,
+    channel_handle TEXT NULL,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    prompt_tokens INT NULL,
+    completion_tokens INT NULL,
+    cached_tokens INT NULL,
+    latency_ms INT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_digest_runs_user_started ON digest_runs(tg_user_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_user_created ON llm_calls(tg_user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_channel_created ON llm_calls(channel_handle, created_at DESC);
@@ -0,0 +1,4 @@
+ALTER TABLE llm_calls ADD COLUMN IF NOT EXISTS prompt_version TEXT NULL;
+ALTER TABLE llm_calls ADD COLUMN IF NOT EXISTS ttft_ms INT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_llm_calls_prompt_version_created ON llm_calls(prompt_version, created_at DESC);
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS channel_boilerplate (
+    channel_id BIGINT PRIMARY KEY REFERENCES channels(id) ON DELETE CASCADE,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
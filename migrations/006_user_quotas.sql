@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS user_quota_buckets (
+    tg_user_id BIGINT NOT NULL,
+    command TEXT NOT NULL,
+    tokens DOUBLE PRECISION NOT NULL,
+    refilled_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (tg_user_id, command)
+);
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS fsm_states (
+    key TEXT PRIMARY KEY,
+    state TEXT NULL,
+    data JSONB NOT NULL DEFAULT '{}'::jsonb,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_fsm_states_expires_at ON fsm_states(expires_at);
@@ -0,0 +1,23 @@
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    tg_user_id BIGINT NOT NULL,
+    chat_id BIGINT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    lease_token TEXT NULL,
+    locked_until TIMESTAMPTZ NULL,
+    checkpoint JSONB NOT NULL DEFAULT '{}'::jsonb,
+    result JSONB NULL,
+    error TEXT NULL,
+    delivered_at TIMESTAMPTZ NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Partial indexes keep claim and delivery scans proportional to live jobs, not history.
+CREATE INDEX IF NOT EXISTS idx_jobs_queued_run_after ON jobs(run_after, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_running_locked_until ON jobs(locked_until, id) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_undelivered ON jobs(id) WHERE status IN ('done', 'failed') AND delivered_at IS NULL;
@@ -0,0 +1,3 @@
+-- Set by the instance holding a channel's refresh lock when it stores freshly fetched posts;
+-- lock waiters adopt stored posts only when this is newer than their own run start.
+ALTER TABLE channels ADD COLUMN IF NOT EXISTS posts_refreshed_at TIMESTAMPTZ;
@@ -0,0 +1,7 @@
+-- Delivery lease: a bot process owns a finished job while delivering_until is in the future and
+-- sets delivered_at only after every chunk is sent; an expired lease is claimed again and resumes
+-- after delivered_chunks.
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS delivery_token TEXT NULL;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS delivering_until TIMESTAMPTZ NULL;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS delivered_chunks INT NOT NULL DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS delivery_attempts INT NOT NULL DEFAULT 0;
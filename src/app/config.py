@@ -1,5 +1,5 @@
 # FILE: src/app/config.py
-# VERSION: 1.0.1
+# VERSION: 1.23.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Load and validate runtime configuration from environment variables.
 #   SCOPE: Build typed Config object with required credentials and operational limits.
@@ -13,7 +13,7 @@
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.1 - Added missing `openai_base_url` Config field to match runtime loader usage.
+#   LAST_CHANGE: v1.23.0 - Added a separate metrics port for queue workers.
 # END_CHANGE_SUMMARY
 
 import os
@@ -32,13 +32,92 @@ class Config:
     openai_api_key: str
     openai_base_url: str
     openai_model: str
+    ai_endpoints: str
     max_add_per_call: int
     max_channels_per_user: int
+    import_batch_size: int
+    import_max_file_bytes: int
+    import_dialogs_user_ids: tuple[int, ...]
     max_channels_per_analytic_call: int
     posts_per_channel: int
     max_chars_per_post: int
     tg_message_max_len: int
     include_post_links: bool
+    incremental_summaries: bool
+    incremental_max_delta_posts: int
+    usage_accounting: bool
+    usage_flush_interval_s: float
+    boilerplate_stripping: bool
+    boilerplate_min_share: float
+    boilerplate_max_removal_ratio: float
+    prompt_compaction: bool
+    outbound_global_rate: float
+    outbound_chat_interval_s: float
+    quota_enabled: bool
+    quota_analytic_capacity: float
+    quota_analytic_refill_per_hour: float
+    quota_add_capacity: float
+    quota_add_refill_per_hour: float
+    quota_import_capacity: float
+    quota_import_refill_per_hour: float
+    channel_locks: bool
+    channel_lock_wait_s: float
+    fsm_storage: str
+    fsm_ttl_s: float
+    fsm_sweep_interval_s: float
+    job_queue: bool
+    job_max_attempts: int
+    job_visibility_timeout_s: float
+    job_retry_backoff_s: float
+    job_poll_interval_s: float
+    worker_concurrency: int
+    trace_export_path: str
+    trace_sample_ratio: float
+    metrics_host: str
+    metrics_port: int
+    worker_metrics_port: int
+    health_cache_ttl_s: float
+    health_probe_timeout_s: float
+    log_format: str
+    log_queue_size: int
+    error_log_max_bytes: int
+    error_log_backup_count: int
+    error_log_rotate_when: str
+    loop_monitor_interval_s: float
+    loop_slow_callback_s: float
+    db_pool_max_size: int
+    webhook_base_url: str
+    webhook_path: str
+    webhook_host: str
+    webhook_port: int
+    webhook_secret: str
+    webhook_workers: int
+    llm_max_concurrency: int
+    llm_min_concurrency: int
+    llm_rpm_limit: int
+    llm_tpm_limit: int
+    llm_latency_target_s: float
+    llm_max_connections: int
+    llm_max_keepalive_connections: int
+    llm_keepalive_expiry_s: float
+    llm_connect_timeout_s: float
+    llm_request_timeout_s: float
+    llm_warmup_connections: int
+    llm_batch_token_budget: int
+    llm_batch_small_channel_tokens: int
+    llm_batch_max_channels: int
+    llm_tokenizer: str
+    llm_context_tokens: int
+    llm_max_output_tokens: int
+    llm_context_retry_attempts: int
+    llm_map_reduce_group_tokens: int
+    llm_stream_responses: bool
+    stream_edit_interval_s: float
+    llm_retry_attempts: int
+    llm_retry_backoff_s: float
+    llm_hedge_quantile: float
+    llm_breaker_failures: int
+    llm_breaker_reset_s: float
 
 
 # START_CONTRACT: load_config
@@ -71,12 +150,93 @@ def load_config() -> Config:
         openai_api_key=must("AI_API_KEY"),
         openai_base_url=must("AI_BASE_URL"),
         openai_model=os.getenv("AI_MODEL", "qwen-coder"),
+        ai_endpoints=os.getenv("AI_ENDPOINTS", ""),
         max_add_per_call=int(os.getenv("MAX_ADD_PER_CALL", "50")),
         max_channels_per_user=int(os.getenv("MAX_CHANNELS_PER_USER", "200")),
+        import_batch_size=int(os.getenv("IMPORT_BATCH_SIZE", "200")),
+        import_max_file_bytes=int(os.getenv("IMPORT_MAX_FILE_BYTES", "1048576")),
+        import_dialogs_user_ids=tuple(
+            int(v) for v in os.getenv("IMPORT_DIALOGS_USER_IDS", "").replace(",", " ").split()
+        ),
         max_channels_per_analytic_call=int(os.getenv("MAX_CHANNELS_PER_ANALYTIC_CALL", "50")),
         posts_per_channel=int(os.getenv("POSTS_PER_CHANNEL", "5")),
         max_chars_per_post=int(os.getenv("MAX_CHARS_PER_POST", "1500")),
         tg_message_max_len=int(os.getenv("TG_MESSAGE_MAX_LEN", "3500")),
         include_post_links=os.getenv("INCLUDE_POST_LINKS", "true").lower() == "true",
+        incremental_summaries=os.getenv("INCREMENTAL_SUMMARIES", "false").lower() == "true",
+        incremental_max_delta_posts=int(os.getenv("INCREMENTAL_MAX_DELTA_POSTS", "3")),
+        usage_accounting=os.getenv("USAGE_ACCOUNTING", "false").lower() == "true",
+        usage_flush_interval_s=float(os.getenv("USAGE_FLUSH_INTERVAL_S", "2")),
+        boilerplate_stripping=os.getenv("BOILERPLATE_STRIPPING", "false").lower() == "true",
+        boilerplate_min_share=float(os.getenv("BOILERPLATE_MIN_SHARE", "0.6")),
+        boilerplate_max_removal_ratio=float(os.getenv("BOILERPLATE_MAX_REMOVAL_RATIO", "0.5")),
+        prompt_compaction=os.getenv("PROMPT_COMPACTION", "false").lower() == "true",
+        outbound_global_rate=float(os.getenv("OUTBOUND_GLOBAL_RATE", "25")),
+        outbound_chat_interval_s=float(os.getenv("OUTBOUND_CHAT_INTERVAL_S", "1.0")),
+        quota_enabled=os.getenv("QUOTA_ENABLED", "false").lower() == "true",
+        quota_analytic_capacity=float(os.getenv("QUOTA_ANALYTIC_CAPACITY", "250")),
+        quota_analytic_refill_per_hour=float(os.getenv("QUOTA_ANALYTIC_REFILL_PER_HOUR", "500")),
+        quota_add_capacity=float(os.getenv("QUOTA_ADD_CAPACITY", "100")),
+        quota_add_refill_per_hour=float(os.getenv("QUOTA_ADD_REFILL_PER_HOUR", "200")),
+        quota_import_capacity=float(os.getenv("QUOTA_IMPORT_CAPACITY", "5")),
+        quota_import_refill_per_hour=float(os.getenv("QUOTA_IMPORT_REFILL_PER_HOUR", "10")),
+        channel_locks=os.getenv("CHANNEL_LOCKS", "false").lower() == "true",
+        channel_lock_wait_s=float(os.getenv("CHANNEL_LOCK_WAIT_S", "60")),
+        fsm_storage=os.getenv("FSM_STORAGE", "memory").lower(),
+        fsm_ttl_s=float(os.getenv("FSM_TTL_S", "3600")),
+        fsm_sweep_interval_s=float(os.getenv("FSM_SWEEP_INTERVAL_S", "300")),
+        job_queue=os.getenv("JOB_QUEUE", "false").lower() == "true",
+        job_max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        job_visibility_timeout_s=float(os.getenv("JOB_VISIBILITY_TIMEOUT_S", "120")),
+        job_retry_backoff_s=float(os.getenv("JOB_RETRY_BACKOFF_S", "30")),
+        job_poll_interval_s=float(os.getenv("JOB_POLL_INTERVAL_S", "5")),
+        worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "2")),
+        trace_export_path=os.getenv("TRACE_EXPORT_PATH", ""),
+        trace_sample_ratio=float(os.getenv("TRACE_SAMPLE_RATIO", "1.0")),
+        metrics_host=os.getenv("METRICS_HOST", "0.0.0.0"),
+        metrics_port=int(os.getenv("METRICS_PORT", "0")),
+        worker_metrics_port=int(os.getenv("WORKER_METRICS_PORT", "0")),
+        health_cache_ttl_s=float(os.getenv("HEALTH_CACHE_TTL_S", "15")),
+        health_probe_timeout_s=float(os.getenv("HEALTH_PROBE_TIMEOUT_S", "3")),
+        log_format=os.getenv("LOG_FORMAT", "text").lower(),
+        log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        error_log_max_bytes=int(os.getenv("ERROR_LOG_MAX_BYTES", "0")),
+        error_log_backup_count=int(os.getenv("ERROR_LOG_BACKUP_COUNT", "5")),
+        error_log_rotate_when=os.getenv("ERROR_LOG_ROTATE_WHEN", ""),
+        loop_monitor_interval_s=float(os.getenv("LOOP_MONITOR_INTERVAL_S", "0.5")),
+        loop_slow_callback_s=float(os.getenv("LOOP_SLOW_CALLBACK_S", "0.25")),
+        db_pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        webhook_base_url=os.getenv("WEBHOOK_BASE_URL", "").rstrip("/"),
+        webhook_path=os.getenv("WEBHOOK_PATH", "/telegram/webhook"),
+        webhook_host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+        webhook_port=int(os.getenv("WEBHOOK_PORT", "8080")),
+        webhook_secret=os.getenv("WEBHOOK_SECRET", ""),
+        webhook_workers=int(os.getenv("WEBHOOK_WORKERS", "1")),
+        llm_max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        llm_min_concurrency=int(os.getenv("LLM_MIN_CONCURRENCY", "1")),
+        llm_rpm_limit=int(os.getenv("LLM_RPM_LIMIT", "0")),
+        llm_tpm_limit=int(os.getenv("LLM_TPM_LIMIT", "0")),
+        llm_latency_target_s=float(os.getenv("LLM_LATENCY_TARGET_S", "0")),
+        llm_max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "16")),
+        llm_max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "8")),
+        llm_keepalive_expiry_s=float(os.getenv("LLM_KEEPALIVE_EXPIRY_S", "60")),
+        llm_connect_timeout_s=float(os.getenv("LLM_CONNECT_TIMEOUT_S", "5")),
+        llm_request_timeout_s=float(os.getenv("LLM_REQUEST_TIMEOUT_S", "120")),
+        llm_warmup_connections=int(os.getenv("LLM_WARMUP_CONNECTIONS", "2")),
+        llm_batch_token_budget=int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "0")),
+        llm_batch_small_channel_tokens=int(os.getenv("LLM_BATCH_SMALL_CHANNEL_TOKENS", "600")),
+        llm_batch_max_channels=int(os.getenv("LLM_BATCH_MAX_CHANNELS", "8")),
+        llm_tokenizer=os.getenv("LLM_TOKENIZER", "heuristic"),
+        llm_context_tokens=int(os.getenv("LLM_CONTEXT_TOKENS", "0")),
+        llm_max_output_tokens=int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "1024")),
+        llm_context_retry_attempts=int(os.getenv("LLM_CONTEXT_RETRY_ATTEMPTS", "2")),
+        llm_map_reduce_group_tokens=int(os.getenv("LLM_MAP_REDUCE_GROUP_TOKENS", "0")),
+        llm_stream_responses=os.getenv("LLM_STREAM_RESPONSES", "false").lower() == "true",
+        stream_edit_interval_s=float(os.getenv("STREAM_EDIT_INTERVAL_S", "1.5")),
+        llm_retry_attempts=int(os.getenv("LLM_RETRY_ATTEMPTS", "3")),
+        llm_retry_backoff_s=float(os.getenv("LLM_RETRY_BACKOFF_S", "0.5")),
+        llm_hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+        llm_breaker_failures=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+        llm_breaker_reset_s=float(os.getenv("LLM_BREAKER_RESET_S", "30")),
     )
     # END_BLOCK_BUILD_TYPED_CONFIG
@@ -1,34 +1,42 @@
 # FILE: src/app/error_logging.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Provide centralized error logging configuration and global exception hooks.
-#   SCOPE: Create timestamped error log files, install global exception hooks, and attach asyncio loop handler.
-#   DEPENDS: M-APP-LOGGING
+#   SCOPE: Create timestamped error log files with optional size/time rotation written off the event loop, install global exception hooks, and attach asyncio loop handler.
+#   DEPENDS: M-APP-LOGGING, M-CONFIG
 #   LINKS: docs/development-plan.xml#M-ERROR-LOGGING, docs/knowledge-graph.xml#M-ERROR-LOGGING
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
 #   build_error_log_path — Build timestamped error log file path under logs/timestamps.
-#   setup_error_file_logging — Attach ERROR-level file handler to target logger.
+#   setup_error_file_logging — Attach queued ERROR-level file handler to target logger.
+#   setup_runtime_logging — Configure stderr and error file logging from Config.
 #   install_global_exception_hooks — Install sys/thread unhandled exception hooks.
 #   install_asyncio_exception_handler — Install asyncio loop exception handler.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added timestamped error logging module with global hooks.
+#   LAST_CHANGE: v1.1.0 - Wrote error files through a bounded queue listener; added size/time rotation and JSON format.
 # END_CHANGE_SUMMARY
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import logging.handlers
 import sys
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from src.app.logging import DEFAULT_QUEUE_SIZE, BoundedQueueHandler, build_formatter, setup_logging
+
+if TYPE_CHECKING:
+    from src.app.config import Config
 
 DEFAULT_ERROR_LOG_DIR = Path("logs") / "timestamps"
+ERROR_FILE_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(funcName)s] %(message)s"
 
 
 # START_CONTRACT: build_error_log_path
@@ -52,10 +60,10 @@ def build_error_log_path(
 
 
 # START_CONTRACT: setup_error_file_logging
-#   PURPOSE: Configure ERROR-level file logging into logs/timestamps for runtime failures.
-#   INPUTS: { base_dir: Path|str, logger: Optional[logging.Logger], now: Optional[datetime] }
+#   PURPOSE: Configure ERROR-level file logging into logs/timestamps for runtime failures; file writes run on a listener thread.
+#   INPUTS: { base_dir: Path|str, logger: Optional[logging.Logger], now: Optional[datetime], json_format: bool, queue_size: int, max_bytes: int - rotate at this size (0 = off), backup_count: int - rotated files kept, rotate_when: str - TimedRotatingFileHandler interval such as "midnight" (takes precedence over max_bytes) }
 #   OUTPUTS: { Path - created error log file path }
-#   SIDE_EFFECTS: creates directories/files and mutates logger handlers
+#   SIDE_EFFECTS: creates directories/files, mutates logger handlers and starts a listener thread
 #   LINKS: M-ERROR-LOGGING, M-APP-LOGGING
 # END_CONTRACT: setup_error_file_logging
 def setup_error_file_logging(
@@ -63,6 +71,11 @@ def setup_error_file_logging(
     base_dir: Path | str = DEFAULT_ERROR_LOG_DIR,
     logger: Optional[logging.Logger] = None,
     now: Optional[datetime] = None,
+    json_format: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    max_bytes: int = 0,
+    backup_count: int = 5,
+    rotate_when: str = "",
 ) -> Path:
     # START_BLOCK_CREATE_LOG_PATH_AND_DIRECTORY
     path = build_error_log_path(base_dir=base_dir, now=now)
@@ -71,17 +84,43 @@ def setup_error_file_logging(
 
     # START_BLOCK_ATTACH_ERROR_FILE_HANDLER
     target_logger = logger or logging.getLogger()
-    file_handler = logging.FileHandler(path, encoding="utf-8")
+    if rotate_when:
+        file_handler: logging.Handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8", utc=True
+        )
+    elif max_bytes > 0:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    else:
+        file_handler = logging.FileHandler(path, encoding="utf-8")
     file_handler.setLevel(logging.ERROR)
-    file_handler.setFormatter(
-        logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(funcName)s] %(message)s")
-    )
-    target_logger.addHandler(file_handler)
+    file_handler.setFormatter(build_formatter(ERROR_FILE_FORMAT, json_format=json_format))
+    target_logger.addHandler(BoundedQueueHandler([file_handler], queue_size=queue_size, sink="error_file"))
     # END_BLOCK_ATTACH_ERROR_FILE_HANDLER
 
     return path
 
 
+# START_CONTRACT: setup_runtime_logging
+#   PURPOSE: Apply LOG_* and ERROR_LOG_* settings to root stderr logging and the timestamped error file.
+#   INPUTS: { cfg: Config }
+#   OUTPUTS: { Path - created error log file path }
+#   SIDE_EFFECTS: mutates global logging configuration; creates the error log file; starts listener threads
+#   LINKS: M-ERROR-LOGGING, M-APP-LOGGING, M-CONFIG
+# END_CONTRACT: setup_runtime_logging
+def setup_runtime_logging(cfg: Config) -> Path:
+    json_format = cfg.log_format == "json"
+    setup_logging(json_format=json_format, queue_size=cfg.log_queue_size)
+    return setup_error_file_logging(
+        json_format=json_format,
+        queue_size=cfg.log_queue_size,
+        max_bytes=cfg.error_log_max_bytes,
+        backup_count=cfg.error_log_backup_count,
+        rotate_when=cfg.error_log_rotate_when,
+    )
+
+
 # START_CONTRACT: install_global_exception_hooks
 #   PURPOSE: Capture unhandled sync/thread exceptions and route them to structured logger output.
 #   INPUTS: { logger_name: str }
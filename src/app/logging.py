@@ -1,34 +1,141 @@
 # FILE: src/app/logging.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
-#   PURPOSE: Configure baseline logging for the application runtime.
-#   SCOPE: Set root logging level and message format once at startup.
-#   DEPENDS: none
+#   PURPOSE: Configure baseline logging for the application runtime without blocking the event loop on sink I/O.
+#   SCOPE: Set root logging level and message format once at startup; hand records to sink handlers through a bounded queue drained by a listener thread; optional JSON lines format.
+#   DEPENDS: M-APP-METRICS
 #   LINKS: docs/knowledge-graph.xml#M-APP-LOGGING
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
+#   DEFAULT_QUEUE_SIZE — Records buffered per sink before new ones are dropped.
+#   TEXT_FORMAT — Plain-text record format for stderr.
+#   JsonFormatter — Render records as one JSON object per line.
+#   build_formatter — Pick text or JSON formatter for a sink.
+#   BoundedQueueHandler — Enqueue records without blocking and drain them to sink handlers on a listener thread.
 #   setup_logging — Apply global logging configuration.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.1.0 - Routed stderr through a bounded queue and listener thread; counted dropped records; added JSON format.
 # END_CHANGE_SUMMARY
 
+import json
 import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+from src.app.metrics import LOG_RECORDS_DROPPED
+
+DEFAULT_QUEUE_SIZE = 10_000
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    # START_CONTRACT: JsonFormatter.format
+    #   PURPOSE: Serialize a record as a single-line JSON object with UTC timestamp, level, logger, function, message and traceback.
+    #   INPUTS: { record: logging.LogRecord }
+    #   OUTPUTS: { str - JSON without trailing newline }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-LOGGING
+    # END_CONTRACT: JsonFormatter.format
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def build_formatter(text_format: str, *, json_format: bool = False) -> logging.Formatter:
+    return JsonFormatter() if json_format else logging.Formatter(text_format)
+
+
+class _DrainingListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The stock sentinel uses put_nowait, which fails on a full bounded queue; the thread is draining, so wait.
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    # START_CONTRACT: BoundedQueueHandler.__init__
+    #   PURPOSE: Own a bounded queue and a listener thread that feeds the given sink handlers.
+    #   INPUTS: { handlers: list[logging.Handler], queue_size: int, sink: str - label for the drop counter }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: starts a daemon listener thread
+    #   LINKS: M-APP-LOGGING, M-APP-METRICS
+    # END_CONTRACT: BoundedQueueHandler.__init__
+    def __init__(self, handlers: list[logging.Handler], *, queue_size: int = DEFAULT_QUEUE_SIZE, sink: str) -> None:
+        super().__init__(queue.Queue(maxsize=max(1, queue_size)))
+        self.sink = sink
+        self.dropped = 0
+        self.setLevel(min(h.level for h in handlers))
+        self._handlers = handlers
+        self._listener: _DrainingListener | None = _DrainingListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+
+    # START_CONTRACT: BoundedQueueHandler.prepare
+    #   PURPOSE: Freeze the message text on the caller thread; keep exc_info so the listener thread formats tracebacks.
+    #   INPUTS: { record: logging.LogRecord }
+    #   OUTPUTS: { logging.LogRecord - shallow copy safe to hand to another thread }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-LOGGING
+    # END_CONTRACT: BoundedQueueHandler.prepare
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc(sink=self.sink)
+
+    # START_CONTRACT: BoundedQueueHandler.close
+    #   PURPOSE: Drain queued records into the sinks, stop the listener thread and close the sink handlers.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: joins the listener thread; closes sink handlers
+    #   LINKS: M-APP-LOGGING
+    # END_CONTRACT: BoundedQueueHandler.close
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in self._handlers:
+                handler.close()
+        super().close()
 
 
 # START_CONTRACT: setup_logging
-#   PURPOSE: Configure root Python logging settings for runtime observability.
-#   INPUTS: {}
+#   PURPOSE: Configure root Python logging settings for runtime observability; stderr writes happen on a listener thread.
+#   INPUTS: { json_format: bool - one JSON object per line instead of text, queue_size: int - records buffered before drops }
 #   OUTPUTS: { None }
-#   SIDE_EFFECTS: mutates global logging configuration
+#   SIDE_EFFECTS: mutates global logging configuration; starts a listener thread
 #   LINKS: M-APP-LOGGING
 # END_CONTRACT: setup_logging
-def setup_logging() -> None:
+def setup_logging(*, json_format: bool = False, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
     # START_BLOCK_APPLY_GLOBAL_LOGGING_CONFIG
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    stream = logging.StreamHandler()
+    stream.setFormatter(build_formatter(TEXT_FORMAT, json_format=json_format))
+    root.setLevel(logging.INFO)
+    root.addHandler(BoundedQueueHandler([stream], queue_size=queue_size, sink="stderr"))
     # END_BLOCK_APPLY_GLOBAL_LOGGING_CONFIG
@@ -0,0 +1,149 @@
+# FILE: src/app/loop_monitor.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Prove and locate event loop stalls in production.
+#   SCOPE: A loop task measuring scheduling lag into a histogram, and a watchdog thread that logs the running task and a stack sample of the loop thread when the loop stops ticking.
+#   DEPENDS: M-APP-METRICS
+#   LINKS: docs/knowledge-graph.xml#M-APP-LOOP-MONITOR
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   LoopMonitor — Lag histogram task plus stall watchdog thread for one event loop.
+#   install_loop_monitor — Start a LoopMonitor on the running loop when enabled.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added event loop lag monitor and slow-callback watchdog.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Callable
+
+from src.app.metrics import LOOP_LAG, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+def _describe_task(task: asyncio.Task | None) -> str:
+    if task is None:
+        return "callback (no task)"
+    coro = task.get_coro()
+    return f"{task.get_name()} {getattr(coro, '__qualname__', coro)!s}"
+
+
+class LoopMonitor:
+    # START_CONTRACT: LoopMonitor.__init__
+    #   PURPOSE: Bind the loop and thresholds; nothing runs until start().
+    #   INPUTS: { loop: asyncio.AbstractEventLoop, interval_s: float - tick period, slow_callback_s: float - stall length that triggers a stack sample, clock: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-LOOP-MONITOR
+    # END_CONTRACT: LoopMonitor.__init__
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        interval_s: float = 0.5,
+        slow_callback_s: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loop = loop
+        self._interval_s = interval_s
+        self._slow_callback_s = slow_callback_s
+        self._clock = clock
+        self._beat = clock()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    # START_CONTRACT: LoopMonitor.start
+    #   PURPOSE: Start the lag task and the watchdog thread; must be called from the loop thread.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: creates a loop task and a daemon thread
+    #   LINKS: M-APP-LOOP-MONITOR
+    # END_CONTRACT: LoopMonitor.start
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._beat = self._clock()
+        self._task = self._loop.create_task(self._measure(), name="loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def _measure(self) -> None:
+        # START_BLOCK_MEASURE_SCHEDULING_LAG
+        while True:
+            due = self._clock() + self._interval_s
+            await asyncio.sleep(self._interval_s)
+            now = self._clock()
+            self._beat = now
+            LOOP_LAG.observe(max(0.0, now - due))
+        # END_BLOCK_MEASURE_SCHEDULING_LAG
+
+    def _watch(self) -> None:
+        # START_BLOCK_DETECT_STALLED_LOOP
+        # A healthy loop refreshes the beat every interval; report each missed beat once, while it is still stuck.
+        limit = self._interval_s + self._slow_callback_s
+        poll = max(0.005, min(self._interval_s, self._slow_callback_s) / 2)
+        reported = None
+        while not self._stopped.wait(poll):
+            beat = self._beat
+            stalled = self._clock() - beat
+            if stalled > limit and beat != reported:
+                reported = beat
+                self._report(stalled - self._interval_s)
+        # END_BLOCK_DETECT_STALLED_LOOP
+
+    def _report(self, stalled_s: float) -> None:
+        # START_BLOCK_SAMPLE_LOOP_THREAD_STACK
+        LOOP_STALLS.inc()
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  <loop thread stack unavailable>\n"
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        logger.warning(
+            "[LoopMonitor][_report][SAMPLE_LOOP_THREAD_STACK] event loop blocked for >%.3fs in %s; loop thread stack:\n%s",
+            stalled_s,
+            _describe_task(task),
+            stack.rstrip("\n"),
+        )
+        # END_BLOCK_SAMPLE_LOOP_THREAD_STACK
+
+    # START_CONTRACT: LoopMonitor.stop
+    #   PURPOSE: Cancel the lag task and join the watchdog thread.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: stops background work
+    #   LINKS: M-APP-LOOP-MONITOR
+    # END_CONTRACT: LoopMonitor.stop
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# START_CONTRACT: install_loop_monitor
+#   PURPOSE: Start lag measurement and stall sampling on the running loop; disabled when interval_s <= 0.
+#   INPUTS: { interval_s: float, slow_callback_s: float }
+#   OUTPUTS: { LoopMonitor | None }
+#   SIDE_EFFECTS: creates a loop task and a watchdog thread
+#   LINKS: M-APP-LOOP-MONITOR
+# END_CONTRACT: install_loop_monitor
+def install_loop_monitor(*, interval_s: float, slow_callback_s: float) -> LoopMonitor | None:
+    if interval_s <= 0:
+        return None
+    monitor = LoopMonitor(asyncio.get_running_loop(), interval_s=interval_s, slow_callback_s=slow_callback_s)
+    monitor.start()
+    return monitor
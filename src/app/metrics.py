@@ -0,0 +1,335 @@
+# FILE: src/app/metrics.py
+# VERSION: 1.2.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Keep in-process runtime metrics and cached health probe results for the /metrics and /healthz endpoints.
+#   SCOPE: Labelled counters, gauges (set or pulled at scrape time) and histograms, Prometheus text exposition, the process-wide metric set, and TTL-cached async health probes.
+#   DEPENDS: none
+#   LINKS: docs/knowledge-graph.xml#M-APP-METRICS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   DEFAULT_BUCKETS — Latency histogram buckets in seconds.
+#   Counter — Monotonic labelled counter.
+#   Gauge — Labelled gauge, set directly or read from a callback at scrape time.
+#   Histogram — Labelled latency histogram with a timing context manager.
+#   Registry — Metric collection rendering Prometheus text format.
+#   REGISTRY — Process-wide registry scraped by /metrics.
+#   COMMAND_LATENCY … LOOP_STALLS — Metrics recorded by bot, pipeline and client modules.
+#   HealthResult — Outcome of one health probe.
+#   HealthChecker — Run named async probes with per-probe result caching.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.2.1 - Made the metric base class abstract over samples().
+# END_CHANGE_SUMMARY
+
+import abc
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        try:
+            key = tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError:
+            key = None
+        if key is None or len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return key
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    # Yields (sample name, labels, value) for every series of this metric.
+    @abc.abstractmethod
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]: ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels: object) -> None:
+        # Pulled at scrape time, for values owned by another object (pool size, queue depth).
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def value(self, **labels: object) -> float:
+        key = self._key(labels)
+        fn = self._functions.get(key)
+        return float(fn()) if fn is not None else self._values.get(key, 0.0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+            functions = list(self._functions.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+        for key, fn in functions:
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            yield self.name, self._labels(key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, series[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets=buckets))
+
+    # START_CONTRACT: Registry.render
+    #   PURPOSE: Render every metric in Prometheus text exposition format 0.0.4.
+    #   INPUTS: {}
+    #   OUTPUTS: { str - newline-terminated exposition body }
+    #   SIDE_EFFECTS: calls gauge callbacks
+    #   LINKS: M-APP-METRICS
+    # END_CONTRACT: Registry.render
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# START_BLOCK_DEFINE_PROCESS_METRICS
+REGISTRY = Registry()
+COMMAND_LATENCY = REGISTRY.histogram(
+    "tgdigest_command_duration_seconds", "Bot command handling time.", ("command",)
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "tgdigest_stage_duration_seconds", "Digest pipeline stage time per run (extract, summarize, total).", ("stage",)
+)
+CHANNELS_IN_FLIGHT = REGISTRY.gauge("tgdigest_channels_in_flight", "Channels in digest runs that have not finished.")
+DB_POOL_CONNECTIONS = REGISTRY.gauge("tgdigest_db_pool_connections", "Postgres pool connections by state.", ("state",))
+TELETHON_FLOOD_WAITS = REGISTRY.counter(
+    "tgdigest_telethon_flood_wait_total", "Telethon FloodWait errors.", ("operation",)
+)
+LLM_RATE_LIMITED = REGISTRY.counter("tgdigest_llm_rate_limited_total", "LLM HTTP 429 responses.", ("endpoint",))
+LLM_PROMPT_TOKENS = REGISTRY.counter(
+    "tgdigest_llm_prompt_tokens_total", "Prompt tokens sent; cached=true counts provider prefix-cache hits.", ("cached",)
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "tgdigest_cache_lookups_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")
+)
+OUTBOUND_QUEUE_DEPTH = REGISTRY.gauge("tgdigest_outbound_queue_depth", "Bot API messages waiting to be sent.")
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "tgdigest_log_records_dropped_total", "Log records dropped because the sink queue was full.", ("sink",)
+)
+LOOP_LAG = REGISTRY.histogram(
+    "tgdigest_event_loop_lag_seconds",
+    "Delay between when a monitor tick was due and when the event loop ran it.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = REGISTRY.counter("tgdigest_event_loop_stalls_total", "Event loop stalls longer than LOOP_SLOW_CALLBACK_S.")
+# END_BLOCK_DEFINE_PROCESS_METRICS
+
+
+@dataclass(frozen=True)
+class HealthResult:
+    ok: bool
+    detail: str
+    checked_at: float
+
+
+class HealthChecker:
+    # START_CONTRACT: HealthChecker.__init__
+    #   PURPOSE: Bind named probes; a probe passes when it returns and fails when it raises or exceeds timeout_s.
+    #   INPUTS: { probes: dict[str, Callable[[], Awaitable[object]]], ttl_s: float - result reuse window, timeout_s: float, clock: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-METRICS
+    # END_CONTRACT: HealthChecker.__init__
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Awaitable[object]]],
+        *,
+        ttl_s: float = 15.0,
+        timeout_s: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._probes = probes
+        self._ttl_s = max(0.0, ttl_s)
+        self._timeout_s = max(0.1, timeout_s)
+        self._clock = clock
+        self._results: dict[str, HealthResult] = {}
+        self._running: dict[str, asyncio.Task] = {}
+
+    async def _run(self, name: str) -> HealthResult:
+        try:
+            await asyncio.wait_for(self._probes[name](), timeout=self._timeout_s)
+            result = HealthResult(ok=True, detail="ok", checked_at=self._clock())
+        except asyncio.TimeoutError:
+            result = HealthResult(ok=False, detail=f"timeout after {self._timeout_s:g}s", checked_at=self._clock())
+        except Exception as e:
+            result = HealthResult(ok=False, detail=str(e) or type(e).__name__, checked_at=self._clock())
+        self._results[name] = result
+        return result
+
+    # START_CONTRACT: HealthChecker.check
+    #   PURPOSE: Return every probe's result, re-running only probes older than ttl_s; concurrent callers share one in-flight probe.
+    #   INPUTS: {}
+    #   OUTPUTS: { dict[str, HealthResult] }
+    #   SIDE_EFFECTS: runs expired probes (network I/O to DB, Telegram, LLM)
+    #   LINKS: M-APP-METRICS
+    # END_CONTRACT: HealthChecker.check
+    async def check(self) -> dict[str, HealthResult]:
+        # START_BLOCK_REFRESH_EXPIRED_PROBES
+        now = self._clock()
+        waits: dict[str, asyncio.Task] = {}
+        for name in self._probes:
+            cached = self._results.get(name)
+            if cached is not None and now - cached.checked_at < self._ttl_s:
+                continue
+            task = self._running.get(name)
+            if task is None or task.done():
+                task = self._running[name] = asyncio.create_task(self._run(name))
+            waits[name] = task
+        if waits:
+            await asyncio.gather(*waits.values())
+        return {name: self._results[name] for name in self._probes}
+        # END_BLOCK_REFRESH_EXPIRED_PROBES
@@ -0,0 +1,96 @@
+# FILE: src/app/metrics_server.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Serve /metrics and /healthz over HTTP next to the bot, webhook workers and queue workers.
+#   SCOPE: aiohttp app exposing the Prometheus registry and cached health probe results; probe builders for Postgres, Telethon and the LLM endpoints.
+#   DEPENDS: M-APP-METRICS
+#   LINKS: docs/knowledge-graph.xml#M-APP-METRICS-SERVER
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   build_health_probes — DB, Telethon and LLM reachability probes for HealthChecker.
+#   MetricsServer — Background aiohttp site serving /metrics and /healthz.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added /metrics and /healthz HTTP endpoints.
+# END_CHANGE_SUMMARY
+
+import logging
+from typing import Awaitable, Callable
+
+from aiohttp import web
+
+from src.app.metrics import HealthChecker, Registry
+
+logger = logging.getLogger(__name__)
+
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# START_CONTRACT: build_health_probes
+#   PURPOSE: Build reachability probes: a trivial query, the MTProto session user, and one models call per LLM endpoint.
+#   INPUTS: { pool: asyncpg.Pool, tg_client: TelegramClient, summarizer: Summarizer }
+#   OUTPUTS: { dict[str, Callable[[], Awaitable[object]]] - probes that raise when unreachable }
+#   SIDE_EFFECTS: none until a probe runs
+#   LINKS: M-APP-METRICS-SERVER, M-APP-METRICS
+# END_CONTRACT: build_health_probes
+def build_health_probes(pool, tg_client, summarizer) -> dict[str, Callable[[], Awaitable[object]]]:
+    async def db() -> None:
+        await pool.fetchval("SELECT 1")
+
+    async def telethon() -> None:
+        if not tg_client.is_connected():
+            raise ConnectionError("MTProto client disconnected")
+        await tg_client.get_me(input_peer=True)
+
+    async def llm() -> None:
+        if await summarizer.warmup(1) == 0:
+            raise ConnectionError("no LLM endpoint reachable")
+
+    return {"db": db, "telethon": telethon, "llm": llm}
+
+
+class MetricsServer:
+    # START_CONTRACT: MetricsServer.__init__
+    #   PURPOSE: Bind registry, health checker and listen address.
+    #   INPUTS: { registry: Registry, health: HealthChecker, host: str, port: int }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-METRICS-SERVER
+    # END_CONTRACT: MetricsServer.__init__
+    def __init__(self, registry: Registry, health: HealthChecker, *, host: str, port: int) -> None:
+        self._registry = registry
+        self._health = health
+        self._host = host
+        self._port = port
+        self._runner: web.AppRunner | None = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self._registry.render().encode("utf-8"),
+            headers={"Content-Type": _PROMETHEUS_CONTENT_TYPE},
+        )
+
+    async def _healthz(self, request: web.Request) -> web.Response:
+        results = await self._health.check()
+        ok = all(r.ok for r in results.values())
+        body = {
+            "status": "ok" if ok else "fail",
+            "checks": {name: {"ok": r.ok, "detail": r.detail} for name, r in results.items()},
+        }
+        return web.json_response(body, status=200 if ok else 503)
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        app.router.add_get("/healthz", self._healthz)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self._host, self._port).start()
+        logger.info("[MetricsServer][start][LISTEN] listening on %s:%s", self._host, self._port)
+
+    async def aclose(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,243 @@
+# FILE: src/app/runtime.py
+# VERSION: 1.7.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Build and tear down the per-process runtime shared by polling, webhook, and queue worker entry points.
+#   SCOPE: Install trace export, open DB pool, Telethon client, usage recorder, summarizer, FSM storage, channel locks, bot, outbound dispatcher, job delivery and the metrics listener; compose the aiogram Dispatcher; close owned resources.
+#   DEPENDS: M-CONFIG, M-APP-TRACING, M-APP-METRICS, M-APP-METRICS-SERVER, M-STORAGE-POOL, M-TELETHON-CLIENT, M-SUMMARIZER-LLM, M-SUMMARIZER-TOKENS, M-SUMMARIZER-ENDPOINTS, M-STORAGE-USAGE, M-STORAGE-FSM, M-STORAGE-LOCKS, M-BOT-OUTBOUND, M-BOT-DELIVERY, M-BOT-ROUTER
+#   LINKS: docs/knowledge-graph.xml#M-APP-RUNTIME
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   Runtime — Live per-process clients bound into the router.
+#   open_runtime — Initialize all runtime clients for one process.
+#   build_dispatcher — Compose Dispatcher with the shared router.
+#   close_runtime — Drain and close runtime-owned clients.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.7.0 - Took the metrics port from the caller; closed the opened runtime when the metrics listener cannot bind.
+# END_CHANGE_SUMMARY
+
+import logging
+from dataclasses import dataclass, replace
+
+from aiogram import Bot, Dispatcher
+
+from src.app.config import Config
+from src.app.metrics import DB_POOL_CONNECTIONS, OUTBOUND_QUEUE_DEPTH, REGISTRY, HealthChecker
+from src.app.metrics_server import MetricsServer, build_health_probes
+from src.app.tracing import configure_tracing, shutdown_tracing
+from src.bot.delivery import JobDelivery
+from src.bot.outbound import OutboundDispatcher
+from src.bot.router import build_router
+from src.extractor.telethon_client import create_telethon_client
+from src.storage.fsm import PostgresStorage
+from src.storage.locks import ChannelLocks
+from src.storage.postgres import create_pool
+from src.storage.usage import UsageRecorder
+from src.summarizer.endpoints import parse_endpoints
+from src.summarizer.llm import Summarizer
+from src.summarizer.tokens import build_token_counter, resolve_prompt_budget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Runtime:
+    bot: Bot | None
+    pool: object
+    tg_client: object
+    summarizer: Summarizer
+    usage_recorder: UsageRecorder | None
+    outbound: OutboundDispatcher | None
+    fsm_storage: PostgresStorage | None
+    channel_locks: ChannelLocks | None
+    delivery: JobDelivery | None
+    metrics_server: MetricsServer | None
+
+
+# START_CONTRACT: open_runtime
+#   PURPOSE: Initialize DB pool, MTProto client, summarizer, bot and outbound queue for the current process; queue workers skip the bot side.
+#   INPUTS: { cfg: Config, outbound_rate_share: float - fraction of OUTBOUND_GLOBAL_RATE this process may use, with_bot: bool - open bot, outbound queue, FSM storage and job delivery, metrics_port: int | None - port for /metrics and /healthz, 0 = off (METRICS_PORT when None); processes on one host need distinct ports, telethon_session_name: str | None - session owned by this process (TELETHON_SESSION_NAME when None) }
+#   OUTPUTS: { Runtime }
+#   SIDE_EFFECTS: opens the trace export file when configured, opens DB connections (one held for channel locks when enabled), starts Telethon session, warms LLM connections, starts background flush/send/sweep/delivery tasks, listens for metrics scrapes when enabled; everything opened is closed again if the listener fails to start
+#   LINKS: M-APP-RUNTIME, M-APP-TRACING, M-APP-METRICS-SERVER, M-STORAGE-POOL, M-TELETHON-CLIENT, M-SUMMARIZER-LLM, M-STORAGE-USAGE, M-STORAGE-FSM, M-STORAGE-LOCKS, M-BOT-OUTBOUND, M-BOT-DELIVERY
+# END_CONTRACT: open_runtime
+async def open_runtime(
+    cfg: Config,
+    *,
+    outbound_rate_share: float = 1.0,
+    with_bot: bool = True,
+    metrics_port: int | None = None,
+    telethon_session_name: str | None = None,
+) -> Runtime:
+    # START_BLOCK_INIT_INFRA_CLIENTS
+    if cfg.trace_export_path:
+        configure_tracing(cfg.trace_export_path, sample_ratio=cfg.trace_sample_ratio)
+    pool = await create_pool(cfg.database_url, max_size=cfg.db_pool_max_size)
+    DB_POOL_CONNECTIONS.set_function(lambda: pool.get_size() - pool.get_idle_size(), state="in_use")
+    DB_POOL_CONNECTIONS.set_function(pool.get_idle_size, state="idle")
+    tg_client = await create_telethon_client(
+        telethon_session_name or cfg.telethon_session_name, cfg.tg_api_id, cfg.tg_api_hash
+    )
+    usage_recorder = UsageRecorder(pool, flush_interval_s=cfg.usage_flush_interval_s) if cfg.usage_accounting else None
+    if usage_recorder is not None:
+        usage_recorder.start()
+    summarizer = Summarizer(
+        api_key=cfg.openai_api_key,
+        model=cfg.openai_model,
+        base_url=cfg.openai_base_url,
+        endpoints=parse_endpoints(cfg.ai_endpoints, cfg.openai_api_key) or None,
+        max_concurrency=cfg.llm_max_concurrency,
+        max_connections=cfg.llm_max_connections,
+        max_keepalive_connections=cfg.llm_max_keepalive_connections,
+        keepalive_expiry_s=cfg.llm_keepalive_expiry_s,
+        connect_timeout_s=cfg.llm_connect_timeout_s,
+        request_timeout_s=cfg.llm_request_timeout_s,
+        batch_token_budget=cfg.llm_batch_token_budget,
+        batch_small_channel_tokens=cfg.llm_batch_small_channel_tokens,
+        batch_max_channels=cfg.llm_batch_max_channels,
+        token_counter=build_token_counter(cfg.llm_tokenizer),
+        prompt_budget_tokens=resolve_prompt_budget(
+            cfg.openai_model,
+            context_tokens=cfg.llm_context_tokens,
+            max_output_tokens=cfg.llm_max_output_tokens,
+        ),
+        max_output_tokens=cfg.llm_max_output_tokens,
+        context_retry_attempts=cfg.llm_context_retry_attempts,
+        map_reduce_group_tokens=cfg.llm_map_reduce_group_tokens,
+        retry_attempts=cfg.llm_retry_attempts,
+        retry_backoff_s=cfg.llm_retry_backoff_s,
+        hedge_quantile=cfg.llm_hedge_quantile,
+        breaker_failures=cfg.llm_breaker_failures,
+        breaker_reset_s=cfg.llm_breaker_reset_s,
+        rpm_limit=cfg.llm_rpm_limit,
+        tpm_limit=cfg.llm_tpm_limit,
+        min_concurrency=cfg.llm_min_concurrency,
+        latency_target_s=cfg.llm_latency_target_s,
+        usage_sink=usage_recorder.record_call if usage_recorder is not None else None,
+    )
+    if cfg.llm_warmup_connections > 0:
+        warmed = await summarizer.warmup(cfg.llm_warmup_connections)
+        logger.info("[Runtime][open_runtime][INIT_INFRA_CLIENTS] llm warm connections=%s", warmed)
+    # END_BLOCK_INIT_INFRA_CLIENTS
+
+    # START_BLOCK_INIT_BOT_AND_OUTBOUND
+    bot = outbound = delivery = None
+    if with_bot:
+        bot = Bot(token=cfg.bot_token)
+        outbound = OutboundDispatcher(
+            bot,
+            global_rate=cfg.outbound_global_rate * outbound_rate_share,
+            chat_interval_s=cfg.outbound_chat_interval_s,
+        )
+        outbound.start()
+        OUTBOUND_QUEUE_DEPTH.set_function(lambda: outbound.queue_depth)
+    if with_bot and cfg.job_queue:
+        delivery = JobDelivery(
+            pool,
+            outbound,
+            poll_interval_s=cfg.job_poll_interval_s,
+            lease_s=cfg.job_visibility_timeout_s,
+            retry_backoff_s=cfg.job_retry_backoff_s,
+        )
+        await delivery.start()
+    # END_BLOCK_INIT_BOT_AND_OUTBOUND
+
+    # START_BLOCK_INIT_FSM_STORAGE
+    fsm_storage = None
+    if with_bot and cfg.fsm_storage == "postgres":
+        fsm_storage = PostgresStorage(pool, ttl_s=cfg.fsm_ttl_s, sweep_interval_s=cfg.fsm_sweep_interval_s)
+        fsm_storage.start()
+    # END_BLOCK_INIT_FSM_STORAGE
+
+    # START_BLOCK_INIT_CHANNEL_LOCKS
+    channel_locks = None
+    if cfg.channel_locks:
+        channel_locks = ChannelLocks(pool)
+        await channel_locks.start()
+    # END_BLOCK_INIT_CHANNEL_LOCKS
+
+    rt = Runtime(
+        bot=bot,
+        pool=pool,
+        tg_client=tg_client,
+        summarizer=summarizer,
+        usage_recorder=usage_recorder,
+        outbound=outbound,
+        fsm_storage=fsm_storage,
+        channel_locks=channel_locks,
+        delivery=delivery,
+        metrics_server=None,
+    )
+
+    # START_BLOCK_START_METRICS_LISTENER
+    port = cfg.metrics_port if metrics_port is None else metrics_port
+    if port <= 0:
+        return rt
+    health = HealthChecker(
+        build_health_probes(pool, tg_client, summarizer),
+        ttl_s=cfg.health_cache_ttl_s,
+        timeout_s=cfg.health_probe_timeout_s,
+    )
+    metrics_server = MetricsServer(REGISTRY, health, host=cfg.metrics_host, port=port)
+    try:
+        await metrics_server.start()
+    except Exception:
+        # EADDRINUSE and the like: the caller never gets rt, so release the pool, Telethon session and tasks here.
+        logger.exception("[Runtime][open_runtime][START_METRICS_LISTENER] cannot listen on %s:%s", cfg.metrics_host, port)
+        await metrics_server.aclose()
+        await close_runtime(rt)
+        raise
+    # END_BLOCK_START_METRICS_LISTENER
+
+    return replace(rt, metrics_server=metrics_server)
+
+
+# START_CONTRACT: build_dispatcher
+#   PURPOSE: Create an aiogram Dispatcher with the router bound to runtime dependencies; FSM state uses Postgres storage when configured, aiogram memory storage otherwise.
+#   INPUTS: { rt: Runtime, cfg: Config }
+#   OUTPUTS: { Dispatcher }
+#   SIDE_EFFECTS: none
+#   LINKS: M-APP-RUNTIME, M-BOT-ROUTER, M-STORAGE-FSM
+# END_CONTRACT: build_dispatcher
+def build_dispatcher(rt: Runtime, cfg: Config) -> Dispatcher:
+    dispatcher = Dispatcher(storage=rt.fsm_storage) if rt.fsm_storage is not None else Dispatcher()
+    dispatcher.include_router(
+        build_router(
+            pool=rt.pool,
+            tg_client=rt.tg_client,
+            summarizer=rt.summarizer,
+            cfg=cfg,
+            usage_recorder=rt.usage_recorder,
+            outbound=rt.outbound,
+            channel_locks=rt.channel_locks,
+        )
+    )
+    return dispatcher
+
+
+# START_CONTRACT: close_runtime
+#   PURPOSE: Stop the metrics listener and job delivery, drain queued outbound messages and usage rows, stop the FSM sweep, release channel locks, close LLM clients, then flush trace export.
+#   INPUTS: { rt: Runtime }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: may send queued messages and flush usage rows; closes HTTP clients
+#   LINKS: M-APP-RUNTIME, M-APP-TRACING, M-APP-METRICS-SERVER, M-BOT-DELIVERY, M-BOT-OUTBOUND, M-STORAGE-USAGE, M-STORAGE-FSM, M-STORAGE-LOCKS, M-SUMMARIZER-LLM
+# END_CONTRACT: close_runtime
+async def close_runtime(rt: Runtime) -> None:
+    # START_BLOCK_DRAIN_AND_CLOSE_CLIENTS
+    if rt.metrics_server is not None:
+        await rt.metrics_server.aclose()
+    if rt.delivery is not None:
+        await rt.delivery.aclose()
+    if rt.outbound is not None:
+        await rt.outbound.aclose()
+    if rt.fsm_storage is not None:
+        await rt.fsm_storage.close()
+    if rt.channel_locks is not None:
+        await rt.channel_locks.aclose()
+    await rt.summarizer.aclose()
+    if rt.usage_recorder is not None:
+        await rt.usage_recorder.aclose()
+    shutdown_tracing()
+    # END_BLOCK_DRAIN_AND_CLOSE_CLIENTS
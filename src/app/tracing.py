@@ -0,0 +1,298 @@
+# FILE: src/app/tracing.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Record per-run trace spans for digest pipeline stages so slow runs can be broken down offline.
+#   SCOPE: Context-local span nesting safe across asyncio tasks, head-based sampling per trace, and an exporter writing OTLP JSON lines to a local file.
+#   DEPENDS: none
+#   LINKS: docs/knowledge-graph.xml#M-APP-TRACING
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   SERVICE_NAME — service.name resource attribute on exported spans.
+#   Span — One timed operation with attributes and status.
+#   OtlpJsonLinesExporter — Append finished traces as OTLP/JSON ExportTraceServiceRequest lines.
+#   Tracer — Sample traces, collect their spans, and export each trace when its root ends.
+#   install_tracer — Set the process-wide tracer.
+#   configure_tracing — Build a file-exporting tracer and install it.
+#   shutdown_tracing — Export unfinished traces and close the exporter.
+#   current_span — Read the span bound to the current context.
+#   start_span — Context manager timing the enclosed block as a child of the current span.
+#   traced — Decorator running an async function inside a span.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added pipeline tracing with OTLP JSON lines export.
+# END_CHANGE_SUMMARY
+
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, Protocol, TypeVar
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "tg-etl-digest"
+_SPAN_KIND_INTERNAL = 1
+_STATUS_UNSET = 0
+_STATUS_ERROR = 2
+
+T = TypeVar("T")
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "sampled",
+        "attributes",
+        "start_unix_ns",
+        "end_unix_ns",
+        "status_code",
+        "status_message",
+        "_start_perf_ns",
+    )
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str], sampled: bool) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes: dict[str, Any] = {}
+        self.start_unix_ns = time.time_ns()
+        self.end_unix_ns: Optional[int] = None
+        self.status_code = _STATUS_UNSET
+        self.status_message = ""
+        self._start_perf_ns = time.perf_counter_ns()
+
+    def set_attributes(self, **attributes: Any) -> None:
+        if self.sampled:
+            self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def record_error(self, error: BaseException) -> None:
+        if self.sampled:
+            self.status_code = _STATUS_ERROR
+            self.status_message = str(error) or type(error).__name__
+            self.attributes["exception.type"] = type(error).__name__
+
+    def end(self) -> None:
+        # Wall-clock start plus a monotonic duration keeps spans ordered across clock adjustments.
+        self.end_unix_ns = self.start_unix_ns + (time.perf_counter_ns() - self._start_perf_ns)
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_unix_ns),
+        "endTimeUnixNano": str(span.end_unix_ns or span.start_unix_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": span.status_code},
+    }
+    if span.parent_id:
+        record["parentSpanId"] = span.parent_id
+    if span.status_message:
+        record["status"]["message"] = span.status_message
+    return record
+
+
+class OtlpJsonLinesExporter:
+    # START_CONTRACT: OtlpJsonLinesExporter.__init__
+    #   PURPOSE: Open the export file for appending; one line per export(), written with a single O_APPEND write so webhook worker processes can share the file.
+    #   INPUTS: { path: Path|str, service_name: str }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: creates parent directories and opens the file
+    #   LINKS: M-APP-TRACING
+    # END_CONTRACT: OtlpJsonLinesExporter.__init__
+    def __init__(self, path: Path | str, *, service_name: str = SERVICE_NAME) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._lock = threading.Lock()
+        self._resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+
+    def export(self, spans: list[Span]) -> None:
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": self._resource,
+                        "scopeSpans": [{"scope": {"name": __name__}, "spans": [_otlp_span(s) for s in spans]}],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        with self._lock:
+            os.write(self._fd, (line + "\n").encode("utf-8"))
+
+    def close(self) -> None:
+        with self._lock:
+            os.close(self._fd)
+
+
+class Tracer:
+    # START_CONTRACT: Tracer.__init__
+    #   PURPOSE: Bind an exporter and the fraction of root spans to sample; children follow their root's decision.
+    #   INPUTS: { exporter: SpanExporter, sample_ratio: float - 0..1, rng: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-APP-TRACING
+    # END_CONTRACT: Tracer.__init__
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        sample_ratio: float = 1.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._exporter = exporter
+        self._sample_ratio = min(1.0, max(0.0, sample_ratio))
+        self._rng = rng
+        self._pending: dict[str, list[Span]] = {}
+
+    def start(self, name: str, parent: Optional[Span]) -> Span:
+        span_id = f"{random.getrandbits(64):016x}"
+        if parent is not None:
+            return Span(name, parent.trace_id, span_id, parent.span_id, parent.sampled)
+        sampled = self._sample_ratio > 0 and self._rng() < self._sample_ratio
+        span = Span(name, f"{random.getrandbits(128):032x}", span_id, None, sampled)
+        if sampled:
+            self._pending[span.trace_id] = []
+        return span
+
+    # START_CONTRACT: Tracer.end
+    #   PURPOSE: Close a span; a root flushes its whole trace, a child outliving its root is exported alone.
+    #   INPUTS: { span: Span }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: writes through the exporter; never raises
+    #   LINKS: M-APP-TRACING
+    # END_CONTRACT: Tracer.end
+    def end(self, span: Span) -> None:
+        if not span.sampled:
+            return
+        span.end()
+        # START_BLOCK_BUFFER_OR_EXPORT_TRACE
+        if span.parent_id is not None and span.trace_id in self._pending:
+            self._pending[span.trace_id].append(span)
+            return
+        batch = self._pending.pop(span.trace_id, []) if span.parent_id is None else []
+        batch.append(span)
+        try:
+            self._exporter.export(batch)
+        except Exception:
+            logger.warning("[Tracer][end][BUFFER_OR_EXPORT_TRACE] export failed spans=%s", len(batch), exc_info=True)
+        # END_BLOCK_BUFFER_OR_EXPORT_TRACE
+
+    def close(self) -> None:
+        for spans in self._pending.values():
+            if spans:
+                try:
+                    self._exporter.export(spans)
+                except Exception:
+                    logger.warning("[Tracer][close][FLUSH_PENDING] export failed", exc_info=True)
+        self._pending.clear()
+        self._exporter.close()
+
+
+_TRACER: Optional[Tracer] = None
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# Returned when tracing is off so callers can set attributes unconditionally.
+_NOOP_SPAN = Span("noop", "0" * 32, "0" * 16, None, False)
+
+
+def install_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    global _TRACER
+    previous, _TRACER = _TRACER, tracer
+    return previous
+
+
+# START_CONTRACT: configure_tracing
+#   PURPOSE: Install a tracer writing sampled traces as OTLP JSON lines to export_path.
+#   INPUTS: { export_path: Path|str, sample_ratio: float }
+#   OUTPUTS: { Tracer }
+#   SIDE_EFFECTS: opens the export file; replaces the process-wide tracer
+#   LINKS: M-APP-TRACING
+# END_CONTRACT: configure_tracing
+def configure_tracing(export_path: Path | str, *, sample_ratio: float) -> Tracer:
+    tracer = Tracer(OtlpJsonLinesExporter(export_path), sample_ratio=sample_ratio)
+    install_tracer(tracer)
+    logger.info("[Tracing][configure_tracing][INSTALL] path=%s sample_ratio=%s", export_path, sample_ratio)
+    return tracer
+
+
+def shutdown_tracing() -> None:
+    tracer = install_tracer(None)
+    if tracer is not None:
+        tracer.close()
+
+
+def current_span() -> Span:
+    return _CURRENT_SPAN.get() or _NOOP_SPAN
+
+
+# START_CONTRACT: start_span
+#   PURPOSE: Time the enclosed block as a child of the current span (or a new root); tasks created inside inherit it.
+#   INPUTS: { name: str, **attributes: str|int|float|bool|None - None values are dropped }
+#   OUTPUTS: { Iterator[Span] - the active span; a shared no-op span when tracing is off }
+#   SIDE_EFFECTS: sets and resets a context variable; marks the span failed if the block raises
+#   LINKS: M-APP-TRACING
+# END_CONTRACT: start_span
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span]:
+    tracer = _TRACER
+    parent = _CURRENT_SPAN.get()
+    if tracer is None or (parent is not None and not parent.sampled):
+        yield parent or _NOOP_SPAN
+        return
+    span = tracer.start(name, parent)
+    span.set_attributes(**attributes)
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _CURRENT_SPAN.reset(token)
+        tracer.end(span)
+
+
+def traced(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    def decorate(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with start_span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
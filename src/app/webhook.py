@@ -0,0 +1,188 @@
+# FILE: src/app/webhook.py
+# VERSION: 1.5.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Serve Telegram updates over an aiohttp webhook from one or more worker processes.
+#   SCOPE: Register the webhook once, fork N spawn-workers that each open their own runtime and bind the same port with SO_REUSEPORT, verify the secret token, and shut down gracefully on SIGTERM/SIGINT.
+#   DEPENDS: M-APP-LOGGING, M-ERROR-LOGGING, M-APP-LOOP-MONITOR, M-CONFIG, M-APP-RUNTIME, M-TELETHON-CLIENT
+#   LINKS: docs/knowledge-graph.xml#M-ENTRY-WEBHOOK
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   webhook_url — Public URL Telegram posts updates to.
+#   serve_worker — Run one webhook server process until stopped.
+#   run — Register webhook and supervise worker processes.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.5.1 - Passed each worker's metrics port (METRICS_PORT + index) explicitly.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+
+from aiogram import Bot
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from src.app.config import Config, load_config
+from src.app.error_logging import (
+    install_asyncio_exception_handler,
+    install_global_exception_hooks,
+    setup_runtime_logging,
+)
+from src.app.loop_monitor import install_loop_monitor
+from src.app.runtime import build_dispatcher, close_runtime, open_runtime
+from src.extractor.telethon_client import create_telethon_client, worker_session_name
+
+logger = logging.getLogger(__name__)
+
+
+def webhook_url(cfg: Config) -> str:
+    return f"{cfg.webhook_base_url}/{cfg.webhook_path.lstrip('/')}"
+
+
+# START_CONTRACT: serve_worker
+#   PURPOSE: Open a per-process runtime and serve webhook requests on the shared port until a stop signal arrives.
+#   INPUTS: { cfg: Config, index: int - worker number, workers: int - total worker count }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: opens DB/MTProto/LLM clients, listens on WEBHOOK_HOST:WEBHOOK_PORT, handles updates in background tasks
+#   LINKS: M-ENTRY-WEBHOOK, M-APP-RUNTIME
+# END_CONTRACT: serve_worker
+async def serve_worker(cfg: Config, index: int = 0, workers: int = 1) -> None:
+    loop = asyncio.get_running_loop()
+    install_asyncio_exception_handler(loop)
+    loop_monitor = install_loop_monitor(
+        interval_s=cfg.loop_monitor_interval_s, slow_callback_s=cfg.loop_slow_callback_s
+    )
+
+    # START_BLOCK_OPEN_RUNTIME_AND_APP
+    # Workers share OUTBOUND_GLOBAL_RATE so the bot token stays under Telegram's global limit.
+    # One process per MTProto session: a shared SQLite session file locks and a shared auth key gets revoked.
+    session_name = worker_session_name(cfg.telethon_session_name, index) if workers > 1 else None
+    rt = await open_runtime(
+        cfg,
+        outbound_rate_share=1.0 / workers,
+        metrics_port=cfg.metrics_port + index if cfg.metrics_port > 0 else 0,
+        telethon_session_name=session_name,
+    )
+    dispatcher = build_dispatcher(rt, cfg)
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=rt.bot,
+        secret_token=cfg.webhook_secret,
+    ).register(app, path=cfg.webhook_path)
+    setup_application(app, dispatcher, bot=rt.bot)
+    # END_BLOCK_OPEN_RUNTIME_AND_APP
+
+    # START_BLOCK_LISTEN_UNTIL_STOPPED
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    runner = web.AppRunner(app)
+    try:
+        await runner.setup()
+        site = web.TCPSite(runner, cfg.webhook_host, cfg.webhook_port, reuse_port=workers > 1)
+        await site.start()
+        logger.info(
+            "[Webhook][serve_worker][LISTEN_UNTIL_STOPPED] worker=%s/%s listening on %s:%s%s",
+            index + 1,
+            workers,
+            cfg.webhook_host,
+            cfg.webhook_port,
+            cfg.webhook_path,
+        )
+        await stop.wait()
+    finally:
+        await runner.cleanup()
+        await close_runtime(rt)
+        if loop_monitor is not None:
+            loop_monitor.stop()
+    # END_BLOCK_LISTEN_UNTIL_STOPPED
+
+
+def _worker_main(cfg: Config, index: int, workers: int) -> None:
+    setup_runtime_logging(cfg)
+    install_global_exception_hooks()
+    asyncio.run(serve_worker(cfg, index, workers))
+
+
+# START_CONTRACT: _authorize_worker_sessions
+#   PURPOSE: Log in every per-worker Telethon session from the supervisor, where the terminal is available; already authorized sessions just connect.
+#   INPUTS: { cfg: Config, workers: int }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: may prompt for phone login and create <TELETHON_SESSION_NAME>-<index>.session files
+#   LINKS: M-ENTRY-WEBHOOK, M-TELETHON-CLIENT
+# END_CONTRACT: _authorize_worker_sessions
+async def _authorize_worker_sessions(cfg: Config, workers: int) -> None:
+    for index in range(workers):
+        client = await create_telethon_client(
+            worker_session_name(cfg.telethon_session_name, index), cfg.tg_api_id, cfg.tg_api_hash
+        )
+        await client.disconnect()
+
+
+async def _register_webhook(cfg: Config) -> None:
+    bot = Bot(token=cfg.bot_token)
+    try:
+        await bot.set_webhook(webhook_url(cfg), secret_token=cfg.webhook_secret, drop_pending_updates=False)
+    finally:
+        await bot.session.close()
+
+
+# START_CONTRACT: run
+#   PURPOSE: Validate webhook settings, register the webhook with Telegram once, then serve in-process or authorize per-worker Telethon sessions and supervise WEBHOOK_WORKERS spawned processes.
+#   INPUTS: {}
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: calls setWebhook, spawns processes, forwards SIGTERM/SIGINT to workers
+#   LINKS: M-ENTRY-WEBHOOK, M-CONFIG
+# END_CONTRACT: run
+def run() -> None:
+    # START_BLOCK_INIT_AND_VALIDATE
+    cfg = load_config()
+    setup_runtime_logging(cfg)
+    install_global_exception_hooks()
+    if not cfg.webhook_base_url.startswith("https://"):
+        raise ValueError("WEBHOOK_BASE_URL must be an https:// URL in webhook mode")
+    if not cfg.webhook_secret:
+        raise ValueError("Missing env var: WEBHOOK_SECRET")
+    workers = max(1, cfg.webhook_workers)
+    if workers > 1 and cfg.fsm_storage != "postgres":
+        logger.warning(
+            "[Webhook][run][INIT_AND_VALIDATE] FSM_STORAGE=%s is per process; /add dialogs may land on another worker",
+            cfg.fsm_storage,
+        )
+    asyncio.run(_register_webhook(cfg))
+    logger.info("[Webhook][run][INIT_AND_VALIDATE] webhook set url=%s workers=%s", webhook_url(cfg), workers)
+    # END_BLOCK_INIT_AND_VALIDATE
+
+    if workers == 1:
+        asyncio.run(serve_worker(cfg))
+        return
+
+    # START_BLOCK_SUPERVISE_WORKERS
+    asyncio.run(_authorize_worker_sessions(cfg, workers))
+    # spawn, not fork: every worker builds its own event loop, pool and HTTP clients from scratch.
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker_main, args=(cfg, i, workers), name=f"webhook-{i}") for i in range(workers)]
+    for proc in procs:
+        proc.start()
+
+    def _forward(signum, _frame) -> None:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for proc in procs:
+        proc.join()
+        if proc.exitcode:
+            logger.error("[Webhook][run][SUPERVISE_WORKERS] %s exited code=%s", proc.name, proc.exitcode)
+    # END_BLOCK_SUPERVISE_WORKERS
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,148 @@
+# FILE: src/bot/delivery.py
+# VERSION: 1.1.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Deliver digests produced by queue workers back to the users who requested them.
+#   SCOPE: Wake on jobs_done notifications or a poll timeout, lease undelivered finished jobs, send their remaining chunks or a failure notice through the outbound dispatcher, and retry failed deliveries.
+#   DEPENDS: M-STORAGE-JOBS, M-BOT-OUTBOUND, M-ERRORS
+#   LINKS: docs/knowledge-graph.xml#M-BOT-DELIVERY
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   JobDelivery — Background loop sending finished job results to chats.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.0 - Delivered under a lease with per-chunk progress; failed sends retry with backoff instead of dropping the digest.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import uuid
+
+from src.app.errors import StorageError
+from src.bot.outbound import OutboundDispatcher
+from src.domain.dto import FinishedJobDTO
+from src.storage.jobs import (
+    JOBS_DONE_CHANNEL,
+    JobSignal,
+    claim_undelivered_jobs,
+    mark_job_delivered,
+    record_delivery_progress,
+    retry_job_delivery,
+)
+
+logger = logging.getLogger(__name__)
+
+FAILED_JOB_TEXT = "Не удалось собрать дайджест. Попробуйте позже."
+DELIVERY_MAX_ATTEMPTS = 5
+
+
+class JobDelivery:
+    # START_CONTRACT: JobDelivery.__init__
+    #   PURPOSE: Bind the pool and outbound sender; poll_interval_s bounds delivery delay when a notification is missed.
+    #   INPUTS: { pool: asyncpg.Pool, outbound: OutboundDispatcher, poll_interval_s: float, batch: int - jobs claimed per pass, lease_s: float - delivery lease, extended after each chunk, retry_backoff_s: float - first delay after a failed send, doubled per attempt }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-BOT-DELIVERY
+    # END_CONTRACT: JobDelivery.__init__
+    def __init__(
+        self,
+        pool,
+        outbound: OutboundDispatcher,
+        *,
+        poll_interval_s: float = 5.0,
+        batch: int = 50,
+        lease_s: float = 120.0,
+        retry_backoff_s: float = 30.0,
+    ) -> None:
+        self._pool = pool
+        self._outbound = outbound
+        self._poll_interval_s = max(0.1, poll_interval_s)
+        self._batch = max(1, batch)
+        self._lease_s = max(1.0, lease_s)
+        self._retry_backoff_s = max(0.0, retry_backoff_s)
+        self._signal = JobSignal(pool, JOBS_DONE_CHANNEL)
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self._signal.start()
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._signal.aclose()
+
+    # START_CONTRACT: JobDelivery.deliver_pending
+    #   PURPOSE: Lease and send finished jobs until none are claimable.
+    #   INPUTS: {}
+    #   OUTPUTS: { int - jobs claimed for delivery }
+    #   SIDE_EFFECTS: sends Telegram messages; records delivery progress, completion or retry
+    #   LINKS: M-BOT-DELIVERY, M-STORAGE-JOBS
+    # END_CONTRACT: JobDelivery.deliver_pending
+    async def deliver_pending(self) -> int:
+        delivered = 0
+        while True:
+            jobs = await claim_undelivered_jobs(
+                self._pool, uuid.uuid4().hex, lease_s=self._lease_s, limit=self._batch
+            )
+            # Cancelled sends (shutdown) leave the lease to expire; another process resumes after delivered_chunks.
+            await asyncio.gather(*[self._send(job) for job in jobs])
+            delivered += len(jobs)
+            if len(jobs) < self._batch:
+                return delivered
+
+    # START_CONTRACT: JobDelivery._send
+    #   PURPOSE: Send the chunks not yet delivered, then mark the job delivered; on failure schedule a retry, or give up after DELIVERY_MAX_ATTEMPTS.
+    #   INPUTS: { job: FinishedJobDTO }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: sends Telegram messages; updates the job's delivery state
+    #   LINKS: M-BOT-DELIVERY, M-STORAGE-JOBS
+    # END_CONTRACT: JobDelivery._send
+    async def _send(self, job: FinishedJobDTO) -> None:
+        chunks = job.chunks if job.status == "done" else [FAILED_JOB_TEXT]
+        try:
+            # START_BLOCK_SEND_REMAINING_CHUNKS
+            for sent in range(job.delivered_chunks, len(chunks)):
+                await self._outbound.send_message(job.chat_id, chunks[sent])
+                if not await record_delivery_progress(self._pool, job, sent + 1, lease_s=self._lease_s):
+                    logger.warning("[JobDelivery][_send][SEND_REMAINING_CHUNKS] lease lost job_id=%s", job.id)
+                    return
+            await mark_job_delivered(self._pool, job)
+            # END_BLOCK_SEND_REMAINING_CHUNKS
+        except Exception:
+            # START_BLOCK_RETRY_OR_GIVE_UP
+            give_up = job.delivery_attempts >= DELIVERY_MAX_ATTEMPTS
+            logger.exception(
+                "[JobDelivery][_send][RETRY_OR_GIVE_UP] job_id=%s chat_id=%s attempt=%s give_up=%s",
+                job.id,
+                job.chat_id,
+                job.delivery_attempts,
+                give_up,
+            )
+            try:
+                if give_up:
+                    await mark_job_delivered(self._pool, job)
+                else:
+                    delay = self._retry_backoff_s * 2 ** (job.delivery_attempts - 1)
+                    await retry_job_delivery(self._pool, job, delay_s=delay)
+            except StorageError:
+                logger.warning("[JobDelivery][_send][RETRY_OR_GIVE_UP] job_id=%s lease left to expire", job.id)
+            # END_BLOCK_RETRY_OR_GIVE_UP
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.deliver_pending()
+            except StorageError:
+                logger.exception("[JobDelivery][_run][DELIVER] claim failed")
+            else:
+                if delivered:
+                    logger.info("[JobDelivery][_run][DELIVER] delivered=%s", delivered)
+            await self._signal.wait(self._poll_interval_s)
@@ -1,40 +1,59 @@
 # FILE: src/bot/handlers.py
-# VERSION: 1.0.0
+# VERSION: 1.13.1
 # START_MODULE_CONTRACT
 #   PURPOSE: Implement Telegram command handlers and user-facing response formatting.
-#   SCOPE: Handle /start, /add, /list, /remove, /analytic flows with FSM transitions and domain error mapping.
-#   DEPENDS: M-CONFIG, M-ERRORS, M-PARSING-CHANNELS, M-SVC-ADD-CHANNELS, M-SVC-ANALYTIC, M-STORAGE-REPO, M-SUMMARIZER-LLM, M-BOT-STATES
+#   SCOPE: Handle /start, /add, /import, /list, /remove, /analytic flows with FSM transitions and domain error mapping.
+#   DEPENDS: M-CONFIG, M-ERRORS, M-PARSING-CHANNELS, M-SVC-ADD-CHANNELS, M-SVC-ANALYTIC, M-SVC-QUOTA, M-STORAGE-REPO, M-SUMMARIZER-LLM, M-BOT-STATES, M-BOT-PROGRESS, M-BOT-OUTBOUND, M-STORAGE-LOCKS, M-STORAGE-JOBS, M-SVC-IMPORT, M-PARSING-IMPORTS, M-EXTRACTOR-TELETHON, M-APP-TRACING
 #   LINKS: docs/development-plan.xml#M-BOT-HANDLERS, docs/knowledge-graph.xml#M-BOT-HANDLERS
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
 #   format_add_response — Render grouped add-channels outcome.
+#   format_quota_denied — Render over-quota reply with wait time.
+#   INVALID_TOKEN_PREVIEW_CHARS — Longest unrecognized import token echoed back.
+#   format_import_response — Render /import totals with a sample of unrecognized tokens.
 #   handle_start — Send onboarding message.
 #   handle_add — Process /add command (inline args or FSM transition).
 #   handle_add_waiting_input — Process add flow continuation in FSM state.
+#   handle_import — Process /import with an attached file, inline list, or `dialogs`.
+#   handle_import_waiting_file — Process the file or list sent after bare /import.
 #   handle_list — List stored channels for user.
 #   handle_remove — Remove one channel from user list.
-#   handle_analytic — Run analytic use case and send chunked digest.
+#   handle_analytic — Run analytic use case (or queue it for a worker) and send chunked digest.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.1.0 - Added error-level logging for handled domain failures.
+#   LAST_CHANGE: v1.13.1 - Capped echoed invalid import tokens; checked upload size before debiting /import quota; answered failed downloads.
 # END_CHANGE_SUMMARY
 
+import io
 import logging
+import time
+from typing import Iterable
 
 from aiogram import types
+from aiogram.exceptions import TelegramAPIError
 from aiogram.fsm.context import FSMContext
 
 from src.app.config import Config
-from src.app.errors import DomainError
+from src.app.errors import DomainError, ValidationError
+from src.app.tracing import current_span, start_span, traced
+from src.extractor.telethon_extractor import list_broadcast_channels
 from src.parsing.channels import parse_channels
+from src.parsing.imports import detect_import_format, iter_import_tokens
 from src.services.add_channels import AddChannelsResponse, add_channels_usecase
 from src.services.analytic import analytic_usecase
+from src.services.import_channels import ImportChannelsResponse, import_channels_usecase
+from src.services.quota import COMMAND_ADD, COMMAND_IMPORT, QuotaDecision, QuotaPolicy, admit, admit_analytic
+from src.storage.jobs import JOB_ANALYTIC, enqueue_job
+from src.storage.locks import ChannelLocks
 from src.storage.repository import list_user_channels, remove_channel_for_user
+from src.storage.usage import UsageRecorder
 from src.summarizer.llm import Summarizer
 
-from .states import AddChannelsFSM
+from .outbound import OutboundDispatcher
+from .progress import ThrottledMessageEditor
+from .states import AddChannelsFSM, ImportChannelsFSM
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +103,65 @@ def format_add_response(resp: AddChannelsResponse) -> str:
     # END_BLOCK_RETURN_FINAL_ADD_MESSAGE
 
 
+# START_CONTRACT: format_quota_denied
+#   PURPOSE: Tell the user a command is over quota and when it can run again.
+#   INPUTS: { command: str - e.g. "/analytic", decision: QuotaDecision }
+#   OUTPUTS: { str - message body }
+#   SIDE_EFFECTS: none
+#   LINKS: M-BOT-HANDLERS, M-SVC-QUOTA
+# END_CONTRACT: format_quota_denied
+def format_quota_denied(command: str, decision: QuotaDecision) -> str:
+    if decision.retry_after_s == float("inf"):
+        return f"⏳ Лимит на {command} исчерпан."
+    minutes = max(1, round(decision.retry_after_s / 60))
+    return f"⏳ Лимит на {command} исчерпан. Попробуйте через {minutes} мин."
+
+
+INVALID_TOKEN_PREVIEW_CHARS = 64
+
+
+# START_CONTRACT: format_import_response
+#   PURPOSE: Summarize an import as counts; lists are omitted because imports run to hundreds of channels, and echoed invalid tokens are cut to INVALID_TOKEN_PREVIEW_CHARS.
+#   INPUTS: { resp: ImportChannelsResponse, max_per_user: int }
+#   OUTPUTS: { str - formatted message body }
+#   SIDE_EFFECTS: none
+#   LINKS: M-BOT-HANDLERS, M-SVC-IMPORT
+# END_CONTRACT: format_import_response
+def format_import_response(resp: ImportChannelsResponse, *, max_per_user: int) -> str:
+    lines = ["📥 Импорт завершён.", f"✅ Добавлено: {resp.added}"]
+    if resp.already_present:
+        lines.append(f"⚠️ Уже было: {resp.already_present}")
+    if resp.rejected_due_to_limit:
+        lines.append(f"⛔ Превышен лимит {max_per_user} каналов, не добавил: {resp.rejected_due_to_limit}")
+    if resp.invalid_count:
+        lines.append(f"❌ Не распознано ({resp.invalid_count}):")
+        lines.extend(
+            [
+                f"• {t}" if len(t) <= INVALID_TOKEN_PREVIEW_CHARS else f"• {t[: INVALID_TOKEN_PREVIEW_CHARS - 1]}…"
+                for t in resp.invalid_sample
+            ]
+        )
+        if resp.invalid_count > len(resp.invalid_sample):
+            lines.append("• …")
+    return "\n".join(lines)
+
+
+async def _admit_add(message: types.Message, pool, cfg: Config, raw: str) -> bool:
+    if not cfg.quota_enabled:
+        return True
+    parsed = parse_channels(raw, max_items=cfg.max_add_per_call)
+    decision = await admit(
+        pool,
+        message.from_user.id,
+        COMMAND_ADD,
+        len(parsed.valid_handles),
+        QuotaPolicy(cfg.quota_add_capacity, cfg.quota_add_refill_per_hour),
+    )
+    if not decision.allowed:
+        await message.answer(format_quota_denied("/add", decision))
+    return decision.allowed
+
+
 # START_CONTRACT: handle_start
 #   PURPOSE: Send basic onboarding instructions.
 #   INPUTS: { message: aiogram.types.Message }
@@ -92,15 +170,17 @@ def format_add_response(resp: AddChannelsResponse) -> str:
 #   LINKS: M-BOT-HANDLERS
 # END_CONTRACT: handle_start
 async def handle_start(message: types.Message) -> None:
-    await message.answer("Привет! Добавь каналы через /add, потом запусти /analytic для дайджеста.")
+    await message.answer(
+        "Привет! Добавь каналы через /add (или списком из файла через /import), потом запусти /analytic для дайджеста."
+    )
 
 
 # START_CONTRACT: handle_add
 #   PURPOSE: Handle /add command with optional inline arguments and FSM fallback.
 #   INPUTS: { message: Message, state: FSMContext, pool: asyncpg.Pool, cfg: Config }
 #   OUTPUTS: { None }
-#   SIDE_EFFECTS: writes FSM state and sends Telegram messages
-#   LINKS: M-BOT-HANDLERS, M-SVC-ADD-CHANNELS, M-BOT-STATES
+#   SIDE_EFFECTS: writes FSM state, debits /add quota, and sends Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-ADD-CHANNELS, M-SVC-QUOTA, M-BOT-STATES
 # END_CONTRACT: handle_add
 async def handle_add(message: types.Message, state: FSMContext, pool, cfg: Config) -> None:
     try:
@@ -123,6 +203,8 @@ async def handle_add(message: types.Message, state: FSMContext, pool, cfg: Confi
         # END_BLOCK_HANDLE_EMPTY_ADD_ARGS_WITH_FSM
 
         # START_BLOCK_EXECUTE_ADD_USECASE_AND_REPLY
+        if not await _admit_add(message, pool, cfg, args):
+            return
         resp = await add_channels_usecase(
             pool,
             message.from_user.id,
@@ -141,8 +223,8 @@ async def handle_add(message: types.Message, state: FSMContext, pool, cfg: Confi
 #   PURPOSE: Handle follow-up add payload when user is in WAITING_CHANNELS_INPUT state.
 #   INPUTS: { message: Message, state: FSMContext, pool: asyncpg.Pool, cfg: Config }
 #   OUTPUTS: { None }
-#   SIDE_EFFECTS: clears FSM state on successful parsed input and sends Telegram messages
-#   LINKS: M-BOT-HANDLERS, M-SVC-ADD-CHANNELS, M-PARSING-CHANNELS, M-BOT-STATES
+#   SIDE_EFFECTS: clears FSM state on successful parsed input, debits /add quota, and sends Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-ADD-CHANNELS, M-SVC-QUOTA, M-PARSING-CHANNELS, M-BOT-STATES
 # END_CONTRACT: handle_add_waiting_input
 async def handle_add_waiting_input(message: types.Message, state: FSMContext, pool, cfg: Config) -> None:
     try:
@@ -154,6 +236,8 @@ async def handle_add_waiting_input(message: types.Message, state: FSMContext, po
         # END_BLOCK_VALIDATE_WAITING_INPUT_PAYLOAD
 
         # START_BLOCK_RUN_ADD_USECASE_AND_REPLY
+        if not await _admit_add(message, pool, cfg, raw):
+            return
         resp = await add_channels_usecase(
             pool,
             message.from_user.id,
@@ -176,6 +260,170 @@ async def handle_add_waiting_input(message: types.Message, state: FSMContext, po
         await message.answer("Не удалось добавить каналы. Попробуйте позже.")
 
 
+async def _admit_import(message: types.Message, pool, cfg: Config) -> bool:
+    if not cfg.quota_enabled:
+        return True
+    decision = await admit(
+        pool,
+        message.from_user.id,
+        COMMAND_IMPORT,
+        1,
+        QuotaPolicy(cfg.quota_import_capacity, cfg.quota_import_refill_per_hour),
+    )
+    if not decision.allowed:
+        await message.answer(format_quota_denied("/import", decision))
+    return decision.allowed
+
+
+async def _import_document_fits(message: types.Message, cfg: Config) -> bool:
+    # Checked before the quota debit: an oversized upload should not cost an /import.
+    document = message.document
+    if document.file_size and document.file_size > cfg.import_max_file_bytes:
+        await message.answer(f"Файл слишком большой: максимум {cfg.import_max_file_bytes // 1024} КБ.")
+        return False
+    return True
+
+
+async def _read_import_document(message: types.Message, cfg: Config) -> Iterable[str] | None:
+    document = message.document
+    try:
+        buf = await message.bot.download(document)
+    except TelegramAPIError:
+        logger.warning("[BotHandlers][_read_import_document][DOWNLOAD] download failed", exc_info=True)
+        await message.answer("Не удалось скачать файл. Отправьте его ещё раз.")
+        return None
+    fmt = detect_import_format(document.file_name, buf.getvalue()[:64].decode("utf-8", errors="ignore"))
+    buf.seek(0)
+    # Lines are decoded lazily so txt/csv uploads are parsed as they are read.
+    return iter_import_tokens(io.TextIOWrapper(buf, encoding="utf-8-sig", errors="replace"), fmt)
+
+
+# START_CONTRACT: _run_import
+#   PURPOSE: Import a token stream for the sender, editing a status message with throttled progress, then reply with totals.
+#   INPUTS: { message: Message, pool: asyncpg.Pool, cfg: Config, tokens: Iterable[str] }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: writes user channels; sends and edits Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-IMPORT
+# END_CONTRACT: _run_import
+async def _run_import(message: types.Message, pool, cfg: Config, tokens: Iterable[str]) -> None:
+    status = await message.answer("📥 Импортирую каналы…")
+    last_edit = time.monotonic()
+
+    async def on_progress(processed: int, added: int) -> None:
+        nonlocal last_edit
+        now = time.monotonic()
+        if now - last_edit < cfg.stream_edit_interval_s:
+            return
+        last_edit = now
+        try:
+            await status.edit_text(f"📥 Импортирую каналы… обработано {processed}, добавлено {added}")
+        except Exception:
+            logger.debug("[BotHandlers][_run_import][EDIT_PROGRESS] edit failed", exc_info=True)
+
+    resp = await import_channels_usecase(
+        pool,
+        message.from_user.id,
+        tokens,
+        batch_size=cfg.import_batch_size,
+        max_per_user=cfg.max_channels_per_user,
+        on_progress=on_progress,
+    )
+    await message.answer(format_import_response(resp, max_per_user=cfg.max_channels_per_user))
+
+
+# START_CONTRACT: handle_import
+#   PURPOSE: Handle /import: a captioned file or inline list is imported at once, `dialogs` imports the session account's channels for allowed users, a bare command waits for a file.
+#   INPUTS: { message: Message, state: FSMContext, pool: asyncpg.Pool, tg_client: TelegramClient, cfg: Config }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: writes FSM state, debits /import quota, downloads uploads, reads Telethon dialogs, writes user channels, sends Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-IMPORT, M-PARSING-IMPORTS, M-EXTRACTOR-TELETHON, M-SVC-QUOTA, M-BOT-STATES
+# END_CONTRACT: handle_import
+async def handle_import(message: types.Message, state: FSMContext, pool, tg_client, cfg: Config) -> None:
+    try:
+        # START_BLOCK_PARSE_IMPORT_COMMAND_ARGS
+        text = message.text or message.caption or ""
+        parts = text.split(maxsplit=1)
+        args = parts[1].strip() if len(parts) > 1 else ""
+        # END_BLOCK_PARSE_IMPORT_COMMAND_ARGS
+
+        # START_BLOCK_WAIT_FOR_FILE_WHEN_NO_PAYLOAD
+        if message.document is None and not args:
+            await state.set_state(ImportChannelsFSM.WAITING_IMPORT_FILE)
+            await message.answer(
+                "Пришли файл со списком каналов: .txt (по одному или через пробел), "
+                ".csv (колонка handle/username/link) или .json.\n"
+                "Можно и просто текстом."
+            )
+            return
+        # END_BLOCK_WAIT_FOR_FILE_WHEN_NO_PAYLOAD
+
+        # START_BLOCK_RESOLVE_IMPORT_SOURCE_AND_RUN
+        if message.document is None and args.lower() == "dialogs":
+            if message.from_user.id not in cfg.import_dialogs_user_ids:
+                await message.answer("Импорт подписок аккаунта недоступен.")
+                return
+            if not await _admit_import(message, pool, cfg):
+                return
+            tokens = [str(h) for h in await list_broadcast_channels(tg_client)]
+            await _run_import(message, pool, cfg, tokens)
+            return
+
+        if message.document is not None and not await _import_document_fits(message, cfg):
+            return
+        if not await _admit_import(message, pool, cfg):
+            return
+        if message.document is not None:
+            tokens = await _read_import_document(message, cfg)
+            if tokens is None:
+                return
+        else:
+            tokens = iter_import_tokens(args.splitlines(), "txt")
+        await _run_import(message, pool, cfg, tokens)
+        # END_BLOCK_RESOLVE_IMPORT_SOURCE_AND_RUN
+    except ValidationError as e:
+        await message.answer(f"Не удалось разобрать файл: {e}")
+    except DomainError:
+        logger.exception("[BotHandlers][handle_import][DOMAIN_ERROR] failed to import channels")
+        await message.answer("Не удалось импортировать каналы. Попробуйте позже.")
+
+
+# START_CONTRACT: handle_import_waiting_file
+#   PURPOSE: Import the file or text list sent while in WAITING_IMPORT_FILE state.
+#   INPUTS: { message: Message, state: FSMContext, pool: asyncpg.Pool, cfg: Config }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: clears FSM state once a payload arrives, debits /import quota, writes user channels, sends Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-IMPORT, M-PARSING-IMPORTS, M-SVC-QUOTA, M-BOT-STATES
+# END_CONTRACT: handle_import_waiting_file
+async def handle_import_waiting_file(message: types.Message, state: FSMContext, pool, cfg: Config) -> None:
+    try:
+        # START_BLOCK_VALIDATE_IMPORT_PAYLOAD
+        raw = (message.text or "").strip()
+        if message.document is None and not raw:
+            await message.answer("Жду файл (.txt, .csv, .json) или список каналов текстом.")
+            return
+        await state.clear()
+        if message.document is not None and not await _import_document_fits(message, cfg):
+            return
+        if not await _admit_import(message, pool, cfg):
+            return
+        # END_BLOCK_VALIDATE_IMPORT_PAYLOAD
+
+        # START_BLOCK_RUN_IMPORT_AND_REPLY
+        if message.document is not None:
+            tokens = await _read_import_document(message, cfg)
+            if tokens is None:
+                return
+        else:
+            tokens = iter_import_tokens(raw.splitlines(), "txt")
+        await _run_import(message, pool, cfg, tokens)
+        # END_BLOCK_RUN_IMPORT_AND_REPLY
+    except ValidationError as e:
+        await message.answer(f"Не удалось разобрать файл: {e}")
+    except DomainError:
+        logger.exception("[BotHandlers][handle_import_waiting_file][DOMAIN_ERROR] failed to import channels")
+        await message.answer("Не удалось импортировать каналы. Попробуйте позже.")
+
+
 # START_CONTRACT: handle_list
 #   PURPOSE: Return list of saved channels for the requesting user.
 #   INPUTS: { message: Message, pool: asyncpg.Pool }
@@ -239,34 +487,115 @@ async def handle_remove(message: types.Message, pool) -> None:
         await message.answer("Не удалось удалить канал.")
 
 
+# One reply per incoming update is paced by the user's own sends, so the other commands answer directly.
+# /analytic bursts (status, preview edits, digest chunks) share the chat's budget, so all of its output is queued.
+async def _answer(message: types.Message, text: str, outbound: OutboundDispatcher | None) -> types.Message:
+    if outbound is None:
+        return await message.answer(text)
+    return await outbound.send_message(message.chat.id, text)
+
+
 # START_CONTRACT: handle_analytic
-#   PURPOSE: Run analytic use case and deliver digest chunks to user.
-#   INPUTS: { message: Message, pool: asyncpg.Pool, tg_client: TelegramClient, summarizer: Summarizer, cfg: Config }
+#   PURPOSE: Run analytic use case and deliver digest chunks to user, optionally streaming summary progress into the status message; with JOB_QUEUE, enqueue the run for a worker instead.
+#   INPUTS: { message: Message, pool: asyncpg.Pool, tg_client: TelegramClient, summarizer: Summarizer, cfg: Config, usage_recorder: UsageRecorder|None, outbound: OutboundDispatcher|None, channel_locks: ChannelLocks|None }
 #   OUTPUTS: { None }
-#   SIDE_EFFECTS: triggers ETL + LLM calls and sends one or more Telegram messages
-#   LINKS: M-BOT-HANDLERS, M-SVC-ANALYTIC
+#   SIDE_EFFECTS: debits /analytic quota, inserts a queued job or triggers ETL + LLM calls, edits status message, and sends one or more Telegram messages
+#   LINKS: M-BOT-HANDLERS, M-SVC-ANALYTIC, M-SVC-QUOTA, M-BOT-PROGRESS, M-BOT-OUTBOUND, M-STORAGE-JOBS, M-APP-TRACING
 # END_CONTRACT: handle_analytic
-async def handle_analytic(message: types.Message, pool, tg_client, summarizer: Summarizer, cfg: Config) -> None:
+@traced("handle_analytic")
+async def handle_analytic(
+    message: types.Message,
+    pool,
+    tg_client,
+    summarizer: Summarizer,
+    cfg: Config,
+    usage_recorder: UsageRecorder | None = None,
+    outbound: OutboundDispatcher | None = None,
+    channel_locks: ChannelLocks | None = None,
+) -> None:
+    current_span().set_attributes(tg_user_id=message.from_user.id, queued=cfg.job_queue)
     try:
+        # START_BLOCK_ADMIT_ANALYTIC_REQUEST
+        if cfg.quota_enabled:
+            decision = await admit_analytic(
+                pool,
+                message.from_user.id,
+                posts_per_channel=cfg.posts_per_channel,
+                max_channels_per_call=cfg.max_channels_per_analytic_call,
+                policy=QuotaPolicy(cfg.quota_analytic_capacity, cfg.quota_analytic_refill_per_hour),
+            )
+            if not decision.allowed:
+                await _answer(message, format_quota_denied("/analytic", decision), outbound)
+                return
+        # END_BLOCK_ADMIT_ANALYTIC_REQUEST
+
+        # START_BLOCK_ENQUEUE_ANALYTIC_JOB
+        if cfg.job_queue:
+            job_id = await enqueue_job(
+                pool,
+                JOB_ANALYTIC,
+                message.from_user.id,
+                message.chat.id,
+                max_attempts=cfg.job_max_attempts,
+            )
+            logger.info("[BotHandlers][handle_analytic][ENQUEUE_ANALYTIC_JOB] job_id=%s", job_id)
+            await _answer(message, "Дайджест поставлен в очередь — пришлю его, как только он будет готов.", outbound)
+            return
+        # END_BLOCK_ENQUEUE_ANALYTIC_JOB
+
         # START_BLOCK_NOTIFY_USER_AND_RUN_ANALYTIC_USECASE
-        await message.answer("Собираю посты и делаю дайджест…")
-        resp = await analytic_usecase(
-            pool=pool,
-            tg_user_id=message.from_user.id,
-            tg_client=tg_client,
-            summarizer=summarizer,
-            posts_per_channel=cfg.posts_per_channel,
-            max_channels_per_call=cfg.max_channels_per_analytic_call,
-            max_chars_per_post=cfg.max_chars_per_post,
-            tg_message_max_len=cfg.tg_message_max_len,
-            include_post_links=cfg.include_post_links,
+        header = "Собираю посты и делаю дайджест…"
+        status = await _answer(message, header, outbound)
+        editor = (
+            ThrottledMessageEditor(
+                status,
+                header=header,
+                min_interval_s=cfg.stream_edit_interval_s,
+                max_len=cfg.tg_message_max_len,
+                outbound=outbound,
+            )
+            if cfg.llm_stream_responses
+            else None
         )
+        if editor is not None:
+            editor.start()
+        try:
+            resp = await analytic_usecase(
+                pool=pool,
+                tg_user_id=message.from_user.id,
+                tg_client=tg_client,
+                summarizer=summarizer,
+                posts_per_channel=cfg.posts_per_channel,
+                max_channels_per_call=cfg.max_channels_per_analytic_call,
+                max_chars_per_post=cfg.max_chars_per_post,
+                tg_message_max_len=cfg.tg_message_max_len,
+                include_post_links=cfg.include_post_links,
+                on_summary_delta=editor.on_delta if editor is not None else None,
+                incremental_summaries=cfg.incremental_summaries,
+                incremental_max_delta_posts=cfg.incremental_max_delta_posts,
+                usage_recorder=usage_recorder,
+                boilerplate_stripping=cfg.boilerplate_stripping,
+                boilerplate_min_share=cfg.boilerplate_min_share,
+                boilerplate_max_removal_ratio=cfg.boilerplate_max_removal_ratio,
+                prompt_compaction=cfg.prompt_compaction,
+                channel_locks=channel_locks,
+                channel_lock_wait_s=cfg.channel_lock_wait_s,
+                on_channel_done=editor.on_channel_done if editor is not None else None,
+            )
+        finally:
+            if editor is not None:
+                await editor.stop()
+        if editor is not None:
+            await editor.finish("Дайджест готов ⬇️")
         # END_BLOCK_NOTIFY_USER_AND_RUN_ANALYTIC_USECASE
 
         # START_BLOCK_SEND_DIGEST_CHUNKS
-        for chunk in resp.chunks:
-            await message.answer(chunk)
+        with start_span("send_chunks", chunks=len(resp.chunks), outbound=outbound is not None):
+            for chunk in resp.chunks:
+                await _answer(message, chunk, outbound)
         # END_BLOCK_SEND_DIGEST_CHUNKS
-    except DomainError:
+    except DomainError as e:
+        # The admitted quota stays spent; see quota.admit.
+        current_span().record_error(e)
         logger.exception("[BotHandlers][handle_analytic][DOMAIN_ERROR] failed to build analytic digest")
-        await message.answer("Не удалось собрать дайджест. Попробуйте позже.")
+        await _answer(message, "Не удалось собрать дайджест. Попробуйте позже.", outbound)
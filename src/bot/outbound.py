@@ -0,0 +1,246 @@
+# FILE: src/bot/outbound.py
+# VERSION: 1.0.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Send outbound Bot API messages through one paced queue that stays under per-chat and global rate limits.
+#   SCOPE: Per-chat FIFO queues served round-robin; one in-flight send per chat; global token bucket; automatic retry_after handling; queue depth metrics.
+#   DEPENDS: none
+#   LINKS: docs/knowledge-graph.xml#M-BOT-OUTBOUND
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   OutboundDispatcher — Central paced sender; callers await the delivery result of their own message.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.1 - Cancelled the callers of sends still in flight at shutdown instead of leaving them waiting.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    __slots__ = ("call", "future", "attempts")
+
+    def __init__(self, call: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        self.call = call
+        self.future = future
+        self.attempts = 0
+
+
+def _retry_after_of(exc: BaseException) -> float | None:
+    # aiogram's TelegramRetryAfter carries the flood-wait seconds as `retry_after`.
+    value = getattr(exc, "retry_after", None)
+    return float(value) if isinstance(value, (int, float)) and value >= 0 else None
+
+
+class OutboundDispatcher:
+    # START_CONTRACT: OutboundDispatcher.__init__
+    #   PURPOSE: Configure pacing; global_rate is messages per second across all chats, chat_interval_s the minimum gap between sends to one chat.
+    #   INPUTS: { bot: aiogram.Bot|None - target of send_message, global_rate: float, chat_interval_s: float, max_retries: int - retry_after retries per message, clock: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-BOT-OUTBOUND
+    # END_CONTRACT: OutboundDispatcher.__init__
+    def __init__(
+        self,
+        bot=None,
+        *,
+        global_rate: float = 25.0,
+        chat_interval_s: float = 1.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # START_BLOCK_INIT_QUEUES_AND_BUCKET
+        self._bot = bot
+        self._rate = max(0.1, global_rate)
+        self._chat_interval_s = max(0.0, chat_interval_s)
+        self._max_retries = max(0, max_retries)
+        self._clock = clock
+        self._tokens = self._rate
+        self._refilled_at = clock()
+        self._queues: dict[int, deque[_Job]] = {}
+        self._next_at: dict[int, float] = {}
+        self._ready: deque[int] = deque()
+        self._in_flight: set[int] = set()
+        self._deliveries: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task | None = None
+        # END_BLOCK_INIT_QUEUES_AND_BUCKET
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def chat_depth(self, chat_id: int) -> int:
+        queue = self._queues.get(chat_id)
+        return len(queue) if queue else 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    # START_CONTRACT: OutboundDispatcher.aclose
+    #   PURPOSE: Wait up to drain_timeout_s for queued messages to be delivered, then stop the loop; callers of queued and in-flight sends are cancelled.
+    #   INPUTS: { drain_timeout_s: float }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: may send queued messages; cancels background tasks
+    #   LINKS: M-BOT-OUTBOUND
+    # END_CONTRACT: OutboundDispatcher.aclose
+    async def aclose(self, drain_timeout_s: float = 10.0) -> None:
+        # START_BLOCK_DRAIN_AND_CANCEL
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning("[OutboundDispatcher][aclose][DRAIN_AND_CANCEL] undelivered=%s", self.queue_depth)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        deliveries = list(self._deliveries)
+        for task in deliveries:
+            task.cancel()
+        # _deliver cancels the future of the job it was sending.
+        await asyncio.gather(*deliveries, return_exceptions=True)
+        for queue in self._queues.values():
+            for job in queue:
+                job.future.cancel()
+        self._queues.clear()
+        self._ready.clear()
+        # END_BLOCK_DRAIN_AND_CANCEL
+
+    # START_CONTRACT: OutboundDispatcher.send
+    #   PURPOSE: Queue one Bot API call for a chat and wait for its result; calls to the same chat run in submission order.
+    #   INPUTS: { chat_id: int, call: Callable[[], Awaitable[T]] - performs the send when invoked }
+    #   OUTPUTS: { T - result of call }
+    #   SIDE_EFFECTS: enqueues work; raises the call's final exception
+    #   LINKS: M-BOT-OUTBOUND
+    # END_CONTRACT: OutboundDispatcher.send
+    async def send(self, chat_id: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        job = _Job(call, asyncio.get_running_loop().create_future())
+        # START_BLOCK_ENQUEUE_JOB
+        queue = self._queues.setdefault(chat_id, deque())
+        if not queue and chat_id not in self._in_flight:
+            self._ready.append(chat_id)
+        queue.append(job)
+        self._idle.clear()
+        self._wakeup.set()
+        # END_BLOCK_ENQUEUE_JOB
+        return await job.future
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> Any:
+        return await self.send(chat_id, lambda: self._bot.send_message(chat_id, text, **kwargs))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._rate, self._tokens + max(0.0, now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    # START_CONTRACT: OutboundDispatcher._dispatch_ready
+    #   PURPOSE: Start sends for ready chats in round-robin order while the global bucket allows.
+    #   INPUTS: {}
+    #   OUTPUTS: { float|None - seconds until the next send could start, None when nothing is queued }
+    #   SIDE_EFFECTS: spawns delivery tasks; debits global bucket
+    #   LINKS: M-BOT-OUTBOUND
+    # END_CONTRACT: OutboundDispatcher._dispatch_ready
+    def _dispatch_ready(self) -> float | None:
+        now = self._clock()
+        self._refill(now)
+        earliest = math.inf
+        # START_BLOCK_ROUND_ROBIN_READY_CHATS
+        for _ in range(len(self._ready)):
+            chat_id = self._ready.popleft()
+            queue = self._queues[chat_id]
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                self._forget(chat_id)
+                continue
+            wait = self._next_at.get(chat_id, 0.0) - now
+            if wait > 0:
+                self._ready.append(chat_id)
+                earliest = min(earliest, wait)
+                continue
+            if self._tokens < 1:
+                self._ready.appendleft(chat_id)
+                return min(earliest, (1 - self._tokens) / self._rate)
+            self._tokens -= 1
+            self._next_at[chat_id] = now + self._chat_interval_s
+            self._in_flight.add(chat_id)
+            task = asyncio.create_task(self._deliver(chat_id, queue.popleft()))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+        # END_BLOCK_ROUND_ROBIN_READY_CHATS
+        return None if math.isinf(earliest) else earliest
+
+    def _forget(self, chat_id: int) -> None:
+        if chat_id not in self._in_flight and not self._queues.get(chat_id):
+            self._queues.pop(chat_id, None)
+            self._next_at.pop(chat_id, None)
+        if not self._queues and not self._in_flight:
+            self._idle.set()
+
+    # START_CONTRACT: OutboundDispatcher._deliver
+    #   PURPOSE: Perform one send; on a flood-wait error requeue it at the head of its chat and pause that chat for retry_after.
+    #   INPUTS: { chat_id: int, job: _Job }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: network I/O via job call; resolves the caller's future
+    #   LINKS: M-BOT-OUTBOUND
+    # END_CONTRACT: OutboundDispatcher._deliver
+    async def _deliver(self, chat_id: int, job: _Job) -> None:
+        try:
+            # START_BLOCK_SEND_AND_HONOUR_RETRY_AFTER
+            try:
+                result = await job.call()
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as e:
+                retry_after = _retry_after_of(e)
+                if retry_after is not None and job.attempts < self._max_retries:
+                    job.attempts += 1
+                    self._queues[chat_id].appendleft(job)
+                    self._next_at[chat_id] = max(self._next_at.get(chat_id, 0.0), self._clock() + retry_after)
+                    logger.warning(
+                        "[OutboundDispatcher][_deliver][SEND_AND_HONOUR_RETRY_AFTER] chat_id=%s retry_after=%s attempt=%s",
+                        chat_id,
+                        retry_after,
+                        job.attempts,
+                    )
+                elif not job.future.done():
+                    job.future.set_exception(e)
+                return
+            if not job.future.done():
+                job.future.set_result(result)
+            # END_BLOCK_SEND_AND_HONOUR_RETRY_AFTER
+        finally:
+            self._in_flight.discard(chat_id)
+            if self._queues.get(chat_id):
+                self._ready.append(chat_id)
+            else:
+                self._forget(chat_id)
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        # START_BLOCK_DISPATCH_LOOP
+        while True:
+            self._wakeup.clear()
+            delay = self._dispatch_ready()
+            if delay is None:
+                await self._wakeup.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        # END_BLOCK_DISPATCH_LOOP
@@ -0,0 +1,170 @@
+# FILE: src/bot/progress.py
+# VERSION: 1.2.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Render streamed summary text progressively by editing one Telegram message at a throttled rate.
+#   SCOPE: Buffer per-channel text deltas and flush the latest preview with message edits no more often than the configured interval.
+#   DEPENDS: M-DOMAIN-TYPES, M-DOMAIN-DTO, M-BOT-OUTBOUND
+#   LINKS: docs/knowledge-graph.xml#M-BOT-PROGRESS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   ThrottledMessageEditor — Accumulates streamed deltas and periodically edits a status message with the preview.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.2.0 - Sent preview edits through the outbound dispatcher when one is given.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import time
+
+from aiogram import types
+from aiogram.exceptions import TelegramRetryAfter
+
+from src.domain.dto import ChannelSummaryDTO
+from src.domain.types import ChannelHandle
+
+from .outbound import OutboundDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottledMessageEditor:
+    # START_CONTRACT: ThrottledMessageEditor.__init__
+    #   PURPOSE: Bind editor to a status message and throttle settings.
+    #   INPUTS: { message: aiogram.types.Message - bot-sent status message, header: str, min_interval_s: float, max_len: int, outbound: OutboundDispatcher|None - paces edits with the chat's other sends }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.__init__
+    def __init__(
+        self,
+        message: types.Message,
+        *,
+        header: str,
+        min_interval_s: float = 1.5,
+        max_len: int = 3500,
+        outbound: OutboundDispatcher | None = None,
+    ) -> None:
+        self._message = message
+        self._outbound = outbound
+        self._header = header
+        self._min_interval_s = min_interval_s
+        self._max_len = max_len
+        self._buffers: dict[ChannelHandle, list[str]] = {}
+        self._active: ChannelHandle | None = None
+        self._finished: set[str] = set()
+        self._dirty = asyncio.Event()
+        self._last_rendered = ""
+        self._task: asyncio.Task | None = None
+
+    # START_CONTRACT: ThrottledMessageEditor.start
+    #   PURPOSE: Start the background flush loop.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: schedules asyncio task
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.start
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    # START_CONTRACT: ThrottledMessageEditor.stop
+    #   PURPOSE: Cancel the background flush loop without a final edit; never raises, the preview is cosmetic.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: cancels asyncio task
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.stop
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.warning("[BotProgress][ThrottledMessageEditor.stop][STOP] flush loop failed", exc_info=True)
+            self._task = None
+
+    # START_CONTRACT: ThrottledMessageEditor.on_delta
+    #   PURPOSE: Record one streamed delta for a channel and mark the preview dirty; never performs network I/O.
+    #   INPUTS: { channel_handle: ChannelHandle, delta: str }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: mutates in-memory buffers
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.on_delta
+    async def on_delta(self, channel_handle: ChannelHandle, delta: str) -> None:
+        self._buffers.setdefault(channel_handle, []).append(delta)
+        self._active = channel_handle
+        self._dirty.set()
+
+    # START_CONTRACT: ThrottledMessageEditor.on_channel_done
+    #   PURPOSE: Count a channel whose summary finished; the preview header shows finished channels.
+    #   INPUTS: { summary: ChannelSummaryDTO }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: mutates in-memory state
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.on_channel_done
+    async def on_channel_done(self, summary: ChannelSummaryDTO) -> None:
+        self._finished.add(str(summary.channel_handle))
+        self._dirty.set()
+
+    # START_CONTRACT: ThrottledMessageEditor.finish
+    #   PURPOSE: Replace the preview with a final status text.
+    #   INPUTS: { text: str }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: edits Telegram message
+    #   LINKS: M-BOT-PROGRESS
+    # END_CONTRACT: ThrottledMessageEditor.finish
+    async def finish(self, text: str) -> None:
+        await self.stop()
+        await self._edit(text)
+
+    def _render(self) -> str:
+        # START_BLOCK_RENDER_ACTIVE_CHANNEL_PREVIEW
+        if self._active is None:
+            return self._header
+        title = f"{self._header}\n\n[готово: {len(self._finished)}] https://t.me/{str(self._active)}\n"
+        body = "".join(self._buffers[self._active]).strip()
+        room = self._max_len - len(title) - 1
+        if len(body) > room:
+            body = "…" + body[-max(0, room - 1):]
+        return (title + body).strip()
+        # END_BLOCK_RENDER_ACTIVE_CHANNEL_PREVIEW
+
+    async def _run(self) -> None:
+        # START_BLOCK_THROTTLED_FLUSH_LOOP
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            started = time.monotonic()
+            await self._edit(self._render())
+            await asyncio.sleep(max(0.0, self._min_interval_s - (time.monotonic() - started)))
+        # END_BLOCK_THROTTLED_FLUSH_LOOP
+
+    async def _edit(self, text: str) -> None:
+        # START_BLOCK_EDIT_STATUS_MESSAGE
+        if not text or text == self._last_rendered:
+            return
+        try:
+            if self._outbound is not None:
+                await self._outbound.send(self._message.chat.id, lambda: self._message.edit_text(text))
+            else:
+                await self._message.edit_text(text)
+            self._last_rendered = text
+        except TelegramRetryAfter as e:
+            logger.warning(
+                "[BotProgress][ThrottledMessageEditor._edit][EDIT_STATUS_MESSAGE] retry_after=%s",
+                e.retry_after,
+            )
+            await asyncio.sleep(e.retry_after)
+            self._dirty.set()
+        except Exception:
+            # Bad request, network, forbidden...: a lost preview edit must never abort digest delivery.
+            logger.warning(
+                "[BotProgress][ThrottledMessageEditor._edit][EDIT_STATUS_MESSAGE] edit failed",
+                exc_info=True,
+            )
+        # END_BLOCK_EDIT_STATUS_MESSAGE
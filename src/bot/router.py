@@ -1,9 +1,9 @@
 # FILE: src/bot/router.py
-# VERSION: 1.0.0
+# VERSION: 1.5.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Compose aiogram router bindings for command and FSM handlers.
 #   SCOPE: Register command filters and wire runtime dependencies into handler call closures.
-#   DEPENDS: M-BOT-HANDLERS, M-BOT-STATES, M-CONFIG, M-SUMMARIZER-LLM
+#   DEPENDS: M-BOT-HANDLERS, M-BOT-STATES, M-CONFIG, M-SUMMARIZER-LLM, M-STORAGE-USAGE, M-BOT-OUTBOUND, M-STORAGE-LOCKS, M-APP-METRICS
 #   LINKS: docs/development-plan.xml#M-BOT-ROUTER, docs/knowledge-graph.xml#M-BOT-ROUTER
 # END_MODULE_CONTRACT
 #
@@ -12,7 +12,7 @@
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.5.0 - Timed every command and state handler into the command latency histogram.
 # END_CHANGE_SUMMARY
 
 from aiogram import Router, types
@@ -20,27 +20,41 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 
 from src.app.config import Config
+from src.app.metrics import COMMAND_LATENCY
+from src.storage.locks import ChannelLocks
+from src.storage.usage import UsageRecorder
 from src.summarizer.llm import Summarizer
 
 from .handlers import (
     handle_add,
     handle_add_waiting_input,
     handle_analytic,
+    handle_import,
+    handle_import_waiting_file,
     handle_list,
     handle_remove,
     handle_start,
 )
-from .states import AddChannelsFSM
+from .outbound import OutboundDispatcher
+from .states import AddChannelsFSM, ImportChannelsFSM
 
 
 # START_CONTRACT: build_router
 #   PURPOSE: Register all command/state handlers and return composed aiogram Router.
-#   INPUTS: { pool: asyncpg.Pool, tg_client: TelegramClient, summarizer: Summarizer, cfg: Config }
+#   INPUTS: { pool: asyncpg.Pool, tg_client: TelegramClient, summarizer: Summarizer, cfg: Config, usage_recorder: UsageRecorder|None, outbound: OutboundDispatcher|None, channel_locks: ChannelLocks|None }
 #   OUTPUTS: { Router - configured bot router }
-#   SIDE_EFFECTS: defines closure handlers bound with runtime dependencies
+#   SIDE_EFFECTS: defines closure handlers bound with runtime dependencies; handlers record their latency
 #   LINKS: M-BOT-ROUTER, M-BOT-HANDLERS
 # END_CONTRACT: build_router
-def build_router(pool, tg_client, summarizer: Summarizer, cfg: Config) -> Router:
+def build_router(
+    pool,
+    tg_client,
+    summarizer: Summarizer,
+    cfg: Config,
+    usage_recorder: UsageRecorder | None = None,
+    outbound: OutboundDispatcher | None = None,
+    channel_locks: ChannelLocks | None = None,
+) -> Router:
     # START_BLOCK_CREATE_ROUTER_INSTANCE
     router = Router()
     # END_BLOCK_CREATE_ROUTER_INSTANCE
@@ -48,27 +62,43 @@ def build_router(pool, tg_client, summarizer: Summarizer, cfg: Config) -> Router
     # START_BLOCK_REGISTER_COMMAND_HANDLERS
     @router.message(Command("start"))
     async def _start(message: types.Message) -> None:
-        await handle_start(message)
+        with COMMAND_LATENCY.time(command="start"):
+            await handle_start(message)
 
     @router.message(Command("add"))
     async def _add(message: types.Message, state: FSMContext) -> None:
-        await handle_add(message, state, pool, cfg)
+        with COMMAND_LATENCY.time(command="add"):
+            await handle_add(message, state, pool, cfg)
 
     @router.message(AddChannelsFSM.WAITING_CHANNELS_INPUT)
     async def _add_waiting(message: types.Message, state: FSMContext) -> None:
-        await handle_add_waiting_input(message, state, pool, cfg)
+        with COMMAND_LATENCY.time(command="add_input"):
+            await handle_add_waiting_input(message, state, pool, cfg)
+
+    @router.message(Command("import"))
+    async def _import(message: types.Message, state: FSMContext) -> None:
+        with COMMAND_LATENCY.time(command="import"):
+            await handle_import(message, state, pool, tg_client, cfg)
+
+    @router.message(ImportChannelsFSM.WAITING_IMPORT_FILE)
+    async def _import_waiting(message: types.Message, state: FSMContext) -> None:
+        with COMMAND_LATENCY.time(command="import_input"):
+            await handle_import_waiting_file(message, state, pool, cfg)
 
     @router.message(Command("list"))
     async def _list(message: types.Message) -> None:
-        await handle_list(message, pool)
+        with COMMAND_LATENCY.time(command="list"):
+            await handle_list(message, pool)
 
     @router.message(Command("remove"))
     async def _remove(message: types.Message) -> None:
-        await handle_remove(message, pool)
+        with COMMAND_LATENCY.time(command="remove"):
+            await handle_remove(message, pool)
 
     @router.message(Command("analytic"))
     async def _analytic(message: types.Message) -> None:
-        await handle_analytic(message, pool, tg_client, summarizer, cfg)
+        with COMMAND_LATENCY.time(command="analytic"):
+            await handle_analytic(message, pool, tg_client, summarizer, cfg, usage_recorder, outbound, channel_locks)
     # END_BLOCK_REGISTER_COMMAND_HANDLERS
 
     return router
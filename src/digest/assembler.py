@@ -1,5 +1,5 @@
 # FILE: src/digest/assembler.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Assemble channel summaries into a final digest DTO with stable block delimiter.
 #   SCOPE: Render per-channel blocks and compose DigestDTO payload for downstream chunking.
@@ -13,7 +13,7 @@
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.1.0 - Exposed rendered blocks on DigestDTO so chunking does not re-split raw text.
 # END_CHANGE_SUMMARY
 
 from datetime import datetime
@@ -40,11 +40,12 @@ def assemble_digest(
     include_post_links: bool = True,
 ) -> DigestDTO:
     # START_BLOCK_RENDER_CHANNEL_BLOCKS
-    blocks = [format_channel_block(cs, include_post_links=include_post_links) for cs in channel_summaries]
+    rendered = (format_channel_block(cs, include_post_links=include_post_links) for cs in channel_summaries)
+    blocks = tuple(block for block in rendered if block.strip())
     # END_BLOCK_RENDER_CHANNEL_BLOCKS
 
     # START_BLOCK_BUILD_DIGEST_TEXT
-    raw_text = DELIMITER.join([block for block in blocks if block.strip()])
+    raw_text = DELIMITER.join(blocks)
     # END_BLOCK_BUILD_DIGEST_TEXT
 
     return DigestDTO(
@@ -52,4 +53,5 @@ def assemble_digest(
         created_at=created_at,
         channel_summaries=channel_summaries,
         raw_text=raw_text,
+        blocks=blocks,
     )
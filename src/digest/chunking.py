@@ -1,23 +1,178 @@
 # FILE: src/digest/chunking.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Split digest text into Telegram-safe chunks while preserving block structure when possible.
-#   SCOPE: Chunk by digest delimiter first, then fallback to hard slicing oversized blocks.
+#   SCOPE: Pack structured channel blocks in one linear pass measured in UTF-16 code units (Telegram's limit unit); split oversized blocks on line, then word, then code point boundaries.
 #   DEPENDS: M-DIGEST-ASSEMBLER
 #   LINKS: docs/development-plan.xml#M-DIGEST-CHUNKING, docs/knowledge-graph.xml#M-DIGEST-CHUNKING
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
+#   utf16_len — Length of a string in UTF-16 code units.
+#   TelegramChunker — Incremental block packer emitting chunks as blocks arrive.
+#   chunk_blocks_for_telegram — Chunk a list of digest blocks.
 #   chunk_text_for_telegram — Produce ordered chunks that fit Telegram message length limits.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.1.0 - Replaced quadratic concatenation with linear UTF-16-aware block packing and boundary-aware splitting.
 # END_CHANGE_SUMMARY
 
+from typing import Iterable
+
 from .assembler import DELIMITER
 
 
+def utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+_DELIMITER_LEN = utf16_len(DELIMITER)
+
+
+def _hard_split(text: str, max_len: int) -> list[str]:
+    # Cut on code points so surrogate pairs (emoji) are never split between messages.
+    out: list[str] = []
+    start = 0
+    used = 0
+    for i, ch in enumerate(text):
+        width = 2 if ord(ch) > 0xFFFF else 1
+        if used and used + width > max_len:
+            out.append(text[start:i])
+            start, used = i, 0
+        used += width
+    if start < len(text):
+        out.append(text[start:])
+    return out
+
+
+class TelegramChunker:
+    # START_CONTRACT: TelegramChunker.__init__
+    #   PURPOSE: Start an empty chunk buffer bounded by max_len UTF-16 code units.
+    #   INPUTS: { max_len: int }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-DIGEST-CHUNKING
+    # END_CONTRACT: TelegramChunker.__init__
+    def __init__(self, *, max_len: int = 3500) -> None:
+        self._max_len = max(1, max_len)
+        self._parts: list[str] = []
+        self._used = 0
+
+    # START_CONTRACT: TelegramChunker.add
+    #   PURPOSE: Append one digest block and return chunks that became complete; each block is measured once.
+    #   INPUTS: { block: str }
+    #   OUTPUTS: { list[str] - finished chunks in order, possibly empty }
+    #   SIDE_EFFECTS: mutates buffer
+    #   LINKS: M-DIGEST-CHUNKING
+    # END_CONTRACT: TelegramChunker.add
+    def add(self, block: str) -> list[str]:
+        block = (block or "").strip()
+        if not block:
+            return []
+        size = utf16_len(block)
+
+        # START_BLOCK_APPEND_OR_FLUSH_BLOCK
+        out: list[str] = []
+        if self._parts and self._used + _DELIMITER_LEN + size > self._max_len:
+            out.append(self._flush())
+        if size <= self._max_len:
+            self._push(block, size)
+            return out
+        # END_BLOCK_APPEND_OR_FLUSH_BLOCK
+
+        # START_BLOCK_SPLIT_OVERSIZED_BLOCK
+        pieces = self._split_oversized(block)
+        for piece in pieces[:-1]:
+            out.append(piece)
+        last = pieces[-1]
+        self._push(last, utf16_len(last))
+        return out
+        # END_BLOCK_SPLIT_OVERSIZED_BLOCK
+
+    # START_CONTRACT: TelegramChunker.finish
+    #   PURPOSE: Flush the remaining buffer.
+    #   INPUTS: {}
+    #   OUTPUTS: { list[str] - zero or one final chunk }
+    #   SIDE_EFFECTS: clears buffer
+    #   LINKS: M-DIGEST-CHUNKING
+    # END_CONTRACT: TelegramChunker.finish
+    def finish(self) -> list[str]:
+        return [self._flush()] if self._parts else []
+
+    def _push(self, text: str, size: int) -> None:
+        self._used += size + (_DELIMITER_LEN if self._parts else 0)
+        self._parts.append(text)
+
+    def _flush(self) -> str:
+        chunk = DELIMITER.join(self._parts)
+        self._parts, self._used = [], 0
+        return chunk
+
+    def _split_oversized(self, block: str) -> list[str]:
+        # START_BLOCK_PACK_LINES_THEN_WORDS
+        pieces: list[str] = []
+        buf: list[str] = []
+        used = 0
+
+        def emit() -> None:
+            nonlocal buf, used
+            if buf:
+                pieces.append("\n".join(buf))
+            buf, used = [], 0
+
+        for line in block.split("\n"):
+            size = utf16_len(line)
+            if size > self._max_len:
+                emit()
+                pieces.extend(self._split_line(line))
+                continue
+            if buf and used + 1 + size > self._max_len:
+                emit()
+            used += size + (1 if buf else 0)
+            buf.append(line)
+        emit()
+        return [p for p in (piece.strip() for piece in pieces) if p]
+        # END_BLOCK_PACK_LINES_THEN_WORDS
+
+    def _split_line(self, line: str) -> list[str]:
+        pieces: list[str] = []
+        buf: list[str] = []
+        used = 0
+        for word in line.split(" "):
+            size = utf16_len(word)
+            if size > self._max_len:
+                if buf:
+                    pieces.append(" ".join(buf))
+                    buf, used = [], 0
+                pieces.extend(_hard_split(word, self._max_len))
+                continue
+            if buf and used + 1 + size > self._max_len:
+                pieces.append(" ".join(buf))
+                buf, used = [], 0
+            used += size + (1 if buf else 0)
+            buf.append(word)
+        if buf:
+            pieces.append(" ".join(buf))
+        return pieces
+
+
+# START_CONTRACT: chunk_blocks_for_telegram
+#   PURPOSE: Pack structured digest blocks into Telegram-safe chunks in O(total length).
+#   INPUTS: { blocks: Iterable[str], max_len: int - UTF-16 code units per message }
+#   OUTPUTS: { list[str] - ordered chunks }
+#   SIDE_EFFECTS: none
+#   LINKS: M-DIGEST-CHUNKING
+# END_CONTRACT: chunk_blocks_for_telegram
+def chunk_blocks_for_telegram(blocks: Iterable[str], *, max_len: int = 3500) -> list[str]:
+    chunker = TelegramChunker(max_len=max_len)
+    chunks: list[str] = []
+    for block in blocks:
+        chunks.extend(chunker.add(block))
+    chunks.extend(chunker.finish())
+    return chunks
+
+
 # START_CONTRACT: chunk_text_for_telegram
 #   PURPOSE: Chunk digest text for Telegram transport without dropping semantic content.
 #   INPUTS: { text: str - digest raw text, max_len: int - hard maximum per message }
@@ -30,44 +185,8 @@ def chunk_text_for_telegram(text: str, *, max_len: int = 3500) -> list[str]:
     payload = (text or "").strip()
     if not payload:
         return []
-    if len(payload) <= max_len:
+    if utf16_len(payload) <= max_len:
         return [payload]
     # END_BLOCK_VALIDATE_PAYLOAD_AND_FAST_PATH
 
-    # START_BLOCK_PREPARE_BLOCK_SPLIT_STATE
-    parts = [p.strip() for p in payload.split(DELIMITER) if p.strip()]
-    chunks: list[str] = []
-    buf = ""
-    # END_BLOCK_PREPARE_BLOCK_SPLIT_STATE
-
-    # START_BLOCK_ACCUMULATE_OR_FLUSH_BLOCKS
-    for part in parts:
-        candidate = part if not buf else f"{buf}{DELIMITER}{part}"
-        if len(candidate) <= max_len:
-            buf = candidate
-            continue
-
-        if buf:
-            chunks.append(buf)
-            buf = ""
-
-        if len(part) <= max_len:
-            buf = part
-            continue
-
-        # START_BLOCK_HARD_SLICE_OVERSIZED_BLOCK
-        start = 0
-        while start < len(part):
-            slice_ = part[start : start + max_len].strip()
-            if slice_:
-                chunks.append(slice_)
-            start += max_len
-        # END_BLOCK_HARD_SLICE_OVERSIZED_BLOCK
-    # END_BLOCK_ACCUMULATE_OR_FLUSH_BLOCKS
-
-    # START_BLOCK_FINALIZE_AND_FILTER_CHUNKS
-    if buf.strip():
-        chunks.append(buf.strip())
-
-    return [chunk for chunk in chunks if chunk.strip()]
-    # END_BLOCK_FINALIZE_AND_FILTER_CHUNKS
+    return chunk_blocks_for_telegram(payload.split(DELIMITER), max_len=max_len)
@@ -1,21 +1,29 @@
 # FILE: src/domain/dto.py
-# VERSION: 1.0.0
+# VERSION: 1.8.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Define immutable DTOs shared across parser, ETL pipeline, and digest delivery.
-#   SCOPE: Provide structured data contracts for parse results, posts, channel summaries, and digests.
+#   SCOPE: Provide structured data contracts for parse results, posts, channel summaries, stored summaries, digests, usage accounting, and queued jobs.
 #   DEPENDS: M-DOMAIN-TYPES
 #   LINKS: docs/development-plan.xml#M-DOMAIN-DTO, docs/knowledge-graph.xml#M-DOMAIN-DTO
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
 #   ParseChannelsResult — Result grouping for parsed channel input.
+#   ImportBatch — One bounded slice of deduplicated handles from a bulk import.
 #   PostDTO — Normalized channel post payload.
 #   ChannelSummaryDTO — Per-channel digest block payload.
 #   DigestDTO — Full digest payload for chunking and delivery.
+#   StoredSummaryDTO — Last persisted channel summary with the post ids it covers.
+#   LLMCallRecord — Usage and latency of one LLM API call.
+#   DigestRunRecord — Phase timings and size of one /analytic run.
+#   UsageStatsDTO — Aggregated LLM cost and latency for one user or channel.
+#   PromptCacheStatsDTO — Prefix-cache hit tokens and time to first token for one prompt version.
+#   JobDTO — Claimed queue job with its lease token and per-channel checkpoint.
+#   FinishedJobDTO — Finished job ready for delivery to the user's chat.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE module contract and map.
+#   LAST_CHANGE: v1.8.0 - Carried delivery lease token and progress on FinishedJobDTO.
 # END_CHANGE_SUMMARY
 
 from dataclasses import dataclass
@@ -25,23 +33,31 @@ from typing import Optional
 from .types import ChannelHandle
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParseChannelsResult:
     valid_handles: list[ChannelHandle]
     invalid_tokens: list[str]
     truncated_tokens: list[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class ImportBatch:
+    handles: list[ChannelHandle]
+    invalid_tokens: list[str]
+
+
+@dataclass(frozen=True, slots=True)
 class PostDTO:
     channel_handle: ChannelHandle
     tg_msg_id: int
     date: datetime
     text: str
     permalink: Optional[str]
+    # True once text went through clean_text, so later stages can skip re-cleaning.
+    clean: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChannelSummaryDTO:
     channel_handle: ChannelHandle
     channel_link: str
@@ -49,9 +65,92 @@ class ChannelSummaryDTO:
     post_links: list[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DigestDTO:
     tg_user_id: int
     created_at: datetime
     channel_summaries: list[ChannelSummaryDTO]
     raw_text: str
+    blocks: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class StoredSummaryDTO:
+    channel_handle: ChannelHandle
+    summary_text: str
+    post_ids: list[int]
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LLMCallRecord:
+    run_key: Optional[str]
+    tg_user_id: Optional[int]
+    channel_handle: Optional[ChannelHandle]
+    kind: str
+    model: str
+    endpoint: str
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+    cached_tokens: Optional[int]
+    latency_ms: int
+    status: str
+    created_at: datetime
+    prompt_version: Optional[str] = None
+    ttft_ms: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DigestRunRecord:
+    run_key: str
+    tg_user_id: int
+    started_at: datetime
+    channels: int
+    extract_ms: int
+    summarize_ms: int
+    total_ms: int
+
+
+@dataclass(frozen=True, slots=True)
+class UsageStatsDTO:
+    key: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    avg_latency_ms: float
+    p95_latency_ms: float
+
+
+@dataclass(frozen=True, slots=True)
+class PromptCacheStatsDTO:
+    prompt_version: str
+    calls: int
+    prompt_tokens: int
+    cached_tokens: int
+    avg_ttft_ms: Optional[float]
+    p50_ttft_ms: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class JobDTO:
+    id: int
+    kind: str
+    tg_user_id: int
+    chat_id: int
+    attempts: int
+    max_attempts: int
+    lease_token: str
+    checkpoint: dict[str, ChannelSummaryDTO]
+
+
+@dataclass(frozen=True, slots=True)
+class FinishedJobDTO:
+    id: int
+    chat_id: int
+    status: str
+    chunks: list[str]
+    error: Optional[str]
+    delivery_token: str = ""
+    delivered_chunks: int = 0
+    delivery_attempts: int = 0
@@ -0,0 +1,57 @@
+# FILE: src/domain/usage.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Carry digest-run attribution (run, user, channel, call kind) to LLM usage records without threading arguments.
+#   SCOPE: Context-local usage scope with a binding helper; safe across asyncio tasks.
+#   DEPENDS: M-DOMAIN-TYPES
+#   LINKS: docs/knowledge-graph.xml#M-DOMAIN-USAGE
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   UsageScope — Attribution fields for LLM calls made in the current context.
+#   current_usage_scope — Read the active UsageScope.
+#   bind_usage_scope — Context manager overriding scope fields for nested calls.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added context-local usage attribution scope.
+# END_CHANGE_SUMMARY
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
+
+from .types import ChannelHandle
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    run_key: Optional[str] = None
+    tg_user_id: Optional[int] = None
+    channel_handle: Optional[ChannelHandle] = None
+    kind: str = "single"
+
+
+_USAGE_SCOPE: ContextVar[UsageScope] = ContextVar("usage_scope", default=UsageScope())
+
+
+def current_usage_scope() -> UsageScope:
+    return _USAGE_SCOPE.get()
+
+
+# START_CONTRACT: bind_usage_scope
+#   PURPOSE: Override usage scope fields for the enclosed block; tasks created inside inherit the bound scope.
+#   INPUTS: { **changes: UsageScope fields }
+#   OUTPUTS: { Iterator[UsageScope] - the bound scope }
+#   SIDE_EFFECTS: sets and resets a context variable
+#   LINKS: M-DOMAIN-USAGE
+# END_CONTRACT: bind_usage_scope
+@contextmanager
+def bind_usage_scope(**changes) -> Iterator[UsageScope]:
+    scope = replace(_USAGE_SCOPE.get(), **changes)
+    token = _USAGE_SCOPE.set(scope)
+    try:
+        yield scope
+    finally:
+        _USAGE_SCOPE.reset(token)
@@ -1,5 +1,5 @@
 # FILE: src/extractor/telethon_client.py
-# VERSION: 1.1.0
+# VERSION: 1.2.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Build and start Telethon client session for channel extraction.
 #   SCOPE: Initialize TelegramClient with credentials and map startup failures.
@@ -9,10 +9,11 @@
 #
 # START_MODULE_MAP
 #   create_telethon_client — Create and start Telethon client instance.
+#   worker_session_name — Per-process session name for multi-process deployments.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.1.0 - Added startup validation to reject bot-authorized Telethon sessions for channel history extraction.
+#   LAST_CHANGE: v1.2.0 - Added per-worker session names so processes never share one SQLite session and auth key.
 # END_CHANGE_SUMMARY
 
 from telethon import TelegramClient
@@ -42,3 +43,14 @@ async def create_telethon_client(session_name: str, api_id: int, api_hash: str)
         # END_BLOCK_INIT_START_AND_VALIDATE_USER_SESSION
     except Exception as e:
         raise ExtractError(str(e)) from e
+
+
+# START_CONTRACT: worker_session_name
+#   PURPOSE: Derive the session a worker process owns; a Telethon SQLite session and its auth key cannot be used by two running processes.
+#   INPUTS: { session_name: str - TELETHON_SESSION_NAME, index: int - worker number }
+#   OUTPUTS: { str }
+#   SIDE_EFFECTS: none
+#   LINKS: M-TELETHON-CLIENT
+# END_CONTRACT: worker_session_name
+def worker_session_name(session_name: str, index: int) -> str:
+    return f"{session_name}-{index}"
@@ -1,18 +1,19 @@
 # FILE: src/extractor/telethon_extractor.py
-# VERSION: 1.0.0
+# VERSION: 1.4.0
 # START_MODULE_CONTRACT
-#   PURPOSE: Fetch recent text posts from Telegram channels through Telethon MTProto client.
+#   PURPOSE: Fetch recent text posts from Telegram channels, and list followed channels, through Telethon MTProto client.
 #   SCOPE: Resolve channel entity, iterate messages, normalize text/date/permalink, and map integration errors.
-#   DEPENDS: M-ERRORS, M-DOMAIN-TYPES, M-DOMAIN-DTO, M-TRANSFORM-TEXT
+#   DEPENDS: M-ERRORS, M-DOMAIN-TYPES, M-DOMAIN-DTO, M-TRANSFORM-TEXT, M-APP-TRACING, M-APP-METRICS
 #   LINKS: docs/development-plan.xml#M-EXTRACTOR-TELETHON, docs/knowledge-graph.xml#M-EXTRACTOR-TELETHON
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
 #   fetch_last_posts — Collect recent text posts and convert them to PostDTO list.
+#   list_broadcast_channels — Public broadcast channels the session account follows.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.4.0 - Counted FloodWait errors per operation.
 # END_CHANGE_SUMMARY
 
 from datetime import timezone
@@ -21,6 +22,8 @@ from telethon import TelegramClient
 from telethon.errors import FloodWaitError
 
 from src.app.errors import ExtractError
+from src.app.metrics import TELETHON_FLOOD_WAITS
+from src.app.tracing import start_span
 from src.domain.dto import PostDTO
 from src.domain.types import ChannelHandle
 from src.transform.text import clean_text
@@ -41,33 +44,37 @@ async def fetch_last_posts(
 ) -> list[PostDTO]:
     try:
         # START_BLOCK_RESOLVE_ENTITY_AND_INIT_COLLECTION
-        entity = await client.get_entity(str(channel_handle))
+        with start_span("telethon.get_entity", channel=str(channel_handle)):
+            entity = await client.get_entity(str(channel_handle))
 
         collected: list[PostDTO] = []
         scan_limit = max(limit * 4, limit)
         # END_BLOCK_RESOLVE_ENTITY_AND_INIT_COLLECTION
 
         # START_BLOCK_ITERATE_MESSAGES_AND_BUILD_DTOS
-        async for msg in client.iter_messages(entity, limit=scan_limit):
-            if len(collected) >= limit:
-                break
-            text = clean_text(getattr(msg, "message", "") or "")
-            if not text:
-                continue
-            msg_id = int(msg.id)
-            permalink = f"https://t.me/{str(channel_handle)}/{msg_id}" if getattr(entity, "username", None) else None
-            dt = msg.date
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            collected.append(
-                PostDTO(
-                    channel_handle=channel_handle,
-                    tg_msg_id=msg_id,
-                    date=dt,
-                    text=text,
-                    permalink=permalink,
+        with start_span("telethon.iter_messages", channel=str(channel_handle), scan_limit=scan_limit) as span:
+            async for msg in client.iter_messages(entity, limit=scan_limit):
+                if len(collected) >= limit:
+                    break
+                text = clean_text(getattr(msg, "message", "") or "")
+                if not text:
+                    continue
+                msg_id = int(msg.id)
+                permalink = f"https://t.me/{str(channel_handle)}/{msg_id}" if getattr(entity, "username", None) else None
+                dt = msg.date
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                collected.append(
+                    PostDTO(
+                        channel_handle=channel_handle,
+                        tg_msg_id=msg_id,
+                        date=dt,
+                        text=text,
+                        permalink=permalink,
+                        clean=True,
+                    )
                 )
-            )
+            span.set_attributes(posts=len(collected))
         # END_BLOCK_ITERATE_MESSAGES_AND_BUILD_DTOS
 
         # START_BLOCK_FINALIZE_ORDER_AND_RETURN
@@ -75,6 +82,30 @@ async def fetch_last_posts(
         return collected
         # END_BLOCK_FINALIZE_ORDER_AND_RETURN
     except FloodWaitError as e:
+        TELETHON_FLOOD_WAITS.inc(operation="fetch_last_posts")
+        raise ExtractError(f"FloodWait {e.seconds}s") from e
+    except Exception as e:
+        raise ExtractError(str(e)) from e
+
+
+# START_CONTRACT: list_broadcast_channels
+#   PURPOSE: Walk the account's dialogs and return public broadcast channels; groups and private channels have no usable handle.
+#   INPUTS: { client: TelegramClient }
+#   OUTPUTS: { list[ChannelHandle] - lowercased usernames in dialog order }
+#   SIDE_EFFECTS: network I/O to Telegram MTProto API
+#   LINKS: M-EXTRACTOR-TELETHON, M-DOMAIN-TYPES
+# END_CONTRACT: list_broadcast_channels
+async def list_broadcast_channels(client: TelegramClient) -> list[ChannelHandle]:
+    try:
+        handles: list[ChannelHandle] = []
+        async for dialog in client.iter_dialogs():
+            entity = dialog.entity
+            username = getattr(entity, "username", None)
+            if dialog.is_channel and getattr(entity, "broadcast", False) and username:
+                handles.append(ChannelHandle(username.lower()))
+        return handles
+    except FloodWaitError as e:
+        TELETHON_FLOOD_WAITS.inc(operation="list_broadcast_channels")
         raise ExtractError(f"FloodWait {e.seconds}s") from e
     except Exception as e:
         raise ExtractError(str(e)) from e
@@ -0,0 +1,136 @@
+# FILE: src/parsing/imports.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Turn uploaded channel lists (plain text, CSV, JSON export) into deduplicated handle batches for bulk import.
+#   SCOPE: Format detection by file name or leading bytes, line-streamed token extraction, and bounded batching through normalize_handle.
+#   DEPENDS: M-PARSING-CHANNELS, M-DOMAIN-TYPES, M-DOMAIN-DTO, M-ERRORS
+#   LINKS: docs/knowledge-graph.xml#M-PARSING-IMPORTS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   IMPORT_FORMATS — Supported upload formats.
+#   HANDLE_FIELDS — CSV column / JSON key names that hold a channel reference.
+#   detect_import_format — Pick txt, csv, or json for an upload.
+#   iter_import_tokens — Yield raw channel tokens from upload lines.
+#   batch_import_handles — Normalize, dedupe, and group tokens into ImportBatch slices.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added streamed parsing for /import uploads.
+# END_CHANGE_SUMMARY
+
+import csv
+import json
+from typing import Any, Iterable, Iterator
+
+from src.app.errors import ValidationError
+from src.domain.dto import ImportBatch
+from src.domain.types import ChannelHandle
+
+from .channels import SPLIT_RE, normalize_handle
+
+IMPORT_FORMATS = ("txt", "csv", "json")
+HANDLE_FIELDS = frozenset({"handle", "username", "channel", "link", "url"})
+
+
+# START_CONTRACT: detect_import_format
+#   PURPOSE: Choose the parser from the file extension, falling back to sniffing the first characters.
+#   INPUTS: { filename: str|None, head: str - first characters of the upload }
+#   OUTPUTS: { str - one of IMPORT_FORMATS }
+#   SIDE_EFFECTS: none
+#   LINKS: M-PARSING-IMPORTS
+# END_CONTRACT: detect_import_format
+def detect_import_format(filename: str | None, head: str) -> str:
+    ext = (filename or "").rsplit(".", 1)[-1].lower() if "." in (filename or "") else ""
+    if ext in IMPORT_FORMATS:
+        return ext
+    return "json" if head.lstrip("\ufeff \t\r\n")[:1] in ("{", "[") else "txt"
+
+
+def _walk_json(node: Any, field: str | None = None) -> Iterator[str]:
+    # Only list items and handle-like fields count; names and descriptions would yield false handles.
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _walk_json(value, str(key).lower())
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk_json(item, field if isinstance(item, (dict, list)) else "")
+    elif isinstance(node, str) and (field == "" or field in HANDLE_FIELDS):
+        yield node
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[str]:
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+    columns = [i for i, cell in enumerate(first) if cell.strip().lower() in HANDLE_FIELDS]
+    if not columns:
+        yield from first
+    for row in reader:
+        if columns:
+            yield from (row[i] for i in columns if i < len(row))
+        else:
+            yield from row
+
+
+# START_CONTRACT: iter_import_tokens
+#   PURPOSE: Yield raw tokens line by line for txt/csv; JSON is parsed whole and walked for list items and handle-like fields.
+#   INPUTS: { lines: Iterable[str], fmt: str - one of IMPORT_FORMATS }
+#   OUTPUTS: { Iterator[str] - raw tokens, not yet validated; raises ValidationError on malformed JSON/CSV }
+#   SIDE_EFFECTS: none
+#   LINKS: M-PARSING-IMPORTS, M-PARSING-CHANNELS, M-ERRORS
+# END_CONTRACT: iter_import_tokens
+def iter_import_tokens(lines: Iterable[str], fmt: str) -> Iterator[str]:
+    # START_BLOCK_DISPATCH_BY_FORMAT
+    if fmt == "json":
+        try:
+            document = json.loads("".join(lines))
+        except ValueError as e:
+            raise ValidationError(f"invalid JSON: {e}") from e
+        yield from _walk_json(document)
+        return
+    if fmt == "csv":
+        try:
+            yield from _iter_csv(lines)
+        except csv.Error as e:
+            raise ValidationError(f"invalid CSV: {e}") from e
+        return
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield from (t for t in SPLIT_RE.split(line) if t)
+    # END_BLOCK_DISPATCH_BY_FORMAT
+
+
+# START_CONTRACT: batch_import_handles
+#   PURPOSE: Normalize tokens, drop duplicates across the whole upload, and emit batches of at most batch_size handles.
+#   INPUTS: { tokens: Iterable[str], batch_size: int }
+#   OUTPUTS: { Iterator[ImportBatch] - handles in first-seen order with invalid tokens met since the previous batch }
+#   SIDE_EFFECTS: none
+#   LINKS: M-PARSING-IMPORTS, M-PARSING-CHANNELS, M-DOMAIN-DTO
+# END_CONTRACT: batch_import_handles
+def batch_import_handles(tokens: Iterable[str], *, batch_size: int) -> Iterator[ImportBatch]:
+    # START_BLOCK_NORMALIZE_DEDUPE_AND_SLICE
+    size = max(1, batch_size)
+    seen: set[str] = set()
+    handles: list[ChannelHandle] = []
+    invalid: list[str] = []
+    for raw in tokens:
+        token = raw.strip()
+        if not token:
+            continue
+        handle = normalize_handle(token)
+        if handle is None:
+            invalid.append(token)
+            continue
+        if str(handle) in seen:
+            continue
+        seen.add(str(handle))
+        handles.append(handle)
+        if len(handles) >= size:
+            yield ImportBatch(handles=handles, invalid_tokens=invalid)
+            handles, invalid = [], []
+    if handles or invalid:
+        yield ImportBatch(handles=handles, invalid_tokens=invalid)
+    # END_BLOCK_NORMALIZE_DEDUPE_AND_SLICE
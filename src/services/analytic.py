@@ -1,9 +1,9 @@
 # FILE: src/services/analytic.py
-# VERSION: 1.0.0
+# VERSION: 1.14.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Run end-to-end analytic flow for user channels and produce Telegram-ready digest chunks.
-#   SCOPE: Load user channels, execute extract-transform-summarize pipeline, handle per-channel failures, chunk output.
-#   DEPENDS: M-STORAGE-REPO, M-EXTRACTOR-TELETHON, M-TRANSFORM-POSTS, M-SUMMARIZER-LLM, M-DIGEST-ASSEMBLER, M-DIGEST-CHUNKING, M-DOMAIN-DTO, M-ERRORS
+#   SCOPE: Load user channels, extract and transform posts per channel, summarize all channels in one batched concurrent pass, handle per-channel failures, chunk output.
+#   DEPENDS: M-STORAGE-REPO, M-EXTRACTOR-TELETHON, M-TRANSFORM-POSTS, M-SUMMARIZER-LLM, M-DIGEST-ASSEMBLER, M-DIGEST-CHUNKING, M-DOMAIN-DTO, M-ERRORS, M-SVC-INCREMENTAL, M-DOMAIN-USAGE, M-STORAGE-USAGE, M-TRANSFORM-BOILERPLATE, M-TRANSFORM-TEXT, M-SUMMARIZER-TOKENS, M-STORAGE-LOCKS, M-APP-TRACING, M-APP-METRICS
 #   LINKS: docs/development-plan.xml#M-SVC-ANALYTIC, docs/knowledge-graph.xml#M-SVC-ANALYTIC
 # END_MODULE_CONTRACT
 #
@@ -13,23 +13,47 @@
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.1.0 - Added per-channel error logging for extract/summarize failures.
+#   LAST_CHANGE: v1.14.0 - Reported reused and no-posts channels to on_channel_done, not only fresh summaries.
 # END_CHANGE_SUMMARY
 
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+import uuid
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 from telethon import TelegramClient
 
-from src.app.errors import ExtractError, SummarizeError
+from src.app.errors import ExtractError, StorageError
+from src.app.metrics import CACHE_LOOKUPS, CHANNELS_IN_FLIGHT, STAGE_LATENCY
+from src.app.tracing import current_span, start_span, traced
 from src.digest.assembler import assemble_digest
-from src.digest.chunking import chunk_text_for_telegram
-from src.domain.dto import ChannelSummaryDTO, DigestDTO
+from src.digest.chunking import chunk_blocks_for_telegram
+from src.domain.dto import ChannelSummaryDTO, DigestDTO, DigestRunRecord, PostDTO
+from src.domain.types import ChannelHandle
+from src.domain.usage import bind_usage_scope
 from src.extractor.telethon_extractor import fetch_last_posts
-from src.storage.repository import list_user_channels
-from src.summarizer.llm import Summarizer
+from src.storage.locks import ChannelLocks
+from src.storage.repository import (
+    get_boilerplate_states,
+    get_channel_summaries,
+    get_last_posts,
+    get_refreshed_channels,
+    list_user_channels,
+    save_boilerplate_state,
+    save_channel_summary,
+    upsert_posts,
+)
+from src.storage.usage import UsageRecorder
+from src.summarizer.llm import Summarizer, SummaryRequest
+from src.summarizer.tokens import heuristic_token_count
+from src.transform.boilerplate import BoilerplateModel
 from src.transform.posts import transform_posts
+from src.transform.text import expand_url_placeholders
+
+from .incremental import PLAN_INCREMENTAL, PLAN_REUSE, plan_summary_update
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +67,12 @@ class AnalyticResponse:
 
 # START_CONTRACT: analytic_usecase
 #   PURPOSE: Generate digest chunks for all allowed user channels using ETL + summarization flow.
-#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, tg_client: TelegramClient, summarizer: Summarizer, posts_per_channel: int, max_channels_per_call: int, max_chars_per_post: int, tg_message_max_len: int, include_post_links: bool }
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, tg_client: TelegramClient, summarizer: Summarizer, posts_per_channel: int, max_channels_per_call: int, max_chars_per_post: int, tg_message_max_len: int, include_post_links: bool, on_summary_delta: Callable[[ChannelHandle, str], Awaitable[None]]|None, incremental_summaries: bool, incremental_max_delta_posts: int, usage_recorder: UsageRecorder|None, boilerplate_stripping: bool, boilerplate_min_share: float, boilerplate_max_removal_ratio: float, prompt_compaction: bool, channel_locks: ChannelLocks|None, channel_lock_wait_s: float, completed: dict[str, ChannelSummaryDTO]|None - channels already summarized by an interrupted run, on_channel_done: Callable[[ChannelSummaryDTO], Awaitable[None]]|None - called as each channel finishes (fresh, reused or without posts); error slots and resumed channels are not reported }
 #   OUTPUTS: { AnalyticResponse - digest dto, ordered chunk list, optional warning }
-#   SIDE_EFFECTS: network I/O to Telegram and OpenAI integrations; reads user-channel data from storage
-#   LINKS: M-SVC-ANALYTIC, M-STORAGE-REPO, M-EXTRACTOR-TELETHON, M-SUMMARIZER-LLM, M-DIGEST-ASSEMBLER, M-DIGEST-CHUNKING
+#   SIDE_EFFECTS: network I/O to Telegram and OpenAI integrations; reads user-channel data from storage; reads/writes stored channel summaries in incremental mode; reads/writes boilerplate state when stripping; with channel locks, holds refresh locks for owned channels, stores their posts and summaries, and reads stored results for channels owned elsewhere; buffers a digest run record
+#   LINKS: M-SVC-ANALYTIC, M-STORAGE-REPO, M-EXTRACTOR-TELETHON, M-SUMMARIZER-LLM, M-DIGEST-ASSEMBLER, M-DIGEST-CHUNKING, M-SVC-INCREMENTAL, M-STORAGE-USAGE, M-TRANSFORM-BOILERPLATE, M-STORAGE-LOCKS, M-APP-TRACING
 # END_CONTRACT: analytic_usecase
+@traced("analytic_usecase")
 async def analytic_usecase(
     pool,
     tg_user_id: int,
@@ -59,8 +84,23 @@ async def analytic_usecase(
     max_chars_per_post: int,
     tg_message_max_len: int,
     include_post_links: bool,
+    on_summary_delta: Callable[[ChannelHandle, str], Awaitable[None]] | None = None,
+    incremental_summaries: bool = False,
+    incremental_max_delta_posts: int = 3,
+    usage_recorder: UsageRecorder | None = None,
+    boilerplate_stripping: bool = False,
+    boilerplate_min_share: float = 0.6,
+    boilerplate_max_removal_ratio: float = 0.5,
+    prompt_compaction: bool = False,
+    channel_locks: ChannelLocks | None = None,
+    channel_lock_wait_s: float = 60.0,
+    completed: dict[str, ChannelSummaryDTO] | None = None,
+    on_channel_done: Callable[[ChannelSummaryDTO], Awaitable[None]] | None = None,
 ) -> AnalyticResponse:
     # START_BLOCK_LOAD_USER_CHANNELS_AND_LIMIT_GUARDS
+    run_key = uuid.uuid4().hex
+    run_started_at = datetime.now(timezone.utc)
+    run_started = time.monotonic()
     handles = await list_user_channels(pool, tg_user_id)
     total = len(handles)
     warning = None
@@ -77,81 +117,358 @@ async def analytic_usecase(
     if total > max_channels_per_call:
         warning = f"Обработал первые {max_channels_per_call} каналов из {total}, чтобы не превышать лимиты."
         handles = handles[:max_channels_per_call]
+    resumed = completed or {}
+    refresh = [h for h in handles if str(h) not in resumed]
+    current_span().set_attributes(tg_user_id=tg_user_id, channels=len(handles), resumed=len(handles) - len(refresh))
     # END_BLOCK_LOAD_USER_CHANNELS_AND_LIMIT_GUARDS
 
-    # START_BLOCK_BUILD_CHANNEL_SUMMARIES_WITH_ERROR_ISOLATION
-    summaries: list[ChannelSummaryDTO] = []
+    # START_BLOCK_CLAIM_CHANNEL_REFRESH_LOCKS
+    owned: list[ChannelHandle] = []
+    waiting: list[ChannelHandle] = []
+    if channel_locks is not None:
+        try:
+            owned = await channel_locks.try_acquire(refresh)
+            waiting = [h for h in refresh if h not in owned]
+        except StorageError:
+            logger.warning(
+                "[AnalyticService][analytic_usecase][CLAIM_CHANNEL_REFRESH_LOCKS] locks unavailable, refreshing all",
+                exc_info=True,
+            )
+    owned_keys = {str(h) for h in owned}
+    waiting_keys = {str(h) for h in waiting}
+    waiter = (
+        asyncio.create_task(channel_locks.wait_released(waiting, timeout_s=channel_lock_wait_s))
+        if waiting
+        else None
+    )
+    # END_BLOCK_CLAIM_CHANNEL_REFRESH_LOCKS
 
-    for handle in handles:
-        channel_link = f"https://t.me/{str(handle)}"
-        posts = []
+    CHANNELS_IN_FLIGHT.inc(len(refresh))
+    try:
+        # START_BLOCK_LOAD_BOILERPLATE_MODELS
+        boilerplate: dict[str, BoilerplateModel] = {}
+        if boilerplate_stripping:
+            states = {}
+            try:
+                states = await get_boilerplate_states(pool, handles)
+            except StorageError:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][LOAD_BOILERPLATE_MODELS] state unavailable, learning from scratch",
+                    exc_info=True,
+                )
+            boilerplate = {
+                str(h): BoilerplateModel.from_state(
+                    states.get(str(h)),
+                    min_share=boilerplate_min_share,
+                    max_removal_ratio=boilerplate_max_removal_ratio,
+                )
+                for h in handles
+            }
+        learned: list[ChannelHandle] = []
+        # END_BLOCK_LOAD_BOILERPLATE_MODELS
 
-        try:
-            posts = await fetch_last_posts(tg_client, handle, limit=posts_per_channel)
-            posts = transform_posts(posts, max_chars_per_post=max_chars_per_post)
+        # START_BLOCK_EXTRACT_CHANNEL_POSTS_WITH_ERROR_ISOLATION
+        extract_started = time.monotonic()
+        slots: list[ChannelSummaryDTO | None] = [None] * len(handles)
+        pending: list[tuple[int, SummaryRequest]] = []
+        url_maps: dict[int, dict[str, str]] = {}
 
-            if not posts:
-                summaries.append(
-                    ChannelSummaryDTO(
-                        channel_handle=handle,
-                        channel_link=channel_link,
-                        summary_text="Нет текстовых постов среди последних сообщений.",
-                        post_links=[],
+        async def report_slot(idx: int) -> None:
+            # Error slots stay unreported so a retried job attempts them again; resumed ones are already known.
+            if on_channel_done is not None:
+                await on_channel_done(slots[idx])
+
+        @traced("analytic.prepare_channel")
+        async def prepare_channel(idx: int, handle: ChannelHandle, stored_posts: list[PostDTO] | None = None) -> None:
+            current_span().set_attributes(channel=str(handle), adopted=bool(stored_posts))
+            channel_link = f"https://t.me/{str(handle)}"
+
+            try:
+                posts = stored_posts or await fetch_last_posts(tg_client, handle, limit=posts_per_channel)
+                if not stored_posts and str(handle) in owned_keys:
+                    # Lock waiters on other instances read these instead of calling Telethon again.
+                    try:
+                        await upsert_posts(pool, handle, posts)
+                    except StorageError:
+                        logger.warning(
+                            "[AnalyticService][analytic_usecase][STORE_OWNED_POSTS] handle=%s",
+                            str(handle),
+                            exc_info=True,
+                        )
+                model = boilerplate.get(str(handle))
+                if model is not None and model.observe(posts):
+                    learned.append(handle)
+                url_maps[idx] = {}
+                with start_span("transform_posts", channel=str(handle), posts=len(posts)) as span:
+                    posts = transform_posts(
+                        posts,
+                        max_chars_per_post=max_chars_per_post,
+                        boilerplate=model,
+                        compact=prompt_compaction,
+                        url_map=url_maps[idx],
+                        count_tokens=heuristic_token_count,
                     )
+                    span.set_attributes(kept=len(posts))
+            except ExtractError as e:
+                current_span().record_error(e)
+                logger.exception(
+                    "[AnalyticService][analytic_usecase][CHANNEL_EXTRACT_ERROR] handle=%s",
+                    str(handle),
                 )
-                continue
-
-            summary_text = await summarizer.summarize_channel(handle, channel_link, posts)
-            post_links = [p.permalink for p in posts if p.permalink] if include_post_links else []
-            summaries.append(
-                ChannelSummaryDTO(
+                slots[idx] = ChannelSummaryDTO(
                     channel_handle=handle,
                     channel_link=channel_link,
-                    summary_text=summary_text,
-                    post_links=post_links,
+                    summary_text=f"Ошибка получения постов: {e}",
+                    post_links=[],
                 )
-            )
+                return
 
-        except ExtractError as e:
-            logger.exception(
-                "[AnalyticService][analytic_usecase][CHANNEL_EXTRACT_ERROR] handle=%s",
-                str(handle),
-            )
-            summaries.append(
-                ChannelSummaryDTO(
+            if not posts:
+                slots[idx] = ChannelSummaryDTO(
                     channel_handle=handle,
                     channel_link=channel_link,
-                    summary_text=f"Ошибка получения постов: {e}",
+                    summary_text="Нет текстовых постов среди последних сообщений.",
                     post_links=[],
                 )
+                await report_slot(idx)
+                return
+
+            pending.append((idx, SummaryRequest(channel_handle=handle, channel_link=channel_link, posts=posts)))
+
+        for idx, handle in enumerate(handles):
+            if str(handle) in resumed:
+                slots[idx] = resumed[str(handle)]
+            elif str(handle) not in waiting_keys:
+                await prepare_channel(idx, handle)
+        # END_BLOCK_EXTRACT_CHANNEL_POSTS_WITH_ERROR_ISOLATION
+
+        # START_BLOCK_ADOPT_POSTS_FROM_LOCK_OWNERS
+        adopted: set[int] = set()
+        if waiter is not None:
+            try:
+                released = {str(h) for h in await waiter}
+            except StorageError:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][ADOPT_POSTS_FROM_LOCK_OWNERS] wait failed, refreshing locally",
+                    exc_info=True,
+                )
+                released = set()
+            # A free lock also means the owner failed or crashed; adopt only posts it stored after this run began.
+            if released:
+                try:
+                    candidates = [h for h in waiting if str(h) in released]
+                    refreshed = await get_refreshed_channels(pool, candidates, run_started_at)
+                except StorageError:
+                    logger.warning(
+                        "[AnalyticService][analytic_usecase][ADOPT_POSTS_FROM_LOCK_OWNERS] refresh markers unavailable",
+                        exc_info=True,
+                    )
+                    refreshed = set()
+                stale = released - refreshed
+                if stale:
+                    logger.info(
+                        "[AnalyticService][analytic_usecase][ADOPT_POSTS_FROM_LOCK_OWNERS] no fresh posts stored, fetching handles=%s",
+                        sorted(stale),
+                    )
+                released = refreshed
+            for idx, handle in enumerate(handles):
+                if str(handle) not in waiting_keys:
+                    continue
+                stored_posts: list[PostDTO] = []
+                if str(handle) in released:
+                    try:
+                        stored_posts = await get_last_posts(pool, handle, posts_per_channel)
+                    except StorageError:
+                        logger.warning(
+                            "[AnalyticService][analytic_usecase][ADOPT_POSTS_FROM_LOCK_OWNERS] handle=%s",
+                            str(handle),
+                            exc_info=True,
+                        )
+                if stored_posts:
+                    adopted.add(idx)
+                await prepare_channel(idx, handle, stored_posts)
+            logger.info(
+                "[AnalyticService][analytic_usecase][ADOPT_POSTS_FROM_LOCK_OWNERS] waited=%s adopted=%s",
+                len(waiting),
+                len(adopted),
             )
-        except SummarizeError as e:
-            logger.exception(
-                "[AnalyticService][analytic_usecase][CHANNEL_SUMMARIZE_ERROR] handle=%s",
-                str(handle),
+        extract_ms = int((time.monotonic() - extract_started) * 1000)
+        # END_BLOCK_ADOPT_POSTS_FROM_LOCK_OWNERS
+
+        # START_BLOCK_PERSIST_BOILERPLATE_MODELS
+        if learned:
+            saved = await asyncio.gather(
+                *[save_boilerplate_state(pool, h, boilerplate[str(h)].to_state()) for h in learned],
+                return_exceptions=True,
             )
-            fallback_links = [p.permalink for p in posts if p.permalink]
-            summaries.append(
-                ChannelSummaryDTO(
-                    channel_handle=handle,
-                    channel_link=channel_link,
-                    summary_text=f"Ошибка суммаризации: {e}",
-                    post_links=fallback_links if include_post_links else [],
+            failed = [r for r in saved if isinstance(r, BaseException)]
+            if failed:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][PERSIST_BOILERPLATE_MODELS] failed=%s of=%s",
+                    len(failed),
+                    len(saved),
+                    exc_info=failed[0],
                 )
+        # END_BLOCK_PERSIST_BOILERPLATE_MODELS
+
+        # START_BLOCK_PLAN_INCREMENTAL_REFRESH
+        summarize_started = time.monotonic()
+        # Adopted channels always check the owner's stored summary, even without incremental mode.
+        planable = [(idx, req) for idx, req in pending if incremental_summaries or idx in adopted]
+        if planable:
+            stored = {}
+            try:
+                stored = await get_channel_summaries(pool, [req.channel_handle for _, req in planable])
+            except StorageError:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][PLAN_INCREMENTAL_REFRESH] stored summaries unavailable, running full",
+                    exc_info=True,
+                )
+
+            planned: list[tuple[int, SummaryRequest]] = []
+            for idx, req in pending:
+                if not incremental_summaries and idx not in adopted:
+                    planned.append((idx, req))
+                    continue
+                plan = plan_summary_update(
+                    stored.get(str(req.channel_handle)),
+                    req.posts,
+                    max_delta_posts=incremental_max_delta_posts,
+                )
+                CACHE_LOOKUPS.inc(cache="stored_summary", result="hit" if plan.mode == PLAN_REUSE else "miss")
+                if plan.mode == PLAN_REUSE:
+                    slots[idx] = ChannelSummaryDTO(
+                        channel_handle=req.channel_handle,
+                        channel_link=req.channel_link,
+                        summary_text=plan.previous.summary_text,
+                        post_links=[p.permalink for p in req.posts if p.permalink] if include_post_links else [],
+                    )
+                    await report_slot(idx)
+                    continue
+                if plan.mode == PLAN_INCREMENTAL and incremental_summaries:
+                    req = replace(req, previous_summary=plan.previous.summary_text, new_posts=plan.new_posts)
+                planned.append((idx, req))
+            pending = planned
+        # END_BLOCK_PLAN_INCREMENTAL_REFRESH
+
+        # START_BLOCK_SUMMARIZE_CHANNELS_WITH_ERROR_ISOLATION
+        def finish_summary(idx: int, result: ChannelSummaryDTO) -> ChannelSummaryDTO:
+            result = replace(result, summary_text=expand_url_placeholders(result.summary_text, url_maps.get(idx, {})))
+            return result if include_post_links else replace(result, post_links=[])
+
+        report = None
+        if on_channel_done is not None:
+            async def report(pos: int, result: ChannelSummaryDTO | Exception) -> None:
+                if isinstance(result, ChannelSummaryDTO):
+                    await on_channel_done(finish_summary(pending[pos][0], result))
+
+        with (
+            bind_usage_scope(run_key=run_key, tg_user_id=tg_user_id),
+            start_span("summarize_channels", channels=len(pending)),
+        ):
+            results = (
+                await summarizer.summarize_channels(
+                    [req for _, req in pending],
+                    on_delta=on_summary_delta,
+                    on_result=report,
+                )
+                if pending
+                else []
+            )
+        summarize_ms = int((time.monotonic() - summarize_started) * 1000)
+
+        for (idx, req), result in zip(pending, results):
+            if isinstance(result, ChannelSummaryDTO):
+                slots[idx] = finish_summary(idx, result)
+                continue
+
+            logger.error(
+                "[AnalyticService][analytic_usecase][CHANNEL_SUMMARIZE_ERROR] handle=%s",
+                str(req.channel_handle),
+                exc_info=result,
+            )
+            fallback_links = [p.permalink for p in req.posts if p.permalink]
+            slots[idx] = ChannelSummaryDTO(
+                channel_handle=req.channel_handle,
+                channel_link=req.channel_link,
+                summary_text=f"Ошибка суммаризации: {result}",
+                post_links=fallback_links if include_post_links else [],
             )
-    # END_BLOCK_BUILD_CHANNEL_SUMMARIES_WITH_ERROR_ISOLATION
+
+        summaries: list[ChannelSummaryDTO] = [s for s in slots if s is not None]
+        # END_BLOCK_SUMMARIZE_CHANNELS_WITH_ERROR_ISOLATION
+
+        # START_BLOCK_PERSIST_REFRESHED_SUMMARIES
+        # Owned channels are saved before their locks are released so waiters can adopt them.
+        to_save = [
+            (idx, req)
+            for (idx, req), result in zip(pending, results)
+            if isinstance(result, ChannelSummaryDTO) and (incremental_summaries or str(req.channel_handle) in owned_keys)
+        ]
+        if to_save:
+            saved = await asyncio.gather(
+                *[
+                    save_channel_summary(pool, req.channel_handle, slots[idx].summary_text, [p.tg_msg_id for p in req.posts])
+                    for idx, req in to_save
+                ],
+                return_exceptions=True,
+            )
+            failed = [r for r in saved if isinstance(r, BaseException)]
+            if failed:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][PERSIST_REFRESHED_SUMMARIES] failed=%s of=%s",
+                    len(failed),
+                    len(saved),
+                    exc_info=failed[0],
+                )
+        # END_BLOCK_PERSIST_REFRESHED_SUMMARIES
+    finally:
+        CHANNELS_IN_FLIGHT.dec(len(refresh))
+        # START_BLOCK_RELEASE_CHANNEL_REFRESH_LOCKS
+        if waiter is not None and not waiter.done():
+            waiter.cancel()
+        if owned:
+            try:
+                await channel_locks.release(owned)
+            except StorageError:
+                logger.warning(
+                    "[AnalyticService][analytic_usecase][RELEASE_CHANNEL_REFRESH_LOCKS] release failed",
+                    exc_info=True,
+                )
+        # END_BLOCK_RELEASE_CHANNEL_REFRESH_LOCKS
 
     # START_BLOCK_ASSEMBLE_AND_CHUNK_FINAL_DIGEST
-    digest = assemble_digest(
-        tg_user_id=tg_user_id,
-        channel_summaries=summaries,
-        created_at=datetime.now(timezone.utc),
-        include_post_links=include_post_links,
-    )
+    with start_span("assemble_digest", channels=len(summaries)):
+        digest = assemble_digest(
+            tg_user_id=tg_user_id,
+            channel_summaries=summaries,
+            created_at=datetime.now(timezone.utc),
+            include_post_links=include_post_links,
+        )
 
-    chunks = chunk_text_for_telegram(digest.raw_text, max_len=tg_message_max_len)
+    with start_span("chunk_digest", blocks=len(digest.blocks)) as span:
+        chunks = chunk_blocks_for_telegram(digest.blocks, max_len=tg_message_max_len)
+        span.set_attributes(chunks=len(chunks))
     if warning:
         chunks = [warning] + chunks
     # END_BLOCK_ASSEMBLE_AND_CHUNK_FINAL_DIGEST
 
+    # START_BLOCK_RECORD_DIGEST_RUN
+    STAGE_LATENCY.observe(extract_ms / 1000, stage="extract")
+    STAGE_LATENCY.observe(summarize_ms / 1000, stage="summarize")
+    STAGE_LATENCY.observe(time.monotonic() - run_started, stage="total")
+    if usage_recorder is not None:
+        usage_recorder.record_run(
+            DigestRunRecord(
+                run_key=run_key,
+                tg_user_id=tg_user_id,
+                started_at=run_started_at,
+                channels=len(handles),
+                extract_ms=extract_ms,
+                summarize_ms=summarize_ms,
+                total_ms=int((time.monotonic() - run_started) * 1000),
+            )
+        )
+    # END_BLOCK_RECORD_DIGEST_RUN
+
     return AnalyticResponse(digest=digest, chunks=chunks, warning=warning)
@@ -0,0 +1,92 @@
+# FILE: src/services/import_channels.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Orchestrate bulk channel import for the /import command.
+#   SCOPE: Stream tokens through the import parser in bounded batches, persist each batch with set-based inserts, report progress, and aggregate counts.
+#   DEPENDS: M-PARSING-IMPORTS, M-STORAGE-REPO
+#   LINKS: docs/knowledge-graph.xml#M-SVC-IMPORT
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   ImportChannelsResponse — Aggregated import counts with a sample of unrecognized tokens.
+#   import_channels_usecase — Import a token stream batch by batch for one user.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added bulk channel import use case.
+# END_CHANGE_SUMMARY
+
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable
+
+from src.parsing.imports import batch_import_handles
+from src.storage.repository import add_channels_bulk
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ImportChannelsResponse:
+    added: int
+    already_present: int
+    rejected_due_to_limit: int
+    invalid_count: int
+    invalid_sample: list[str]
+
+
+# START_CONTRACT: import_channels_usecase
+#   PURPOSE: Persist every recognized handle from tokens in batches of batch_size, calling on_progress after each batch.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, tokens: Iterable[str], batch_size: int, max_per_user: int, on_progress: Callable[[int, int], Awaitable[None]]|None - (handles processed, added so far), invalid_sample_size: int }
+#   OUTPUTS: { ImportChannelsResponse }
+#   SIDE_EFFECTS: writes users/channels/user_channels tables through repository layer
+#   LINKS: M-SVC-IMPORT, M-PARSING-IMPORTS, M-STORAGE-REPO
+# END_CONTRACT: import_channels_usecase
+async def import_channels_usecase(
+    pool,
+    tg_user_id: int,
+    tokens: Iterable[str],
+    *,
+    batch_size: int,
+    max_per_user: int,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    invalid_sample_size: int = 20,
+) -> ImportChannelsResponse:
+    added = already = rejected = processed = invalid_count = 0
+    invalid_sample: list[str] = []
+
+    # START_BLOCK_PERSIST_BATCHES
+    for batch in batch_import_handles(tokens, batch_size=batch_size):
+        invalid_count += len(batch.invalid_tokens)
+        invalid_sample.extend(batch.invalid_tokens[: max(0, invalid_sample_size - len(invalid_sample))])
+        if not batch.handles:
+            continue
+        batch_added, batch_already, batch_rejected = await add_channels_bulk(
+            pool,
+            tg_user_id,
+            batch.handles,
+            max_per_user=max_per_user,
+        )
+        added += len(batch_added)
+        already += len(batch_already)
+        rejected += len(batch_rejected)
+        processed += len(batch.handles)
+        if on_progress is not None:
+            await on_progress(processed, added)
+    # END_BLOCK_PERSIST_BATCHES
+
+    logger.info(
+        "[ImportChannels][import_channels_usecase][PERSIST_BATCHES] tg_user_id=%s added=%s already=%s rejected=%s invalid=%s",
+        tg_user_id,
+        added,
+        already,
+        rejected,
+        invalid_count,
+    )
+    return ImportChannelsResponse(
+        added=added,
+        already_present=already,
+        rejected_due_to_limit=rejected,
+        invalid_count=invalid_count,
+        invalid_sample=invalid_sample,
+    )
@@ -0,0 +1,66 @@
+# FILE: src/services/incremental.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Decide how to refresh a channel summary from the stored previous summary and the current post window.
+#   SCOPE: Pure planning of reuse / incremental / full re-summary; no I/O.
+#   DEPENDS: M-DOMAIN-DTO
+#   LINKS: docs/knowledge-graph.xml#M-SVC-INCREMENTAL
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   PLAN_REUSE / PLAN_INCREMENTAL / PLAN_FULL — Summary refresh modes.
+#   SummaryPlan — Chosen refresh mode with the delta posts to send.
+#   plan_summary_update — Compare stored post ids with the current window and choose a refresh mode.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added incremental summary refresh planner.
+# END_CHANGE_SUMMARY
+
+from dataclasses import dataclass
+
+from src.domain.dto import PostDTO, StoredSummaryDTO
+
+PLAN_REUSE = "reuse"
+PLAN_INCREMENTAL = "incremental"
+PLAN_FULL = "full"
+
+
+@dataclass(frozen=True)
+class SummaryPlan:
+    mode: str
+    new_posts: list[PostDTO]
+    previous: StoredSummaryDTO | None
+
+
+# START_CONTRACT: plan_summary_update
+#   PURPOSE: Choose reuse when no posts are new, incremental when a few are, and full when there is no usable previous summary, the delta is large, or the window rolled past everything previously covered.
+#   INPUTS: { previous: StoredSummaryDTO|None, posts: list[PostDTO] - current chronological window, max_delta_posts: int }
+#   OUTPUTS: { SummaryPlan }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SVC-INCREMENTAL, M-DOMAIN-DTO
+# END_CONTRACT: plan_summary_update
+def plan_summary_update(
+    previous: StoredSummaryDTO | None,
+    posts: list[PostDTO],
+    *,
+    max_delta_posts: int,
+) -> SummaryPlan:
+    # START_BLOCK_REQUIRE_PREVIOUS_SUMMARY
+    if previous is None or not previous.summary_text.strip() or max_delta_posts <= 0:
+        return SummaryPlan(mode=PLAN_FULL, new_posts=list(posts), previous=None)
+    # END_BLOCK_REQUIRE_PREVIOUS_SUMMARY
+
+    # START_BLOCK_COMPARE_COVERED_AND_CURRENT_IDS
+    covered = set(previous.post_ids)
+    new_posts = [p for p in posts if p.tg_msg_id not in covered]
+    overlap = len(posts) - len(new_posts)
+    # END_BLOCK_COMPARE_COVERED_AND_CURRENT_IDS
+
+    # START_BLOCK_SELECT_REFRESH_MODE
+    if not new_posts:
+        return SummaryPlan(mode=PLAN_REUSE, new_posts=[], previous=previous)
+    if overlap == 0 or len(new_posts) > max_delta_posts:
+        return SummaryPlan(mode=PLAN_FULL, new_posts=list(posts), previous=None)
+    return SummaryPlan(mode=PLAN_INCREMENTAL, new_posts=new_posts, previous=previous)
+    # END_BLOCK_SELECT_REFRESH_MODE
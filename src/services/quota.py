@@ -0,0 +1,131 @@
+# FILE: src/services/quota.py
+# VERSION: 1.1.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Admit or reject expensive commands per user before they occupy extractor and LLM capacity.
+#   SCOPE: Per-command token bucket policies, request cost estimation, and admission decisions backed by persisted buckets.
+#   DEPENDS: M-STORAGE-QUOTA, M-STORAGE-REPO
+#   LINKS: docs/knowledge-graph.xml#M-SVC-QUOTA
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   COMMAND_ANALYTIC — Bucket key for /analytic; cost unit is one post to summarize.
+#   COMMAND_ADD — Bucket key for /add; cost unit is one channel handle.
+#   COMMAND_IMPORT — Bucket key for /import; cost unit is one import run.
+#   QuotaPolicy — Bucket capacity and hourly refill.
+#   QuotaDecision — Admission outcome with wait hint.
+#   estimate_analytic_cost — Posts a digest run will fetch and summarize.
+#   admit — Take cost from a user's bucket or report when it will fit.
+#   admit_analytic — Estimate /analytic cost from the user's channel list and admit it.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.1 - Documented that admitted cost is never refunded.
+# END_CHANGE_SUMMARY
+
+import logging
+import math
+from dataclasses import dataclass
+
+from src.storage.quota import take_quota_tokens
+from src.storage.repository import list_user_channels
+
+logger = logging.getLogger(__name__)
+
+COMMAND_ANALYTIC = "analytic"
+COMMAND_ADD = "add"
+COMMAND_IMPORT = "import"
+
+
+@dataclass(frozen=True, slots=True)
+class QuotaPolicy:
+    capacity: float
+    refill_per_hour: float
+
+    @property
+    def refill_per_s(self) -> float:
+        return self.refill_per_hour / 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class QuotaDecision:
+    allowed: bool
+    cost: float
+    remaining: float
+    retry_after_s: float
+
+
+# START_CONTRACT: estimate_analytic_cost
+#   PURPOSE: Estimate digest cost as channels processed times posts per channel.
+#   INPUTS: { channel_count: int, posts_per_channel: int, max_channels_per_call: int }
+#   OUTPUTS: { int - cost units (posts) }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SVC-QUOTA
+# END_CONTRACT: estimate_analytic_cost
+def estimate_analytic_cost(channel_count: int, *, posts_per_channel: int, max_channels_per_call: int) -> int:
+    return max(0, min(channel_count, max_channels_per_call)) * max(0, posts_per_channel)
+
+
+# START_CONTRACT: admit
+#   PURPOSE: Debit cost from the user's bucket for a command; requests larger than the bucket cost a full bucket. Nothing is refunded when the command later fails: the run already held extractor/LLM capacity, and refunds would let retries hammer a degraded upstream.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, command: str, cost: float, policy: QuotaPolicy }
+#   OUTPUTS: { QuotaDecision - allowed flag, remaining tokens, and seconds until cost fits when rejected }
+#   SIDE_EFFECTS: updates persisted bucket
+#   LINKS: M-SVC-QUOTA, M-STORAGE-QUOTA
+# END_CONTRACT: admit
+async def admit(pool, tg_user_id: int, command: str, cost: float, policy: QuotaPolicy) -> QuotaDecision:
+    # START_BLOCK_CLAMP_COST_AND_TAKE_TOKENS
+    cost = min(float(cost), policy.capacity)
+    if cost <= 0:
+        return QuotaDecision(allowed=True, cost=0.0, remaining=policy.capacity, retry_after_s=0.0)
+    allowed, remaining = await take_quota_tokens(
+        pool,
+        tg_user_id,
+        command,
+        cost=cost,
+        capacity=policy.capacity,
+        refill_per_s=policy.refill_per_s,
+    )
+    # END_BLOCK_CLAMP_COST_AND_TAKE_TOKENS
+
+    # START_BLOCK_BUILD_DECISION
+    if allowed:
+        retry_after_s = 0.0
+    elif policy.refill_per_s > 0:
+        retry_after_s = (cost - remaining) / policy.refill_per_s
+    else:
+        retry_after_s = math.inf
+    if not allowed:
+        logger.info(
+            "[Quota][admit][BUILD_DECISION] rejected tg_user_id=%s command=%s cost=%s remaining=%.1f retry_after_s=%.0f",
+            tg_user_id,
+            command,
+            cost,
+            remaining,
+            retry_after_s,
+        )
+    return QuotaDecision(allowed=allowed, cost=cost, remaining=remaining, retry_after_s=retry_after_s)
+    # END_BLOCK_BUILD_DECISION
+
+
+# START_CONTRACT: admit_analytic
+#   PURPOSE: Admit one /analytic run using a channels x posts cost estimate.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, posts_per_channel: int, max_channels_per_call: int, policy: QuotaPolicy }
+#   OUTPUTS: { QuotaDecision }
+#   SIDE_EFFECTS: reads user channels; updates persisted bucket
+#   LINKS: M-SVC-QUOTA, M-STORAGE-REPO
+# END_CONTRACT: admit_analytic
+async def admit_analytic(
+    pool,
+    tg_user_id: int,
+    *,
+    posts_per_channel: int,
+    max_channels_per_call: int,
+    policy: QuotaPolicy,
+) -> QuotaDecision:
+    channels = await list_user_channels(pool, tg_user_id)
+    cost = estimate_analytic_cost(
+        len(channels),
+        posts_per_channel=posts_per_channel,
+        max_channels_per_call=max_channels_per_call,
+    )
+    return await admit(pool, tg_user_id, COMMAND_ANALYTIC, cost, policy)
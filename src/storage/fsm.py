@@ -0,0 +1,237 @@
+# FILE: src/storage/fsm.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Keep aiogram FSM state in Postgres so it survives restarts, is shared by webhook workers, and expires for abandoned flows.
+#   SCOPE: aiogram BaseStorage over the asyncpg pool; per-key TTL refreshed on write; batched background sweep of expired rows; short-lived LRU read cache.
+#   DEPENDS: M-ERRORS
+#   LINKS: docs/knowledge-graph.xml#M-STORAGE-FSM
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   PostgresStorage — aiogram FSM storage backed by the fsm_states table.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added Postgres FSM storage with TTL expiry, periodic sweep, and read cache.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+import asyncpg
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from src.app.errors import StorageError
+
+logger = logging.getLogger(__name__)
+
+_FETCH = """
+    SELECT state, data FROM fsm_states
+    WHERE key = $1 AND expires_at > NOW();
+"""
+
+# An expired row is treated as absent: the untouched column is reset instead of resurrected.
+_UPSERT_STATE = """
+    INSERT INTO fsm_states AS f (key, state, data, expires_at)
+    VALUES($1, $2, '{}'::jsonb, NOW() + make_interval(secs => $3))
+    ON CONFLICT (key) DO UPDATE
+    SET state = EXCLUDED.state,
+        data = CASE WHEN f.expires_at > NOW() THEN f.data ELSE '{}'::jsonb END,
+        expires_at = EXCLUDED.expires_at
+    RETURNING state, data;
+"""
+
+_UPSERT_DATA = """
+    INSERT INTO fsm_states AS f (key, state, data, expires_at)
+    VALUES($1, NULL, $2::jsonb, NOW() + make_interval(secs => $3))
+    ON CONFLICT (key) DO UPDATE
+    SET data = EXCLUDED.data,
+        state = CASE WHEN f.expires_at > NOW() THEN f.state ELSE NULL END,
+        expires_at = EXCLUDED.expires_at
+    RETURNING state, data;
+"""
+
+_DELETE_EMPTY = """
+    DELETE FROM fsm_states
+    WHERE key = $1 AND state IS NULL AND data = '{}'::jsonb;
+"""
+
+_SWEEP_EXPIRED = """
+    DELETE FROM fsm_states
+    WHERE key IN (
+        SELECT key FROM fsm_states
+        WHERE expires_at <= NOW()
+        LIMIT $1
+    );
+"""
+
+
+def _storage_key(key: StorageKey) -> str:
+    # business_connection_id only exists on newer aiogram releases.
+    parts = (
+        key.bot_id,
+        key.chat_id,
+        key.user_id,
+        key.thread_id,
+        getattr(key, "business_connection_id", None),
+        key.destiny,
+    )
+    return ":".join("" if part is None else str(part) for part in parts)
+
+
+def _decode(data: Any) -> dict[str, Any]:
+    if isinstance(data, str):
+        return json.loads(data)
+    return dict(data or {})
+
+
+class PostgresStorage(BaseStorage):
+    # START_CONTRACT: PostgresStorage.__init__
+    #   PURPOSE: Configure expiry, sweep cadence, and read cache bounds.
+    #   INPUTS: { pool: asyncpg.Pool, ttl_s: float - lifetime after the last write, sweep_interval_s: float, sweep_batch: int, cache_ttl_s: float - 0 disables cache, cache_size: int }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-STORAGE-FSM
+    # END_CONTRACT: PostgresStorage.__init__
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        *,
+        ttl_s: float = 3600.0,
+        sweep_interval_s: float = 300.0,
+        sweep_batch: int = 1000,
+        cache_ttl_s: float = 1.0,
+        cache_size: int = 1024,
+    ) -> None:
+        self._pool = pool
+        self._ttl_s = max(1.0, ttl_s)
+        self._sweep_interval_s = max(1.0, sweep_interval_s)
+        self._sweep_batch = max(1, sweep_batch)
+        # Kept short: another worker may change the same key, so cached rows only absorb repeated reads within one update.
+        self._cache_ttl_s = max(0.0, cache_ttl_s)
+        self._cache_size = max(1, cache_size)
+        self._cache: OrderedDict[str, tuple[float, str | None, dict[str, Any]]] = OrderedDict()
+        self._sweeper: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    # START_CONTRACT: PostgresStorage.close
+    #   PURPOSE: Stop the background sweep; the pool is owned by the caller and stays open.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: cancels sweep task
+    #   LINKS: M-STORAGE-FSM
+    # END_CONTRACT: PostgresStorage.close
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        self._cache.clear()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        k = _storage_key(key)
+        row = await self._write(_UPSERT_STATE, k, value)
+        if value is None and not row[1]:
+            await self._execute(_DELETE_EMPTY, k)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return (await self._read(_storage_key(key)))[0]
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        k = _storage_key(key)
+        row = await self._write(_UPSERT_DATA, k, json.dumps(data or {}, ensure_ascii=False))
+        if row[0] is None and not row[1]:
+            await self._execute(_DELETE_EMPTY, k)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return dict((await self._read(_storage_key(key)))[1])
+
+    # START_CONTRACT: PostgresStorage._read
+    #   PURPOSE: Return (state, data) for a key from the cache when fresh, otherwise from Postgres ignoring expired rows.
+    #   INPUTS: { k: str - flattened storage key }
+    #   OUTPUTS: { tuple[str|None, dict] }
+    #   SIDE_EFFECTS: fills read cache
+    #   LINKS: M-STORAGE-FSM, M-ERRORS
+    # END_CONTRACT: PostgresStorage._read
+    async def _read(self, k: str) -> tuple[str | None, dict[str, Any]]:
+        # START_BLOCK_SERVE_FROM_CACHE
+        now = time.monotonic()
+        cached = self._cache.get(k)
+        if cached is not None and now - cached[0] < self._cache_ttl_s:
+            self._cache.move_to_end(k)
+            return cached[1], cached[2]
+        # END_BLOCK_SERVE_FROM_CACHE
+
+        # START_BLOCK_FETCH_LIVE_ROW
+        try:
+            row = await self._pool.fetchrow(_FETCH, k)
+        except Exception as e:
+            raise StorageError(str(e)) from e
+        state, data = (row["state"], _decode(row["data"])) if row is not None else (None, {})
+        self._remember(k, state, data)
+        return state, data
+        # END_BLOCK_FETCH_LIVE_ROW
+
+    async def _write(self, query: str, k: str, value: str | None) -> tuple[str | None, dict[str, Any]]:
+        try:
+            row = await self._pool.fetchrow(query, k, value, self._ttl_s)
+        except Exception as e:
+            raise StorageError(str(e)) from e
+        state, data = row["state"], _decode(row["data"])
+        self._remember(k, state, data)
+        return state, data
+
+    async def _execute(self, query: str, *args) -> str:
+        try:
+            return await self._pool.execute(query, *args)
+        except Exception as e:
+            raise StorageError(str(e)) from e
+
+    def _remember(self, k: str, state: str | None, data: dict[str, Any]) -> None:
+        if self._cache_ttl_s <= 0:
+            return
+        self._cache[k] = (time.monotonic(), state, data)
+        self._cache.move_to_end(k)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    # START_CONTRACT: PostgresStorage.sweep
+    #   PURPOSE: Delete expired rows in bounded batches so the sweep never holds long locks.
+    #   INPUTS: {}
+    #   OUTPUTS: { int - rows deleted }
+    #   SIDE_EFFECTS: deletes from fsm_states
+    #   LINKS: M-STORAGE-FSM
+    # END_CONTRACT: PostgresStorage.sweep
+    async def sweep(self) -> int:
+        # START_BLOCK_DELETE_EXPIRED_BATCHES
+        total = 0
+        while True:
+            status = await self._execute(_SWEEP_EXPIRED, self._sweep_batch)
+            deleted = int(status.split()[-1])
+            total += deleted
+            if deleted < self._sweep_batch:
+                return total
+        # END_BLOCK_DELETE_EXPIRED_BATCHES
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval_s)
+            try:
+                deleted = await self.sweep()
+            except StorageError:
+                logger.exception("[PostgresStorage][_sweep_loop][SWEEP] sweep failed")
+                continue
+            if deleted:
+                logger.info("[PostgresStorage][_sweep_loop][SWEEP] expired states deleted=%s", deleted)
@@ -0,0 +1,460 @@
+# FILE: src/storage/jobs.py
+# VERSION: 1.2.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Persist digest jobs so workers can claim them concurrently, resume interrupted runs, and hand finished results back to the bot.
+#   SCOPE: Enqueue, FOR UPDATE SKIP LOCKED claiming with a visibility timeout, lease heartbeat, per-channel checkpoints, completion, retry-or-fail, leased delivery with per-chunk progress, and LISTEN/NOTIFY wakeups.
+#   DEPENDS: M-ERRORS, M-DOMAIN-DTO, M-DOMAIN-TYPES
+#   LINKS: docs/knowledge-graph.xml#M-STORAGE-JOBS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   JOB_ANALYTIC — Job kind for one /analytic digest run.
+#   JOBS_NEW_CHANNEL — NOTIFY channel workers listen on for new jobs.
+#   JOBS_DONE_CHANNEL — NOTIFY channel bot processes listen on for finished jobs.
+#   enqueue_job — Insert a queued job and wake workers.
+#   claim_job — Lease the oldest runnable job, including ones whose lease expired.
+#   extend_job_lease — Push locked_until forward while the owner is still working.
+#   save_job_checkpoint — Record one finished channel summary on the job.
+#   complete_job — Store result chunks and wake bot processes.
+#   fail_job — Requeue with a delay or mark failed after the last attempt.
+#   release_job — Hand an interrupted job back to the queue without spending an attempt.
+#   claim_undelivered_jobs — Lease finished jobs for delivery; expired delivery leases are claimed again.
+#   record_delivery_progress — Store how many chunks were sent and extend the delivery lease.
+#   mark_job_delivered — Set delivered_at once every chunk is sent.
+#   retry_job_delivery — Drop the delivery lease and make the job claimable after a delay.
+#   JobSignal — LISTEN on one channel and let callers wait for a notification or a poll timeout.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.2.0 - Stopped reclaiming expired leases past max_attempts; such jobs are failed and announced instead.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import asyncpg
+
+from src.app.errors import StorageError
+from src.domain.dto import ChannelSummaryDTO, FinishedJobDTO, JobDTO
+from src.domain.types import ChannelHandle
+
+logger = logging.getLogger(__name__)
+
+JOB_ANALYTIC = "analytic"
+JOBS_NEW_CHANNEL = "jobs_new"
+JOBS_DONE_CHANNEL = "jobs_done"
+
+_INSERT_JOB = """
+    INSERT INTO jobs(kind, tg_user_id, chat_id, max_attempts)
+    VALUES($1, $2, $3, $4)
+    RETURNING id;
+"""
+
+# SKIP LOCKED lets concurrent workers pass over rows another claim is taking; expired leases are reclaimed.
+_CLAIM_JOB = """
+    UPDATE jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        lease_token = $1,
+        locked_until = NOW() + make_interval(secs => $2),
+        updated_at = NOW()
+    WHERE id = (
+        SELECT id FROM jobs
+        WHERE (status = 'queued' AND run_after <= NOW())
+           OR (status = 'running' AND locked_until < NOW() AND attempts < max_attempts)
+        ORDER BY id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, tg_user_id, chat_id, attempts, max_attempts, checkpoint;
+"""
+
+# A job whose worker keeps dying (OOM, segfault) never reaches fail_job; retire it once its last lease expires.
+_FAIL_EXHAUSTED_LEASES = """
+    UPDATE jobs
+    SET status = 'failed',
+        error = COALESCE(error, 'worker lost the lease on the last attempt'),
+        lease_token = NULL,
+        locked_until = NULL,
+        updated_at = NOW()
+    WHERE status = 'running' AND locked_until < NOW() AND attempts >= max_attempts
+    RETURNING id;
+"""
+
+_EXTEND_LEASE = """
+    UPDATE jobs
+    SET locked_until = NOW() + make_interval(secs => $3), updated_at = NOW()
+    WHERE id = $1 AND lease_token = $2 AND status = 'running'
+    RETURNING id;
+"""
+
+_SAVE_CHECKPOINT = """
+    UPDATE jobs
+    SET checkpoint = checkpoint || jsonb_build_object($3::text, $4::jsonb), updated_at = NOW()
+    WHERE id = $1 AND lease_token = $2 AND status = 'running'
+    RETURNING id;
+"""
+
+_COMPLETE_JOB = """
+    UPDATE jobs
+    SET status = 'done', result = $3::jsonb, error = NULL, lease_token = NULL, locked_until = NULL, updated_at = NOW()
+    WHERE id = $1 AND lease_token = $2 AND status = 'running'
+    RETURNING id;
+"""
+
+_FAIL_JOB = """
+    UPDATE jobs
+    SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+        run_after = NOW() + make_interval(secs => $4),
+        error = $3,
+        lease_token = NULL,
+        locked_until = NULL,
+        updated_at = NOW()
+    WHERE id = $1 AND lease_token = $2 AND status = 'running'
+    RETURNING status;
+"""
+
+_RELEASE_JOB = """
+    UPDATE jobs
+    SET status = 'queued',
+        attempts = GREATEST(attempts - 1, 0),
+        run_after = NOW(),
+        lease_token = NULL,
+        locked_until = NULL,
+        updated_at = NOW()
+    WHERE id = $1 AND lease_token = $2 AND status = 'running'
+    RETURNING id;
+"""
+
+# delivered_at is only set after the last chunk is sent; a process that dies mid-delivery leaves an expiring lease.
+_CLAIM_UNDELIVERED = """
+    UPDATE jobs
+    SET delivery_token = $2,
+        delivering_until = NOW() + make_interval(secs => $3),
+        delivery_attempts = delivery_attempts + 1,
+        updated_at = NOW()
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE status IN ('done', 'failed') AND delivered_at IS NULL
+          AND (delivering_until IS NULL OR delivering_until < NOW())
+        ORDER BY id
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, chat_id, status, result, error, delivered_chunks, delivery_attempts;
+"""
+
+_RECORD_DELIVERY_PROGRESS = """
+    UPDATE jobs
+    SET delivered_chunks = $3, delivering_until = NOW() + make_interval(secs => $4), updated_at = NOW()
+    WHERE id = $1 AND delivery_token = $2 AND delivered_at IS NULL
+    RETURNING id;
+"""
+
+_MARK_DELIVERED = """
+    UPDATE jobs
+    SET delivered_at = NOW(), delivery_token = NULL, delivering_until = NULL, updated_at = NOW()
+    WHERE id = $1 AND delivery_token = $2 AND delivered_at IS NULL
+    RETURNING id;
+"""
+
+_RETRY_DELIVERY = """
+    UPDATE jobs
+    SET delivery_token = NULL, delivering_until = NOW() + make_interval(secs => $3), updated_at = NOW()
+    WHERE id = $1 AND delivery_token = $2 AND delivered_at IS NULL
+    RETURNING id;
+"""
+
+_NOTIFY = "SELECT pg_notify($1, $2);"
+
+
+def _decode(data: Any) -> Any:
+    return json.loads(data) if isinstance(data, str) else data
+
+
+def _encode_summary(summary: ChannelSummaryDTO) -> str:
+    return json.dumps(
+        {
+            "channel_link": summary.channel_link,
+            "summary_text": summary.summary_text,
+            "post_links": list(summary.post_links),
+        },
+        ensure_ascii=False,
+    )
+
+
+def _decode_checkpoint(data: Any) -> dict[str, ChannelSummaryDTO]:
+    return {
+        handle: ChannelSummaryDTO(
+            channel_handle=ChannelHandle(handle),
+            channel_link=item["channel_link"],
+            summary_text=item["summary_text"],
+            post_links=list(item.get("post_links") or []),
+        )
+        for handle, item in (_decode(data) or {}).items()
+    }
+
+
+# START_CONTRACT: enqueue_job
+#   PURPOSE: Queue one job and notify listening workers once the insert commits.
+#   INPUTS: { pool: asyncpg.Pool, kind: str, tg_user_id: int, chat_id: int, max_attempts: int }
+#   OUTPUTS: { int - job id }
+#   SIDE_EFFECTS: inserts into jobs; NOTIFY jobs_new
+#   LINKS: M-STORAGE-JOBS, M-ERRORS
+# END_CONTRACT: enqueue_job
+async def enqueue_job(pool: asyncpg.Pool, kind: str, tg_user_id: int, chat_id: int, *, max_attempts: int) -> int:
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                job_id = await conn.fetchval(_INSERT_JOB, kind, tg_user_id, chat_id, max(1, max_attempts))
+                await conn.execute(_NOTIFY, JOBS_NEW_CHANNEL, str(job_id))
+        return int(job_id)
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: claim_job
+#   PURPOSE: Lease the oldest runnable job for visibility_timeout_s; a job whose worker died becomes claimable again when its lease expires, unless that was its last attempt, in which case it is failed.
+#   INPUTS: { pool: asyncpg.Pool, lease_token: str - unique per claim, visibility_timeout_s: float }
+#   OUTPUTS: { JobDTO|None - None when nothing is runnable }
+#   SIDE_EFFECTS: updates jobs status, attempts, and lease; NOTIFY jobs_done for jobs failed on an expired last lease
+#   LINKS: M-STORAGE-JOBS, M-DOMAIN-DTO, M-ERRORS
+# END_CONTRACT: claim_job
+async def claim_job(pool: asyncpg.Pool, lease_token: str, *, visibility_timeout_s: float) -> JobDTO | None:
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for exhausted in await conn.fetch(_FAIL_EXHAUSTED_LEASES):
+                    await conn.execute(_NOTIFY, JOBS_DONE_CHANNEL, str(exhausted["id"]))
+                row = await conn.fetchrow(_CLAIM_JOB, lease_token, float(visibility_timeout_s))
+    except Exception as e:
+        raise StorageError(str(e)) from e
+    if row is None:
+        return None
+    return JobDTO(
+        id=row["id"],
+        kind=row["kind"],
+        tg_user_id=row["tg_user_id"],
+        chat_id=row["chat_id"],
+        attempts=row["attempts"],
+        max_attempts=row["max_attempts"],
+        lease_token=lease_token,
+        checkpoint=_decode_checkpoint(row["checkpoint"]),
+    )
+
+
+async def _owned_update(pool: asyncpg.Pool, query: str, *args) -> bool:
+    try:
+        return await pool.fetchval(query, *args) is not None
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: extend_job_lease
+#   PURPOSE: Heartbeat a running job so other workers do not reclaim it.
+#   INPUTS: { pool: asyncpg.Pool, job: JobDTO, visibility_timeout_s: float }
+#   OUTPUTS: { bool - False when the lease was lost to another worker }
+#   SIDE_EFFECTS: updates jobs.locked_until
+#   LINKS: M-STORAGE-JOBS
+# END_CONTRACT: extend_job_lease
+async def extend_job_lease(pool: asyncpg.Pool, job: JobDTO, *, visibility_timeout_s: float) -> bool:
+    return await _owned_update(pool, _EXTEND_LEASE, job.id, job.lease_token, float(visibility_timeout_s))
+
+
+# START_CONTRACT: save_job_checkpoint
+#   PURPOSE: Merge one finished channel summary into the job checkpoint so a retry skips that channel.
+#   INPUTS: { pool: asyncpg.Pool, job: JobDTO, summary: ChannelSummaryDTO }
+#   OUTPUTS: { bool - False when the lease was lost }
+#   SIDE_EFFECTS: updates jobs.checkpoint
+#   LINKS: M-STORAGE-JOBS, M-DOMAIN-DTO
+# END_CONTRACT: save_job_checkpoint
+async def save_job_checkpoint(pool: asyncpg.Pool, job: JobDTO, summary: ChannelSummaryDTO) -> bool:
+    return await _owned_update(
+        pool,
+        _SAVE_CHECKPOINT,
+        job.id,
+        job.lease_token,
+        str(summary.channel_handle),
+        _encode_summary(summary),
+    )
+
+
+async def _finish(pool: asyncpg.Pool, query: str, job: JobDTO, *args) -> Any:
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                value = await conn.fetchval(query, job.id, job.lease_token, *args)
+                if value is not None and value != "queued":
+                    await conn.execute(_NOTIFY, JOBS_DONE_CHANNEL, str(job.id))
+                return value
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: complete_job
+#   PURPOSE: Store the digest chunks, end the lease, and notify bot processes.
+#   INPUTS: { pool: asyncpg.Pool, job: JobDTO, chunks: list[str] }
+#   OUTPUTS: { bool - False when the lease was lost and the result was discarded }
+#   SIDE_EFFECTS: updates jobs; NOTIFY jobs_done
+#   LINKS: M-STORAGE-JOBS, M-ERRORS
+# END_CONTRACT: complete_job
+async def complete_job(pool: asyncpg.Pool, job: JobDTO, chunks: list[str]) -> bool:
+    return await _finish(pool, _COMPLETE_JOB, job, json.dumps(chunks, ensure_ascii=False)) is not None
+
+
+# START_CONTRACT: fail_job
+#   PURPOSE: Requeue a failed attempt after retry_delay_s, or mark the job failed and notify bot processes after the last attempt.
+#   INPUTS: { pool: asyncpg.Pool, job: JobDTO, error: str, retry_delay_s: float }
+#   OUTPUTS: { str|None - new status ('queued' or 'failed'); None when the lease was lost }
+#   SIDE_EFFECTS: updates jobs; NOTIFY jobs_done on final failure
+#   LINKS: M-STORAGE-JOBS, M-ERRORS
+# END_CONTRACT: fail_job
+async def fail_job(pool: asyncpg.Pool, job: JobDTO, error: str, *, retry_delay_s: float) -> str | None:
+    return await _finish(pool, _FAIL_JOB, job, error, max(0.0, float(retry_delay_s)))
+
+
+# START_CONTRACT: release_job
+#   PURPOSE: Requeue a job this worker stops on purpose (shutdown) so the next claim resumes from its checkpoint at once.
+#   INPUTS: { pool: asyncpg.Pool, job: JobDTO }
+#   OUTPUTS: { bool - False when the lease was already lost }
+#   SIDE_EFFECTS: updates jobs status, attempts, and lease; NOTIFY jobs_new
+#   LINKS: M-STORAGE-JOBS
+# END_CONTRACT: release_job
+async def release_job(pool: asyncpg.Pool, job: JobDTO) -> bool:
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                released = await conn.fetchval(_RELEASE_JOB, job.id, job.lease_token) is not None
+                if released:
+                    await conn.execute(_NOTIFY, JOBS_NEW_CHANNEL, str(job.id))
+                return released
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: claim_undelivered_jobs
+#   PURPOSE: Lease up to limit undelivered finished jobs for lease_s; SKIP LOCKED and the lease keep two bot processes from sending the same result at once.
+#   INPUTS: { pool: asyncpg.Pool, delivery_token: str - unique per claim, lease_s: float, limit: int }
+#   OUTPUTS: { list[FinishedJobDTO] - with chunks already sent by an earlier lease holder in delivered_chunks }
+#   SIDE_EFFECTS: updates jobs delivery lease and delivery_attempts
+#   LINKS: M-STORAGE-JOBS, M-DOMAIN-DTO, M-ERRORS
+# END_CONTRACT: claim_undelivered_jobs
+async def claim_undelivered_jobs(
+    pool: asyncpg.Pool,
+    delivery_token: str,
+    *,
+    lease_s: float,
+    limit: int = 50,
+) -> list[FinishedJobDTO]:
+    try:
+        rows = await pool.fetch(_CLAIM_UNDELIVERED, max(1, limit), delivery_token, float(lease_s))
+    except Exception as e:
+        raise StorageError(str(e)) from e
+    return [
+        FinishedJobDTO(
+            id=row["id"],
+            chat_id=row["chat_id"],
+            status=row["status"],
+            chunks=list(_decode(row["result"]) or []),
+            error=row["error"],
+            delivery_token=delivery_token,
+            delivered_chunks=row["delivered_chunks"],
+            delivery_attempts=row["delivery_attempts"],
+        )
+        for row in sorted(rows, key=lambda r: r["id"])
+    ]
+
+
+# START_CONTRACT: record_delivery_progress
+#   PURPOSE: Persist how many chunks were sent so a reclaimed delivery resumes after them, and extend the lease.
+#   INPUTS: { pool: asyncpg.Pool, job: FinishedJobDTO, sent: int, lease_s: float }
+#   OUTPUTS: { bool - False when the delivery lease was lost }
+#   SIDE_EFFECTS: updates jobs.delivered_chunks and delivering_until
+#   LINKS: M-STORAGE-JOBS
+# END_CONTRACT: record_delivery_progress
+async def record_delivery_progress(pool: asyncpg.Pool, job: FinishedJobDTO, sent: int, *, lease_s: float) -> bool:
+    return await _owned_update(pool, _RECORD_DELIVERY_PROGRESS, job.id, job.delivery_token, sent, float(lease_s))
+
+
+# START_CONTRACT: mark_job_delivered
+#   PURPOSE: Finish delivery after the last chunk was sent.
+#   INPUTS: { pool: asyncpg.Pool, job: FinishedJobDTO }
+#   OUTPUTS: { bool - False when the delivery lease was lost }
+#   SIDE_EFFECTS: updates jobs.delivered_at
+#   LINKS: M-STORAGE-JOBS
+# END_CONTRACT: mark_job_delivered
+async def mark_job_delivered(pool: asyncpg.Pool, job: FinishedJobDTO) -> bool:
+    return await _owned_update(pool, _MARK_DELIVERED, job.id, job.delivery_token)
+
+
+# START_CONTRACT: retry_job_delivery
+#   PURPOSE: Give up this delivery attempt; the job becomes claimable again after delay_s.
+#   INPUTS: { pool: asyncpg.Pool, job: FinishedJobDTO, delay_s: float }
+#   OUTPUTS: { bool - False when the delivery lease was lost }
+#   SIDE_EFFECTS: updates jobs delivery lease
+#   LINKS: M-STORAGE-JOBS
+# END_CONTRACT: retry_job_delivery
+async def retry_job_delivery(pool: asyncpg.Pool, job: FinishedJobDTO, *, delay_s: float) -> bool:
+    return await _owned_update(pool, _RETRY_DELIVERY, job.id, job.delivery_token, max(0.0, float(delay_s)))
+
+
+class JobSignal:
+    # START_CONTRACT: JobSignal.__init__
+    #   PURPOSE: Bind to a pool and NOTIFY channel; the listening connection is taken by start().
+    #   INPUTS: { pool: asyncpg.Pool, channel: str }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-STORAGE-JOBS
+    # END_CONTRACT: JobSignal.__init__
+    def __init__(self, pool: asyncpg.Pool, channel: str) -> None:
+        self._pool = pool
+        self._channel = channel
+        self._conn = None
+        self._event = asyncio.Event()
+
+    def _on_notify(self, _conn, _pid, _channel, _payload) -> None:
+        self._event.set()
+
+    # START_CONTRACT: JobSignal.start
+    #   PURPOSE: LISTEN on the channel; failure is logged and callers fall back to polling.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: holds one pool connection
+    #   LINKS: M-STORAGE-JOBS
+    # END_CONTRACT: JobSignal.start
+    async def start(self) -> None:
+        if self._conn is not None:
+            return
+        try:
+            self._conn = await self._pool.acquire()
+            await self._conn.add_listener(self._channel, self._on_notify)
+        except Exception:
+            logger.warning("[JobSignal][start][LISTEN] channel=%s, polling only", self._channel, exc_info=True)
+            await self.aclose()
+
+    # START_CONTRACT: JobSignal.wait
+    #   PURPOSE: Return when a notification arrived since the last wait or after timeout_s, whichever is first.
+    #   INPUTS: { timeout_s: float }
+    #   OUTPUTS: { bool - True when woken by a notification }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-STORAGE-JOBS
+    # END_CONTRACT: JobSignal.wait
+    async def wait(self, timeout_s: float) -> bool:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(0.0, timeout_s))
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    async def aclose(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await conn.remove_listener(self._channel, self._on_notify)
+        except Exception:
+            pass
+        await self._pool.release(conn)
@@ -0,0 +1,187 @@
+# FILE: src/storage/locks.py
+# VERSION: 1.0.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Coordinate channel refresh across bot instances so one process extracts and summarizes a channel while others wait for its stored result.
+#   SCOPE: Session-level pg_try_advisory_lock keyed by channel id on one dedicated connection per process; in-process single-flight for concurrent runs; polling wait for locks held elsewhere.
+#   DEPENDS: M-ERRORS, M-DOMAIN-TYPES
+#   LINKS: docs/knowledge-graph.xml#M-STORAGE-LOCKS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   CHANNEL_LOCK_NAMESPACE — High 32 bits of the advisory lock key; separates channel locks from other advisory lock users.
+#   ChannelLocks — Try-acquire, release, and wait-for-release of per-channel refresh locks.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.1 - Keyed locks with one bigint so channel ids past 2^31 no longer overflow int4.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import time
+
+import asyncpg
+
+from src.app.errors import StorageError
+from src.domain.types import ChannelHandle
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_LOCK_NAMESPACE = 0x43484E4C  # "CHNL"
+
+# The lock call sits in the target list so it only runs for rows that passed the WHERE filter.
+# Key: namespace in the high 32 bits, low 32 bits of the BIGSERIAL id below; ids 2^32 apart share a lock,
+# which only serializes their refreshes.
+_LOCK_KEY = "(($2::bigint << 32) | (id & x'FFFFFFFF'::bigint))"
+
+_TRY_LOCK = f"""
+    SELECT handle, pg_try_advisory_lock({_LOCK_KEY}) AS locked
+    FROM channels
+    WHERE handle = ANY($1::text[]);
+"""
+
+_UNLOCK = f"""
+    SELECT pg_advisory_unlock({_LOCK_KEY})
+    FROM channels
+    WHERE handle = ANY($1::text[]);
+"""
+
+
+class ChannelLocks:
+    # START_CONTRACT: ChannelLocks.__init__
+    #   PURPOSE: Bind to a pool; locks are held on one connection taken from it by start().
+    #   INPUTS: { pool: asyncpg.Pool, poll_interval_s: float - retry cadence while waiting on another instance }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-STORAGE-LOCKS
+    # END_CONTRACT: ChannelLocks.__init__
+    def __init__(self, pool: asyncpg.Pool, *, poll_interval_s: float = 0.5) -> None:
+        self._pool = pool
+        self._poll_interval_s = max(0.05, poll_interval_s)
+        self._conn = None
+        # Advisory locks are re-entrant per session, so runs inside this process coordinate through events.
+        self._held: dict[str, asyncio.Event] = {}
+        self._mutex = asyncio.Lock()
+
+    async def start(self) -> None:
+        if self._conn is None:
+            try:
+                self._conn = await self._pool.acquire()
+            except Exception as e:
+                raise StorageError(str(e)) from e
+
+    # START_CONTRACT: ChannelLocks.aclose
+    #   PURPOSE: Drop every lock held by this process and return the dedicated connection to the pool.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: unlocks advisory locks; wakes local waiters
+    #   LINKS: M-STORAGE-LOCKS
+    # END_CONTRACT: ChannelLocks.aclose
+    async def aclose(self) -> None:
+        for event in self._held.values():
+            event.set()
+        self._held.clear()
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await conn.execute("SELECT pg_advisory_unlock_all();")
+        except Exception:
+            logger.warning("[ChannelLocks][aclose][UNLOCK_ALL] unlock failed", exc_info=True)
+        await self._pool.release(conn)
+
+    async def _fetch(self, query: str, handles: list[str]) -> list:
+        if self._conn is None:
+            raise StorageError("channel locks are not started")
+        async with self._mutex:
+            try:
+                return await self._conn.fetch(query, handles, CHANNEL_LOCK_NAMESPACE)
+            except Exception as e:
+                raise StorageError(str(e)) from e
+
+    # START_CONTRACT: ChannelLocks.try_acquire
+    #   PURPOSE: Take refresh locks for channels no other run currently holds, without blocking.
+    #   INPUTS: { handles: list[ChannelHandle] }
+    #   OUTPUTS: { list[ChannelHandle] - channels this run now owns; the rest are being refreshed elsewhere }
+    #   SIDE_EFFECTS: takes advisory locks on the dedicated connection
+    #   LINKS: M-STORAGE-LOCKS, M-ERRORS
+    # END_CONTRACT: ChannelLocks.try_acquire
+    async def try_acquire(self, handles: list[ChannelHandle]) -> list[ChannelHandle]:
+        # START_BLOCK_SKIP_LOCALLY_HELD
+        candidates = [str(h) for h in handles if str(h) not in self._held]
+        if not candidates:
+            return []
+        for key in candidates:
+            self._held[key] = asyncio.Event()
+        # END_BLOCK_SKIP_LOCALLY_HELD
+
+        # START_BLOCK_TRY_ADVISORY_LOCKS
+        try:
+            rows = await self._fetch(_TRY_LOCK, candidates)
+        except StorageError:
+            self._forget(candidates)
+            raise
+        # Channels without a row cannot be contended by another instance through this table.
+        lost = {row["handle"] for row in rows if not row["locked"]}
+        self._forget([key for key in candidates if key in lost])
+        owned = set(candidates) - lost
+        return [h for h in handles if str(h) in owned]
+        # END_BLOCK_TRY_ADVISORY_LOCKS
+
+    # START_CONTRACT: ChannelLocks.release
+    #   PURPOSE: Release channels taken by try_acquire and wake local waiters.
+    #   INPUTS: { handles: list[ChannelHandle] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: unlocks advisory locks
+    #   LINKS: M-STORAGE-LOCKS
+    # END_CONTRACT: ChannelLocks.release
+    async def release(self, handles: list[ChannelHandle]) -> None:
+        keys = [str(h) for h in handles if str(h) in self._held]
+        if not keys:
+            return
+        try:
+            await self._fetch(_UNLOCK, keys)
+        finally:
+            self._forget(keys)
+
+    def _forget(self, keys: list[str]) -> None:
+        for key in keys:
+            event = self._held.pop(key, None)
+            if event is not None:
+                event.set()
+
+    # START_CONTRACT: ChannelLocks.wait_released
+    #   PURPOSE: Wait until channels refreshed by other runs are released, up to timeout_s.
+    #   INPUTS: { handles: list[ChannelHandle], timeout_s: float }
+    #   OUTPUTS: { list[ChannelHandle] - channels whose owner finished in time, in input order }
+    #   SIDE_EFFECTS: briefly takes and drops advisory locks while probing
+    #   LINKS: M-STORAGE-LOCKS
+    # END_CONTRACT: ChannelLocks.wait_released
+    async def wait_released(self, handles: list[ChannelHandle], *, timeout_s: float) -> list[ChannelHandle]:
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        pending = [str(h) for h in handles]
+        done: set[str] = set()
+
+        # START_BLOCK_POLL_UNTIL_RELEASED
+        while True:
+            remote = [key for key in pending if key not in self._held]
+            if remote:
+                # Probe: a lock we can take is free; drop it at once so this run never becomes the owner.
+                rows = await self._fetch(_TRY_LOCK, remote)
+                freed = [row["handle"] for row in rows if row["locked"]]
+                if freed:
+                    await self._fetch(_UNLOCK, freed)
+                done.update(freed)
+                done.update(set(remote) - {row["handle"] for row in rows})
+            pending = [key for key in pending if key not in done]
+            left = deadline - time.monotonic()
+            if not pending or left <= 0:
+                break
+            waiters = [asyncio.ensure_future(self._held[key].wait()) for key in pending if key in self._held]
+            waiters.append(asyncio.ensure_future(asyncio.sleep(min(self._poll_interval_s, left))))
+            _, unfinished = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            for task in unfinished:
+                task.cancel()
+        # END_BLOCK_POLL_UNTIL_RELEASED
+
+        return [h for h in handles if str(h) in done]
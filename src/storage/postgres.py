@@ -1,5 +1,5 @@
 # FILE: src/storage/postgres.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Initialize PostgreSQL connection pool for repository layer.
 #   SCOPE: Wrap asyncpg pool creation with domain-specific error mapping.
@@ -12,7 +12,7 @@
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.1.0 - Made pool size configurable so multi-process deployments can bound total connections.
 # END_CHANGE_SUMMARY
 
 import asyncpg
@@ -22,15 +22,16 @@ from src.app.errors import StorageError
 
 # START_CONTRACT: create_pool
 #   PURPOSE: Create asyncpg pool from DSN and surface storage-level errors.
-#   INPUTS: { dsn: str }
+#   INPUTS: { dsn: str, max_size: int - connections held by this process }
 #   OUTPUTS: { asyncpg.Pool }
 #   SIDE_EFFECTS: opens DB connections
 #   LINKS: M-STORAGE-POOL, M-ERRORS
 # END_CONTRACT: create_pool
-async def create_pool(dsn: str) -> asyncpg.Pool:
+async def create_pool(dsn: str, *, max_size: int = 10) -> asyncpg.Pool:
     try:
         # START_BLOCK_CREATE_ASYNCPG_POOL
-        return await asyncpg.create_pool(dsn)
+        max_size = max(1, max_size)
+        return await asyncpg.create_pool(dsn, min_size=min(10, max_size), max_size=max_size)
         # END_BLOCK_CREATE_ASYNCPG_POOL
     except Exception as e:
         raise StorageError(str(e)) from e
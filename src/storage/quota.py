@@ -0,0 +1,66 @@
+# FILE: src/storage/quota.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Persist per-user command token buckets so admission limits survive restarts and are shared by all processes.
+#   SCOPE: Atomic refill-and-take on one user_quota_buckets row under a row lock.
+#   DEPENDS: M-ERRORS
+#   LINKS: docs/knowledge-graph.xml#M-STORAGE-QUOTA
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   take_quota_tokens — Refill a user's bucket for elapsed time and debit cost if enough tokens remain.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added Postgres-backed per-user quota buckets.
+# END_CHANGE_SUMMARY
+
+import asyncpg
+
+from src.app.errors import StorageError
+
+# New buckets start full; ON CONFLICT DO UPDATE both locks an existing row and returns it.
+_LOCK_BUCKET = """
+    INSERT INTO user_quota_buckets AS b (tg_user_id, command, tokens, refilled_at)
+    VALUES($1, $2, $3, NOW())
+    ON CONFLICT (tg_user_id, command) DO UPDATE SET tokens = b.tokens
+    RETURNING b.tokens, EXTRACT(EPOCH FROM (NOW() - b.refilled_at))::float8 AS elapsed_s;
+"""
+
+_STORE_BUCKET = """
+    UPDATE user_quota_buckets
+    SET tokens = $3, refilled_at = NOW()
+    WHERE tg_user_id = $1 AND command = $2;
+"""
+
+
+# START_CONTRACT: take_quota_tokens
+#   PURPOSE: Refill one bucket by elapsed time (capped at capacity) and debit cost when it fits, in one transaction.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, command: str, cost: float, capacity: float, refill_per_s: float }
+#   OUTPUTS: { tuple[bool, float] - (granted, tokens left after the decision) }
+#   SIDE_EFFECTS: inserts/updates user_quota_buckets
+#   LINKS: M-STORAGE-QUOTA, M-ERRORS
+# END_CONTRACT: take_quota_tokens
+async def take_quota_tokens(
+    pool: asyncpg.Pool,
+    tg_user_id: int,
+    command: str,
+    *,
+    cost: float,
+    capacity: float,
+    refill_per_s: float,
+) -> tuple[bool, float]:
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # START_BLOCK_REFILL_AND_DEBIT_LOCKED_BUCKET
+                row = await conn.fetchrow(_LOCK_BUCKET, tg_user_id, command, float(capacity))
+                tokens = min(capacity, float(row["tokens"]) + max(0.0, float(row["elapsed_s"])) * refill_per_s)
+                granted = tokens >= cost
+                if granted:
+                    tokens -= cost
+                await conn.execute(_STORE_BUCKET, tg_user_id, command, tokens)
+                return granted, tokens
+                # END_BLOCK_REFILL_AND_DEBIT_LOCKED_BUCKET
+    except Exception as e:
+        raise StorageError(str(e)) from e
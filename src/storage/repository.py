@@ -1,9 +1,9 @@
 # FILE: src/storage/repository.py
-# VERSION: 1.0.0
+# VERSION: 1.5.0
 # START_MODULE_CONTRACT
-#   PURPOSE: Provide repository-level persistence and retrieval operations for users, channels, and posts.
+#   PURPOSE: Provide repository-level persistence and retrieval operations for users, channels, posts, channel summaries, and learned boilerplate state.
 #   SCOPE: Encapsulate asyncpg SQL access with domain error mapping and typed domain outputs.
-#   DEPENDS: M-ERRORS, M-DOMAIN-TYPES, M-DOMAIN-DTO
+#   DEPENDS: M-ERRORS, M-DOMAIN-TYPES, M-DOMAIN-DTO, M-APP-TRACING
 #   LINKS: docs/development-plan.xml#M-STORAGE-REPO, docs/knowledge-graph.xml#M-STORAGE-REPO
 # END_MODULE_CONTRACT
 #
@@ -11,21 +11,29 @@
 #   ensure_user — Ensure user row exists for Telegram user id.
 #   list_user_channels — Return user's channel handles ordered by handle.
 #   add_channels_for_user — Upsert channels and user relations under per-user limits.
+#   add_channels_bulk — Set-based channel and relation insert for large imports.
 #   remove_channel_for_user — Delete one channel relation for a Telegram user.
 #   upsert_posts — Idempotently insert channel posts and report inserted/skipped counts.
 #   get_last_posts — Read latest stored posts for a channel and return chronological order.
+#   get_refreshed_channels — Channels whose posts were stored after a given time.
+#   get_channel_summaries — Read last stored summaries for several channels.
+#   save_channel_summary — Upsert the last summary for a channel with covered post ids.
+#   get_boilerplate_states — Read persisted boilerplate model state for several channels.
+#   save_boilerplate_state — Upsert boilerplate model state for a channel.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.5.0 - Stamped channels.posts_refreshed_at on post upsert; added get_refreshed_channels.
 # END_CHANGE_SUMMARY
 
+import json
 from datetime import datetime
 
 import asyncpg
 
 from src.app.errors import StorageError, ValidationError
-from src.domain.dto import PostDTO
+from src.app.tracing import traced
+from src.domain.dto import PostDTO, StoredSummaryDTO
 from src.domain.types import ChannelHandle
 
 
@@ -36,6 +44,7 @@ from src.domain.types import ChannelHandle
 #   SIDE_EFFECTS: insert/update users table
 #   LINKS: M-STORAGE-REPO, M-ERRORS
 # END_CONTRACT: ensure_user
+@traced("repository.ensure_user")
 async def ensure_user(pool: asyncpg.Pool, tg_user_id: int) -> int:
     query = """
         INSERT INTO users(tg_user_id)
@@ -58,6 +67,7 @@ async def ensure_user(pool: asyncpg.Pool, tg_user_id: int) -> int:
 #   SIDE_EFFECTS: none
 #   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES
 # END_CONTRACT: list_user_channels
+@traced("repository.list_user_channels")
 async def list_user_channels(pool: asyncpg.Pool, tg_user_id: int) -> list[ChannelHandle]:
     query = """
         SELECT c.handle
@@ -83,6 +93,7 @@ async def list_user_channels(pool: asyncpg.Pool, tg_user_id: int) -> list[Channe
 #   SIDE_EFFECTS: writes users/channels/user_channels tables
 #   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES, M-ERRORS
 # END_CONTRACT: add_channels_for_user
+@traced("repository.add_channels_for_user")
 async def add_channels_for_user(
     pool: asyncpg.Pool,
     tg_user_id: int,
@@ -154,6 +165,81 @@ async def add_channels_for_user(
         raise StorageError(str(e)) from e
 
 
+# START_CONTRACT: add_channels_bulk
+#   PURPOSE: Add many channels to a user's list with one statement per table, counting existing relations against max_per_user.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, handles: list[ChannelHandle] - deduplicated, max_per_user: int }
+#   OUTPUTS: { tuple[list[ChannelHandle], list[ChannelHandle], list[ChannelHandle]] - added/already/rejected in input order }
+#   SIDE_EFFECTS: writes users/channels/user_channels tables; locks the user row for the transaction
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES, M-ERRORS
+# END_CONTRACT: add_channels_bulk
+@traced("repository.add_channels_bulk")
+async def add_channels_bulk(
+    pool: asyncpg.Pool,
+    tg_user_id: int,
+    handles: list[ChannelHandle],
+    *,
+    max_per_user: int = 200,
+) -> tuple[list[ChannelHandle], list[ChannelHandle], list[ChannelHandle]]:
+    if not handles:
+        return [], [], []
+    values = [str(h) for h in handles]
+    try:
+        user_id = await ensure_user(pool, tg_user_id)
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # START_BLOCK_LOCK_USER_AND_SPLIT_BY_CAPACITY
+                # The user row lock serializes concurrent imports so the capacity check holds.
+                await conn.execute("SELECT 1 FROM users WHERE id = $1 FOR UPDATE;", user_id)
+                current_count = int(await conn.fetchval("SELECT COUNT(*) FROM user_channels WHERE user_id = $1", user_id))
+                present = {
+                    row["handle"]
+                    for row in await conn.fetch(
+                        """
+                        SELECT c.handle
+                        FROM user_channels uc
+                        JOIN channels c ON c.id = uc.channel_id
+                        WHERE uc.user_id = $1 AND c.handle = ANY($2::text[]);
+                        """,
+                        user_id,
+                        values,
+                    )
+                }
+                fresh = [h for h in values if h not in present]
+                allowed_new = max(0, max_per_user - current_count)
+                process_now, rejected = fresh[:allowed_new], fresh[allowed_new:]
+                # END_BLOCK_LOCK_USER_AND_SPLIT_BY_CAPACITY
+
+                # START_BLOCK_INSERT_CHANNELS_AND_RELATIONS_SET_BASED
+                if process_now:
+                    await conn.execute(
+                        """
+                        INSERT INTO channels(handle)
+                        SELECT unnest($1::text[])
+                        ON CONFLICT (handle) DO NOTHING;
+                        """,
+                        process_now,
+                    )
+                    await conn.execute(
+                        """
+                        INSERT INTO user_channels(user_id, channel_id)
+                        SELECT $1, c.id FROM channels c
+                        WHERE c.handle = ANY($2::text[])
+                        ON CONFLICT (user_id, channel_id) DO NOTHING;
+                        """,
+                        user_id,
+                        process_now,
+                    )
+                # END_BLOCK_INSERT_CHANNELS_AND_RELATIONS_SET_BASED
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+    return (
+        [ChannelHandle(h) for h in process_now],
+        [ChannelHandle(h) for h in values if h in present],
+        [ChannelHandle(h) for h in rejected],
+    )
+
+
 # START_CONTRACT: remove_channel_for_user
 #   PURPOSE: Remove one user-channel relation by tg_user_id and handle.
 #   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, handle: ChannelHandle }
@@ -161,6 +247,7 @@ async def add_channels_for_user(
 #   SIDE_EFFECTS: deletes from user_channels table
 #   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES
 # END_CONTRACT: remove_channel_for_user
+@traced("repository.remove_channel_for_user")
 async def remove_channel_for_user(pool: asyncpg.Pool, tg_user_id: int, handle: ChannelHandle) -> bool:
     query = """
         DELETE FROM user_channels uc
@@ -187,6 +274,7 @@ async def remove_channel_for_user(pool: asyncpg.Pool, tg_user_id: int, handle: C
 #   SIDE_EFFECTS: writes channels/posts tables
 #   LINKS: M-STORAGE-REPO, M-DOMAIN-DTO, M-DOMAIN-TYPES
 # END_CONTRACT: upsert_posts
+@traced("repository.upsert_posts")
 async def upsert_posts(
     pool: asyncpg.Pool,
     channel_handle: ChannelHandle,
@@ -228,6 +316,12 @@ async def upsert_posts(
                     )
                     if inserted:
                         inserted_count += 1
+
+                # Refresh marker: lock waiters only adopt posts stored after their run started.
+                await conn.execute(
+                    "UPDATE channels SET posts_refreshed_at = clock_timestamp() WHERE id = $1;",
+                    channel_id,
+                )
         # END_BLOCK_UPSERT_CHANNEL_AND_POST_ROWS
 
         skipped = len(posts) - inserted_count
@@ -243,6 +337,7 @@ async def upsert_posts(
 #   SIDE_EFFECTS: none
 #   LINKS: M-STORAGE-REPO, M-DOMAIN-DTO, M-DOMAIN-TYPES
 # END_CONTRACT: get_last_posts
+@traced("repository.get_last_posts")
 async def get_last_posts(pool: asyncpg.Pool, channel_handle: ChannelHandle, limit: int) -> list[PostDTO]:
     query = """
         SELECT c.handle, p.tg_msg_id, p.date, p.text, p.permalink
@@ -272,3 +367,152 @@ async def get_last_posts(pool: asyncpg.Pool, channel_handle: ChannelHandle, limi
         # END_BLOCK_RESTORE_CHRONOLOGICAL_ORDER
     except Exception as e:
         raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: get_refreshed_channels
+#   PURPOSE: Find channels whose posts were stored from a fresh fetch at or after a point in time.
+#   INPUTS: { pool: asyncpg.Pool, handles: list[ChannelHandle], since: datetime - timezone-aware }
+#   OUTPUTS: { set[str] - handles with posts_refreshed_at >= since }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES
+# END_CONTRACT: get_refreshed_channels
+@traced("repository.get_refreshed_channels")
+async def get_refreshed_channels(pool: asyncpg.Pool, handles: list[ChannelHandle], since: datetime) -> set[str]:
+    if not handles:
+        return set()
+    query = """
+        SELECT handle
+        FROM channels
+        WHERE handle = ANY($1::text[]) AND posts_refreshed_at >= $2;
+    """
+    try:
+        rows = await pool.fetch(query, [str(h) for h in handles], since)
+        return {row["handle"] for row in rows}
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: get_channel_summaries
+#   PURPOSE: Read last stored summaries for the given channels.
+#   INPUTS: { pool: asyncpg.Pool, handles: list[ChannelHandle] }
+#   OUTPUTS: { dict[str, StoredSummaryDTO] - keyed by channel handle; channels without a summary are absent }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-DTO, M-DOMAIN-TYPES
+# END_CONTRACT: get_channel_summaries
+@traced("repository.get_channel_summaries")
+async def get_channel_summaries(pool: asyncpg.Pool, handles: list[ChannelHandle]) -> dict[str, StoredSummaryDTO]:
+    if not handles:
+        return {}
+    query = """
+        SELECT c.handle, s.summary_text, s.post_ids, s.updated_at
+        FROM channel_summaries s
+        JOIN channels c ON c.id = s.channel_id
+        WHERE c.handle = ANY($1::text[]);
+    """
+    try:
+        # START_BLOCK_FETCH_AND_CAST_STORED_SUMMARIES
+        rows = await pool.fetch(query, [str(h) for h in handles])
+        return {
+            row["handle"]: StoredSummaryDTO(
+                channel_handle=ChannelHandle(row["handle"]),
+                summary_text=row["summary_text"],
+                post_ids=[int(v) for v in row["post_ids"]],
+                updated_at=row["updated_at"],
+            )
+            for row in rows
+        }
+        # END_BLOCK_FETCH_AND_CAST_STORED_SUMMARIES
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: save_channel_summary
+#   PURPOSE: Upsert the last summary for one channel together with the post ids it covers.
+#   INPUTS: { pool: asyncpg.Pool, channel_handle: ChannelHandle, summary_text: str, post_ids: list[int] }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: writes channels/channel_summaries tables
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES
+# END_CONTRACT: save_channel_summary
+@traced("repository.save_channel_summary")
+async def save_channel_summary(
+    pool: asyncpg.Pool,
+    channel_handle: ChannelHandle,
+    summary_text: str,
+    post_ids: list[int],
+) -> None:
+    query = """
+        WITH ch AS (
+            INSERT INTO channels(handle)
+            VALUES($1)
+            ON CONFLICT (handle) DO UPDATE SET handle = EXCLUDED.handle
+            RETURNING id
+        )
+        INSERT INTO channel_summaries(channel_id, summary_text, post_ids, updated_at)
+        SELECT ch.id, $2, $3::bigint[], NOW() FROM ch
+        ON CONFLICT (channel_id) DO UPDATE
+        SET summary_text = EXCLUDED.summary_text,
+            post_ids = EXCLUDED.post_ids,
+            updated_at = EXCLUDED.updated_at;
+    """
+    try:
+        # START_BLOCK_UPSERT_CHANNEL_SUMMARY_ROW
+        await pool.execute(query, str(channel_handle), summary_text, post_ids)
+        # END_BLOCK_UPSERT_CHANNEL_SUMMARY_ROW
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: get_boilerplate_states
+#   PURPOSE: Read persisted boilerplate model state for the given channels.
+#   INPUTS: { pool: asyncpg.Pool, handles: list[ChannelHandle] }
+#   OUTPUTS: { dict[str, dict] - state keyed by channel handle; channels without state are absent }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES, M-TRANSFORM-BOILERPLATE
+# END_CONTRACT: get_boilerplate_states
+@traced("repository.get_boilerplate_states")
+async def get_boilerplate_states(pool: asyncpg.Pool, handles: list[ChannelHandle]) -> dict[str, dict]:
+    if not handles:
+        return {}
+    query = """
+        SELECT c.handle, b.state
+        FROM channel_boilerplate b
+        JOIN channels c ON c.id = b.channel_id
+        WHERE c.handle = ANY($1::text[]);
+    """
+    try:
+        # START_BLOCK_FETCH_AND_DECODE_BOILERPLATE_STATES
+        rows = await pool.fetch(query, [str(h) for h in handles])
+        return {row["handle"]: json.loads(row["state"]) for row in rows}
+        # END_BLOCK_FETCH_AND_DECODE_BOILERPLATE_STATES
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: save_boilerplate_state
+#   PURPOSE: Upsert learned boilerplate model state for one channel.
+#   INPUTS: { pool: asyncpg.Pool, channel_handle: ChannelHandle, state: dict - JSON-serializable }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: writes channels/channel_boilerplate tables
+#   LINKS: M-STORAGE-REPO, M-DOMAIN-TYPES, M-TRANSFORM-BOILERPLATE
+# END_CONTRACT: save_boilerplate_state
+@traced("repository.save_boilerplate_state")
+async def save_boilerplate_state(pool: asyncpg.Pool, channel_handle: ChannelHandle, state: dict) -> None:
+    query = """
+        WITH ch AS (
+            INSERT INTO channels(handle)
+            VALUES($1)
+            ON CONFLICT (handle) DO UPDATE SET handle = EXCLUDED.handle
+            RETURNING id
+        )
+        INSERT INTO channel_boilerplate(channel_id, state, updated_at)
+        SELECT ch.id, $2::jsonb, NOW() FROM ch
+        ON CONFLICT (channel_id) DO UPDATE
+        SET state = EXCLUDED.state,
+            updated_at = EXCLUDED.updated_at;
+    """
+    try:
+        # START_BLOCK_UPSERT_BOILERPLATE_STATE_ROW
+        await pool.execute(query, str(channel_handle), json.dumps(state, ensure_ascii=False))
+        # END_BLOCK_UPSERT_BOILERPLATE_STATE_ROW
+    except Exception as e:
+        raise StorageError(str(e)) from e
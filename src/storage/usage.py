@@ -0,0 +1,302 @@
+# FILE: src/storage/usage.py
+# VERSION: 1.1.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Persist LLM call usage and digest run timings off the request path and expose cost/latency aggregates.
+#   SCOPE: Buffered background writer with batched executemany flushes; aggregate queries per user and per channel.
+#   DEPENDS: M-ERRORS, M-DOMAIN-DTO
+#   LINKS: docs/knowledge-graph.xml#M-STORAGE-USAGE
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   UsageRecorder — Non-blocking buffer of usage records flushed to Postgres in batches.
+#   get_usage_by_channel — Aggregate LLM cost and latency per channel for one user.
+#   get_usage_by_user — Aggregate LLM cost and latency per user.
+#   get_prompt_cache_stats — Aggregate cached prompt tokens and time to first token per prompt version.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.0 - Stored prompt version and time to first token; added prompt cache stats query.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+from datetime import datetime
+
+import asyncpg
+
+from src.app.errors import StorageError
+from src.domain.dto import DigestRunRecord, LLMCallRecord, PromptCacheStatsDTO, UsageStatsDTO
+
+logger = logging.getLogger(__name__)
+
+_INSERT_CALL = """
+    INSERT INTO llm_calls(
+        run_key, tg_user_id, channel_handle, kind, model, endpoint,
+        prompt_tokens, completion_tokens, cached_tokens, latency_ms, status, created_at,
+        prompt_version, ttft_ms
+    )
+    VALUES($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14);
+"""
+
+_INSERT_RUN = """
+    INSERT INTO digest_runs(run_key, tg_user_id, started_at, channels, extract_ms, summarize_ms, total_ms)
+    VALUES($1, $2, $3, $4, $5, $6, $7)
+    ON CONFLICT (run_key) DO NOTHING;
+"""
+
+
+class UsageRecorder:
+    # START_CONTRACT: UsageRecorder.__init__
+    #   PURPOSE: Configure buffer bounds and flush cadence.
+    #   INPUTS: { pool: asyncpg.Pool, flush_interval_s: float, max_batch: int - flush early at this size, max_buffer: int - drop beyond this }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-STORAGE-USAGE
+    # END_CONTRACT: UsageRecorder.__init__
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        *,
+        flush_interval_s: float = 2.0,
+        max_batch: int = 200,
+        max_buffer: int = 10000,
+    ) -> None:
+        self._pool = pool
+        self._flush_interval_s = flush_interval_s
+        self._max_batch = max(1, max_batch)
+        self._max_buffer = max(self._max_batch, max_buffer)
+        self._calls: list[LLMCallRecord] = []
+        self._runs: list[DigestRunRecord] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    # START_CONTRACT: UsageRecorder.record_call
+    #   PURPOSE: Buffer one LLM call record without awaiting I/O; drops and counts when the buffer is full.
+    #   INPUTS: { record: LLMCallRecord }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: mutates in-memory buffer; may wake the flusher
+    #   LINKS: M-STORAGE-USAGE, M-DOMAIN-DTO
+    # END_CONTRACT: UsageRecorder.record_call
+    def record_call(self, record: LLMCallRecord) -> None:
+        if len(self._calls) >= self._max_buffer:
+            self.dropped += 1
+            return
+        self._calls.append(record)
+        if len(self._calls) >= self._max_batch:
+            self._wakeup.set()
+
+    def record_run(self, record: DigestRunRecord) -> None:
+        if len(self._runs) >= self._max_buffer:
+            self.dropped += 1
+            return
+        self._runs.append(record)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    # START_CONTRACT: UsageRecorder.aclose
+    #   PURPOSE: Stop the background flusher and write remaining buffered records.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: writes digest_runs/llm_calls tables
+    #   LINKS: M-STORAGE-USAGE
+    # END_CONTRACT: UsageRecorder.aclose
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        # START_BLOCK_PERIODIC_FLUSH_LOOP
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+        # END_BLOCK_PERIODIC_FLUSH_LOOP
+
+    # START_CONTRACT: UsageRecorder.flush
+    #   PURPOSE: Write all buffered records in one transaction with executemany; failures are logged and the batch is discarded.
+    #   INPUTS: {}
+    #   OUTPUTS: { int - number of records written }
+    #   SIDE_EFFECTS: writes digest_runs/llm_calls tables
+    #   LINKS: M-STORAGE-USAGE
+    # END_CONTRACT: UsageRecorder.flush
+    async def flush(self) -> int:
+        # START_BLOCK_SWAP_BUFFERS
+        calls, self._calls = self._calls, []
+        runs, self._runs = self._runs, []
+        if not calls and not runs:
+            return 0
+        # END_BLOCK_SWAP_BUFFERS
+
+        # START_BLOCK_WRITE_BATCH
+        try:
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    if runs:
+                        await conn.executemany(
+                            _INSERT_RUN,
+                            [
+                                (r.run_key, r.tg_user_id, r.started_at, r.channels, r.extract_ms, r.summarize_ms, r.total_ms)
+                                for r in runs
+                            ],
+                        )
+                    if calls:
+                        await conn.executemany(
+                            _INSERT_CALL,
+                            [
+                                (
+                                    c.run_key,
+                                    c.tg_user_id,
+                                    str(c.channel_handle) if c.channel_handle else None,
+                                    c.kind,
+                                    c.model,
+                                    c.endpoint,
+                                    c.prompt_tokens,
+                                    c.completion_tokens,
+                                    c.cached_tokens,
+                                    c.latency_ms,
+                                    c.status,
+                                    c.created_at,
+                                    c.prompt_version,
+                                    c.ttft_ms,
+                                )
+                                for c in calls
+                            ],
+                        )
+        except Exception:
+            logger.warning(
+                "[UsageRecorder][flush][WRITE_BATCH] dropped calls=%s runs=%s",
+                len(calls),
+                len(runs),
+                exc_info=True,
+            )
+            self.dropped += len(calls) + len(runs)
+            return 0
+        return len(calls) + len(runs)
+        # END_BLOCK_WRITE_BATCH
+
+
+_AGGREGATE_COLUMNS = """
+    COUNT(*) AS calls,
+    COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+    COALESCE(SUM(completion_tokens), 0) AS completion_tokens,
+    COALESCE(SUM(cached_tokens), 0) AS cached_tokens,
+    AVG(latency_ms) AS avg_latency_ms,
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY latency_ms) AS p95_latency_ms
+"""
+
+
+def _to_stats(row) -> UsageStatsDTO:
+    return UsageStatsDTO(
+        key=str(row["key"]),
+        calls=int(row["calls"]),
+        prompt_tokens=int(row["prompt_tokens"]),
+        completion_tokens=int(row["completion_tokens"]),
+        cached_tokens=int(row["cached_tokens"]),
+        avg_latency_ms=float(row["avg_latency_ms"] or 0),
+        p95_latency_ms=float(row["p95_latency_ms"] or 0),
+    )
+
+
+# START_CONTRACT: get_usage_by_channel
+#   PURPOSE: Aggregate LLM tokens and latency per channel for one user since a timestamp, most expensive first.
+#   INPUTS: { pool: asyncpg.Pool, tg_user_id: int, since: datetime, limit: int }
+#   OUTPUTS: { list[UsageStatsDTO] - key is channel handle, or `(batch)` for multi-channel calls }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-USAGE, M-DOMAIN-DTO
+# END_CONTRACT: get_usage_by_channel
+async def get_usage_by_channel(
+    pool: asyncpg.Pool,
+    tg_user_id: int,
+    since: datetime,
+    *,
+    limit: int = 50,
+) -> list[UsageStatsDTO]:
+    query = f"""
+        SELECT COALESCE(channel_handle, '(batch)') AS key, {_AGGREGATE_COLUMNS}
+        FROM llm_calls
+        WHERE tg_user_id = $1 AND created_at >= $2
+        GROUP BY 1
+        ORDER BY SUM(COALESCE(prompt_tokens, 0) + COALESCE(completion_tokens, 0)) DESC
+        LIMIT $3;
+    """
+    try:
+        # START_BLOCK_AGGREGATE_BY_CHANNEL
+        return [_to_stats(row) for row in await pool.fetch(query, tg_user_id, since, limit)]
+        # END_BLOCK_AGGREGATE_BY_CHANNEL
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: get_usage_by_user
+#   PURPOSE: Aggregate LLM tokens and latency per user since a timestamp, most expensive first.
+#   INPUTS: { pool: asyncpg.Pool, since: datetime, limit: int }
+#   OUTPUTS: { list[UsageStatsDTO] - key is tg_user_id }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-USAGE, M-DOMAIN-DTO
+# END_CONTRACT: get_usage_by_user
+async def get_usage_by_user(pool: asyncpg.Pool, since: datetime, *, limit: int = 50) -> list[UsageStatsDTO]:
+    query = f"""
+        SELECT tg_user_id AS key, {_AGGREGATE_COLUMNS}
+        FROM llm_calls
+        WHERE tg_user_id IS NOT NULL AND created_at >= $1
+        GROUP BY 1
+        ORDER BY SUM(COALESCE(prompt_tokens, 0) + COALESCE(completion_tokens, 0)) DESC
+        LIMIT $2;
+    """
+    try:
+        # START_BLOCK_AGGREGATE_BY_USER
+        return [_to_stats(row) for row in await pool.fetch(query, since, limit)]
+        # END_BLOCK_AGGREGATE_BY_USER
+    except Exception as e:
+        raise StorageError(str(e)) from e
+
+
+# START_CONTRACT: get_prompt_cache_stats
+#   PURPOSE: Compare prompt versions by cached prompt tokens and streamed time to first token since a timestamp.
+#   INPUTS: { pool: asyncpg.Pool, since: datetime }
+#   OUTPUTS: { list[PromptCacheStatsDTO] - newest prompt version first; ttft is None when no streamed calls were recorded }
+#   SIDE_EFFECTS: none
+#   LINKS: M-STORAGE-USAGE, M-DOMAIN-DTO
+# END_CONTRACT: get_prompt_cache_stats
+async def get_prompt_cache_stats(pool: asyncpg.Pool, since: datetime) -> list[PromptCacheStatsDTO]:
+    query = """
+        SELECT
+            prompt_version,
+            COUNT(*) AS calls,
+            COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+            COALESCE(SUM(cached_tokens), 0) AS cached_tokens,
+            AVG(ttft_ms) AS avg_ttft_ms,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY ttft_ms) AS p50_ttft_ms
+        FROM llm_calls
+        WHERE prompt_version IS NOT NULL AND status = 'ok' AND created_at >= $1
+        GROUP BY prompt_version
+        ORDER BY MAX(created_at) DESC;
+    """
+    try:
+        # START_BLOCK_AGGREGATE_BY_PROMPT_VERSION
+        return [
+            PromptCacheStatsDTO(
+                prompt_version=str(row["prompt_version"]),
+                calls=int(row["calls"]),
+                prompt_tokens=int(row["prompt_tokens"]),
+                cached_tokens=int(row["cached_tokens"]),
+                avg_ttft_ms=float(row["avg_ttft_ms"]) if row["avg_ttft_ms"] is not None else None,
+                p50_ttft_ms=float(row["p50_ttft_ms"]) if row["p50_ttft_ms"] is not None else None,
+            )
+            for row in await pool.fetch(query, since)
+        ]
+        # END_BLOCK_AGGREGATE_BY_PROMPT_VERSION
+    except Exception as e:
+        raise StorageError(str(e)) from e
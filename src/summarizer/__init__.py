@@ -4,7 +4,7 @@
 #   PURPOSE: Declare summarizer package boundary for prompt and LLM adapter modules.
 #   SCOPE: Namespace marker for summarizer submodules; contains no runtime logic.
 #   DEPENDS: none
-#   LINKS: docs/knowledge-graph.xml#M-SUMMARIZER-PROMPTS, docs/knowledge-graph.xml#M-SUMMARIZER-LLM
+#   LINKS: docs/knowledge-graph.xml#M-SUMMARIZER-PROMPTS, docs/knowledge-graph.xml#M-SUMMARIZER-TOKENS, docs/knowledge-graph.xml#M-SUMMARIZER-LLM
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
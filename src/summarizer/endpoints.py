@@ -0,0 +1,351 @@
+# FILE: src/summarizer/endpoints.py
+# VERSION: 1.1.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Route LLM calls across a pool of endpoints with health tracking, circuit breaking, jittered retries, and hedged requests.
+#   SCOPE: Client-agnostic endpoint selection and call orchestration; the caller supplies per-endpoint clients and a retryable-error predicate.
+#   DEPENDS: M-ERRORS
+#   LINKS: docs/knowledge-graph.xml#M-SUMMARIZER-ENDPOINTS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   CircuitBreaker — Closed/open/half-open breaker over consecutive retryable failures.
+#   Endpoint — One LLM endpoint: client handle, breaker, latency window, in-flight count.
+#   EndpointPool — Picks healthy endpoints and runs calls with retries and latency-percentile hedging.
+#   parse_endpoints — Parse `url|key,url|key` endpoint spec into (base_url, api_key) pairs.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.0 - Let callers admit the hedged second request through their own limiter.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import AbstractAsyncContextManager
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from src.app.errors import SummarizeError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+C = TypeVar("C")
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    # START_CONTRACT: CircuitBreaker.__init__
+    #   PURPOSE: Configure breaker thresholds.
+    #   INPUTS: { failure_threshold: int - consecutive failures that open the breaker, reset_timeout_s: float - open duration before a trial call, clock: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: CircuitBreaker.__init__
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.state = BREAKER_CLOSED
+
+    # START_CONTRACT: CircuitBreaker.allow
+    #   PURPOSE: Decide whether a call may be sent; after the open timeout admits exactly one half-open trial.
+    #   INPUTS: {}
+    #   OUTPUTS: { bool }
+    #   SIDE_EFFECTS: may move open -> half_open and reserve the trial slot
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: CircuitBreaker.allow
+    def allow(self) -> bool:
+        # START_BLOCK_EVALUATE_BREAKER_STATE
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN:
+            if self._clock() - self._opened_at < self._reset_timeout_s:
+                return False
+            self.state = BREAKER_HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+        # END_BLOCK_EVALUATE_BREAKER_STATE
+
+    def available(self) -> bool:
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN:
+            return self._clock() - self._opened_at >= self._reset_timeout_s
+        return not self._trial_in_flight
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        self.state = BREAKER_CLOSED
+
+    def record_failure(self) -> None:
+        # START_BLOCK_COUNT_FAILURE_AND_MAYBE_OPEN
+        self._failures += 1
+        self._trial_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self._failures >= self._failure_threshold:
+            self.state = BREAKER_OPEN
+            self._opened_at = self._clock()
+        # END_BLOCK_COUNT_FAILURE_AND_MAYBE_OPEN
+
+    def release(self) -> None:
+        self._trial_in_flight = False
+
+
+class Endpoint(Generic[C]):
+    # START_CONTRACT: Endpoint.__init__
+    #   PURPOSE: Hold one endpoint's client and health state.
+    #   INPUTS: { name: str, client: C, breaker: CircuitBreaker, latency_window: int }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: Endpoint.__init__
+    def __init__(self, name: str, client: C, *, breaker: CircuitBreaker, latency_window: int = 128) -> None:
+        self.name = name
+        self.client = client
+        self.breaker = breaker
+        self.in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=max(1, latency_window))
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    # START_CONTRACT: Endpoint.latency_quantile
+    #   PURPOSE: Return the q-quantile of recent successful call latencies.
+    #   INPUTS: { q: float - 0..1 }
+    #   OUTPUTS: { float|None - seconds, None without samples }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: Endpoint.latency_quantile
+    def latency_quantile(self, q: float) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self) -> float:
+        median = self.latency_quantile(0.5)
+        return (median if median is not None else 0.0) * (1 + self.in_flight) + self.in_flight * 1e-3
+
+
+class EndpointPool(Generic[C]):
+    # START_CONTRACT: EndpointPool.__init__
+    #   PURPOSE: Configure routing, retry, and hedging policy over endpoints.
+    #   INPUTS: { endpoints: list[Endpoint], is_retryable: Callable[[BaseException], bool], max_attempts: int, backoff_base_s: float, backoff_max_s: float, hedge_quantile: float - 0 disables hedging, hedge_min_samples: int, rng: random.Random|None }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-ENDPOINTS, M-ERRORS
+    # END_CONTRACT: EndpointPool.__init__
+    def __init__(
+        self,
+        endpoints: list[Endpoint[C]],
+        *,
+        is_retryable: Callable[[BaseException], bool],
+        max_attempts: int = 3,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 8.0,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not endpoints:
+            raise ValidationError("endpoint pool is empty")
+        self.endpoints = endpoints
+        self._is_retryable = is_retryable
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_base_s = backoff_base_s
+        self._backoff_max_s = backoff_max_s
+        self._hedge_quantile = hedge_quantile
+        self._hedge_min_samples = max(1, hedge_min_samples)
+        self._rng = rng or random.Random()
+
+    # START_CONTRACT: EndpointPool.pick
+    #   PURPOSE: Choose the least-loaded fastest endpoint whose breaker admits a call.
+    #   INPUTS: { exclude: set[str] - endpoint names to skip }
+    #   OUTPUTS: { Endpoint|None }
+    #   SIDE_EFFECTS: may reserve a half-open trial slot on the chosen breaker
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: EndpointPool.pick
+    def pick(self, exclude: set[str] | frozenset[str] = frozenset()) -> Endpoint[C] | None:
+        candidates = [ep for ep in self.endpoints if ep.name not in exclude and ep.breaker.available()]
+        for ep in sorted(candidates, key=lambda e: e.score()):
+            if ep.breaker.allow():
+                return ep
+        return None
+
+    # START_CONTRACT: EndpointPool.call
+    #   PURPOSE: Run fn against pool endpoints with failover, jittered retries on retryable errors, and optional hedging.
+    #   INPUTS: { fn: Callable[[Endpoint], Awaitable[T]], hedge: bool - allow a hedged second request, hedge_admit: Callable[[], AbstractAsyncContextManager]|None - entered around the hedged request only, so it holds its own rate/concurrency slot }
+    #   OUTPUTS: { T - result of the first successful call }
+    #   SIDE_EFFECTS: network I/O via fn; updates endpoint health; raises last error or SummarizeError when no endpoint is healthy
+    #   LINKS: M-SUMMARIZER-ENDPOINTS, M-ERRORS
+    # END_CONTRACT: EndpointPool.call
+    async def call(
+        self,
+        fn: Callable[[Endpoint[C]], Awaitable[T]],
+        *,
+        hedge: bool = True,
+        hedge_admit: Callable[[], AbstractAsyncContextManager] | None = None,
+    ) -> T:
+        last_error: BaseException | None = None
+        tried: set[str] = set()
+        for attempt in range(self._max_attempts):
+            # START_BLOCK_PICK_ENDPOINT_WITH_FAILOVER
+            primary = self.pick(tried) or self.pick()
+            if primary is None:
+                if last_error is not None:
+                    raise last_error
+                raise SummarizeError("no healthy LLM endpoints")
+            tried.add(primary.name)
+            # END_BLOCK_PICK_ENDPOINT_WITH_FAILOVER
+
+            # START_BLOCK_RUN_ATTEMPT_AND_BACK_OFF
+            try:
+                if hedge:
+                    return await self._hedged(fn, primary, tried, hedge_admit)
+                return await self._run_on(primary, fn)
+            except Exception as e:
+                if not self._is_retryable(e):
+                    raise
+                last_error = e
+            if attempt + 1 < self._max_attempts:
+                delay = self._rng.uniform(0, min(self._backoff_max_s, self._backoff_base_s * (2**attempt)))
+                logger.warning(
+                    "[EndpointPool][call][RUN_ATTEMPT_AND_BACK_OFF] retryable failure endpoint=%s attempt=%s delay=%.2f error=%s",
+                    primary.name,
+                    attempt + 1,
+                    delay,
+                    last_error,
+                )
+                await asyncio.sleep(delay)
+            # END_BLOCK_RUN_ATTEMPT_AND_BACK_OFF
+        assert last_error is not None
+        raise last_error
+
+    async def _run_on(
+        self,
+        endpoint: Endpoint[C],
+        fn: Callable[[Endpoint[C]], Awaitable[T]],
+        admit: Callable[[], AbstractAsyncContextManager] | None = None,
+    ) -> T:
+        # START_BLOCK_TRACK_CALL_HEALTH
+        endpoint.in_flight += 1
+        started = time.monotonic()
+        try:
+            if admit is None:
+                result = await fn(endpoint)
+            else:
+                async with admit():
+                    started = time.monotonic()
+                    result = await fn(endpoint)
+        except asyncio.CancelledError:
+            endpoint.breaker.release()
+            raise
+        except Exception as e:
+            if self._is_retryable(e):
+                endpoint.breaker.record_failure()
+            else:
+                endpoint.breaker.release()
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.record_latency(time.monotonic() - started)
+        endpoint.breaker.record_success()
+        return result
+        # END_BLOCK_TRACK_CALL_HEALTH
+
+    # START_CONTRACT: EndpointPool._hedged
+    #   PURPOSE: Send to primary; if it outlives its latency quantile, also send to another endpoint and take whichever finishes first.
+    #   INPUTS: { fn: Callable[[Endpoint], Awaitable[T]], primary: Endpoint, tried: set[str] - updated with hedge endpoint, admit: Callable[[], AbstractAsyncContextManager]|None - wraps the hedge request }
+    #   OUTPUTS: { T }
+    #   SIDE_EFFECTS: cancels the losing request
+    #   LINKS: M-SUMMARIZER-ENDPOINTS
+    # END_CONTRACT: EndpointPool._hedged
+    async def _hedged(
+        self,
+        fn: Callable[[Endpoint[C]], Awaitable[T]],
+        primary: Endpoint[C],
+        tried: set[str],
+        admit: Callable[[], AbstractAsyncContextManager] | None = None,
+    ) -> T:
+        # START_BLOCK_WAIT_PRIMARY_UNTIL_HEDGE_DELAY
+        delay = None
+        if self._hedge_quantile > 0 and primary.samples >= self._hedge_min_samples and len(self.endpoints) > 1:
+            delay = primary.latency_quantile(self._hedge_quantile)
+        pending: set[asyncio.Task] = {asyncio.create_task(self._run_on(primary, fn))}
+        if delay is not None:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                backup = self.pick(tried | {primary.name})
+                if backup is not None:
+                    tried.add(backup.name)
+                    logger.info(
+                        "[EndpointPool][_hedged][WAIT_PRIMARY_UNTIL_HEDGE_DELAY] hedging primary=%s backup=%s after=%.2fs",
+                        primary.name,
+                        backup.name,
+                        delay,
+                    )
+                    pending.add(asyncio.create_task(self._run_on(backup, fn, admit)))
+            else:
+                pending = done
+        # END_BLOCK_WAIT_PRIMARY_UNTIL_HEDGE_DELAY
+
+        # START_BLOCK_TAKE_FIRST_SUCCESS
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        # END_BLOCK_TAKE_FIRST_SUCCESS
+
+
+# START_CONTRACT: parse_endpoints
+#   PURPOSE: Parse endpoint spec `url|key,url|key`; entries without a key reuse default_key.
+#   INPUTS: { spec: str, default_key: str }
+#   OUTPUTS: { list[tuple[str, str]] - (base_url, api_key) pairs }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-ENDPOINTS, M-ERRORS
+# END_CONTRACT: parse_endpoints
+def parse_endpoints(spec: str, default_key: str = "") -> list[tuple[str, str]]:
+    pairs: list[tuple[str, str]] = []
+    for raw in (spec or "").split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        url, _, key = raw.partition("|")
+        url, key = url.strip(), key.strip() or default_key
+        if not url or not key:
+            raise ValidationError(f"Invalid LLM endpoint entry: {raw}")
+        pairs.append((url, key))
+    return pairs
+
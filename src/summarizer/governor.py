@@ -0,0 +1,180 @@
+# FILE: src/summarizer/governor.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Admit LLM calls under provider RPM/TPM quotas and an adaptive in-flight concurrency limit.
+#   SCOPE: Token-bucket reservation of estimated tokens with post-call reconciliation; AIMD concurrency from latency and throttle signals; FIFO queueing instead of failing.
+#   DEPENDS: none
+#   LINKS: docs/knowledge-graph.xml#M-SUMMARIZER-GOVERNOR
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   Reservation — Admission ticket holding reserved token estimate and start time.
+#   LLMGovernor — Queues calls until quota and concurrency allow, then adapts limits from outcomes.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added RPM/TPM budget governor with AIMD concurrency.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Reservation:
+    tokens: int
+    started_at: float
+
+
+class LLMGovernor:
+    # START_CONTRACT: LLMGovernor.__init__
+    #   PURPOSE: Configure quotas and AIMD bounds; rpm_limit/tpm_limit of 0 disable that quota, latency_target_s of 0 disables latency-driven decrease.
+    #   INPUTS: { rpm_limit: int, tpm_limit: int, max_concurrency: int, min_concurrency: int, latency_target_s: float, decrease_factor: float, clock: Callable[[], float] }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-GOVERNOR
+    # END_CONTRACT: LLMGovernor.__init__
+    def __init__(
+        self,
+        *,
+        rpm_limit: int = 0,
+        tpm_limit: int = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        latency_target_s: float = 0.0,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # START_BLOCK_INIT_BUCKETS_AND_LIMITS
+        self._rpm_limit = max(0, rpm_limit)
+        self._tpm_limit = max(0, tpm_limit)
+        self._requests = float(self._rpm_limit)
+        self._tokens = float(self._tpm_limit)
+        self._max_concurrency = max(1, max_concurrency)
+        self._min_concurrency = max(1, min(min_concurrency, self._max_concurrency))
+        self._limit = float(self._max_concurrency)
+        self._latency_target_s = latency_target_s
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._admission = asyncio.Lock()
+        self._changed = asyncio.Event()
+        # END_BLOCK_INIT_BUCKETS_AND_LIMITS
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._refilled_at)
+        self._refilled_at = now
+        if self._rpm_limit:
+            self._requests = min(float(self._rpm_limit), self._requests + elapsed * self._rpm_limit / 60.0)
+        if self._tpm_limit:
+            self._tokens = min(float(self._tpm_limit), self._tokens + elapsed * self._tpm_limit / 60.0)
+
+    def _admission_delay(self, need: int) -> float:
+        # START_BLOCK_COMPUTE_ADMISSION_DELAY
+        if self._in_flight >= int(self._limit):
+            return math.inf
+        delay = max(0.0, self._paused_until - self._clock())
+        if self._rpm_limit and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60.0 / self._rpm_limit)
+        if self._tpm_limit and self._tokens < need:
+            delay = max(delay, (need - self._tokens) * 60.0 / self._tpm_limit)
+        return delay
+        # END_BLOCK_COMPUTE_ADMISSION_DELAY
+
+    # START_CONTRACT: LLMGovernor.acquire
+    #   PURPOSE: Wait in FIFO order until a concurrency slot, one request, and the estimated tokens are available, then reserve them.
+    #   INPUTS: { estimated_tokens: int - prompt plus max completion tokens }
+    #   OUTPUTS: { Reservation }
+    #   SIDE_EFFECTS: debits RPM/TPM buckets and occupies a concurrency slot
+    #   LINKS: M-SUMMARIZER-GOVERNOR
+    # END_CONTRACT: LLMGovernor.acquire
+    async def acquire(self, estimated_tokens: int) -> Reservation:
+        need = min(max(0, estimated_tokens), self._tpm_limit) if self._tpm_limit else 0
+        async with self._admission:
+            # START_BLOCK_WAIT_FOR_QUOTA_AND_SLOT
+            while True:
+                self._refill()
+                delay = self._admission_delay(need)
+                if delay <= 0:
+                    break
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=None if math.isinf(delay) else delay)
+                except asyncio.TimeoutError:
+                    pass
+            # END_BLOCK_WAIT_FOR_QUOTA_AND_SLOT
+
+            # START_BLOCK_RESERVE_QUOTA_AND_SLOT
+            if self._rpm_limit:
+                self._requests -= 1
+            self._tokens -= need
+            self._in_flight += 1
+            return Reservation(tokens=need, started_at=self._clock())
+            # END_BLOCK_RESERVE_QUOTA_AND_SLOT
+
+    # START_CONTRACT: LLMGovernor.release
+    #   PURPOSE: Free the slot, reconcile reserved tokens with actual usage, and additively grow or latency-shrink the concurrency limit.
+    #   INPUTS: { reservation: Reservation, actual_tokens: int|None - provider-reported total tokens, succeeded: bool }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: adjusts TPM bucket and concurrency limit; wakes queued callers
+    #   LINKS: M-SUMMARIZER-GOVERNOR
+    # END_CONTRACT: LLMGovernor.release
+    def release(self, reservation: Reservation, *, actual_tokens: int | None = None, succeeded: bool = True) -> None:
+        # START_BLOCK_RECONCILE_TOKENS
+        self._in_flight = max(0, self._in_flight - 1)
+        if self._tpm_limit and actual_tokens is not None:
+            self._refill()
+            self._tokens = min(float(self._tpm_limit), self._tokens + reservation.tokens - actual_tokens)
+        # END_BLOCK_RECONCILE_TOKENS
+
+        # START_BLOCK_ADAPT_CONCURRENCY_AIMD
+        latency = self._clock() - reservation.started_at
+        if succeeded:
+            if self._latency_target_s and latency > self._latency_target_s:
+                self._decrease("latency")
+            else:
+                self._limit = min(float(self._max_concurrency), self._limit + 1.0 / max(1.0, self._limit))
+        # END_BLOCK_ADAPT_CONCURRENCY_AIMD
+        self._changed.set()
+
+    # START_CONTRACT: LLMGovernor.on_throttle
+    #   PURPOSE: React to a provider 429: multiplicatively shrink concurrency, drain the token bucket, and pause admissions.
+    #   INPUTS: { retry_after_s: float|None }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: adjusts limits and pauses new admissions
+    #   LINKS: M-SUMMARIZER-GOVERNOR
+    # END_CONTRACT: LLMGovernor.on_throttle
+    def on_throttle(self, retry_after_s: float | None = None) -> None:
+        self._decrease("throttle")
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after_s:
+            self._paused_until = max(self._paused_until, self._clock() + retry_after_s)
+        self._changed.set()
+
+    def _decrease(self, reason: str) -> None:
+        previous = int(self._limit)
+        self._limit = max(float(self._min_concurrency), self._limit * self._decrease_factor)
+        if int(self._limit) != previous:
+            logger.info(
+                "[LLMGovernor][_decrease][ADAPT_CONCURRENCY_AIMD] reason=%s limit=%s->%s",
+                reason,
+                previous,
+                int(self._limit),
+            )
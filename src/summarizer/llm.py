@@ -1,76 +1,845 @@
 # FILE: src/summarizer/llm.py
-# VERSION: 1.0.0
+# VERSION: 1.15.2
 # START_MODULE_CONTRACT
 #   PURPOSE: Provide OpenAI-backed channel summarization adapter.
-#   SCOPE: Build prompts, call Responses API, validate text output, and map exceptions to domain errors.
-#   DEPENDS: M-ERRORS, M-SUMMARIZER-PROMPTS, M-DOMAIN-TYPES, M-DOMAIN-DTO
+#   SCOPE: Build token-budgeted prompts, call Responses API through a multi-endpoint pool with failover and hedging, pack small channels into batched requests, map-reduce channels with many posts, update previous summaries incrementally, stream text deltas, retry with a smaller budget on context-length errors, validate text output, and map exceptions to domain errors.
+#   DEPENDS: M-ERRORS, M-SUMMARIZER-PROMPTS, M-SUMMARIZER-TOKENS, M-SUMMARIZER-ENDPOINTS, M-SUMMARIZER-GOVERNOR, M-DOMAIN-TYPES, M-DOMAIN-DTO, M-DOMAIN-USAGE, M-APP-TRACING, M-APP-METRICS
 #   LINKS: docs/development-plan.xml#M-SUMMARIZER-LLM, docs/knowledge-graph.xml#M-SUMMARIZER-LLM
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
-#   Summarizer — OpenAI adapter class for channel summary generation.
+#   SummaryRequest — Input bundle for one channel summary.
+#   DeltaCallback — Async callback receiving streamed text deltas.
+#   Summarizer — Async OpenAI adapter class for channel summary generation.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.15.2 - Sent channels whose prompt cannot fit the budget down the single path, where the error stays per channel.
 # END_CHANGE_SUMMARY
 
 import asyncio
+import logging
+import time
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 
-from openai import OpenAI
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from src.app.errors import SummarizeError, ValidationError
-from src.domain.dto import PostDTO
+from src.app.metrics import LLM_PROMPT_TOKENS, LLM_RATE_LIMITED
+from src.app.tracing import current_span, start_span, traced
+from src.domain.dto import ChannelSummaryDTO, LLMCallRecord, PostDTO
 from src.domain.types import ChannelHandle
+from src.domain.usage import bind_usage_scope, current_usage_scope
 
-from .prompts import build_summary_prompt
+from .prompts import (
+    PROMPT_VERSION,
+    BatchPromptSection,
+    build_batch_summary_prompt,
+    build_budgeted_summary_prompt,
+    build_incremental_summary_prompt,
+    build_map_summary_prompt,
+    build_reduce_summary_prompt,
+    parse_batch_summary_response,
+    split_posts_into_groups,
+)
+from .endpoints import CircuitBreaker, Endpoint, EndpointPool
+from .governor import LLMGovernor
+from .tokens import TokenCounter, build_token_counter
+
+logger = logging.getLogger(__name__)
+
+_CONTEXT_ERROR_MARKERS = (
+    "context length",
+    "context_length",
+    "maximum context",
+    "context window",
+    "too many tokens",
+    "prompt is too long",
+)
+_CONTEXT_RETRY_SHRINK = 0.7
+
+
+def _is_context_length_error(exc: BaseException | None) -> bool:
+    if exc is None:
+        return False
+    if getattr(exc, "code", None) == "context_length_exceeded":
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in _CONTEXT_ERROR_MARKERS)
+
+
+# 429 is not retried inside the endpoint pool: the retry would skip the governor's Retry-After pause and the
+# concurrency it just lowered. _request_text/_stream_deltas re-acquire through the governor instead.
+_RETRYABLE_STATUS = {408, 409}
+
+
+def _retry_after_s(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _usage_tokens(resp) -> int | None:
+    usage = getattr(resp, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return int(total) if total is not None else None
+
+
+def _usage_breakdown(resp) -> tuple[int | None, int | None, int | None]:
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return None, None, None
+    details = getattr(usage, "input_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    return usage.input_tokens, usage.output_tokens, cached
+
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in _RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+DeltaCallback = Callable[[str], Awaitable[None]]
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SummaryRequest:
+    channel_handle: ChannelHandle
+    channel_link: str
+    posts: list[PostDTO]
+    previous_summary: str | None = None
+    new_posts: list[PostDTO] | None = None
 
 
 class Summarizer:
     # START_CONTRACT: Summarizer.__init__
-    #   PURPOSE: Initialize OpenAI client wrapper with configured API key and model.
-    #   INPUTS: { api_key: str, model: str, base_url: str }
+    #   PURPOSE: Initialize async OpenAI clients for every endpoint over one explicitly sized HTTP keep-alive pool.
+    #   INPUTS: { api_key: str, model: str, base_url: str, endpoints: list[tuple[str, str]]|None - extra (base_url, api_key) pairs tried after base_url, max_concurrency: int, max_connections: int, max_keepalive_connections: int, keepalive_expiry_s: float, connect_timeout_s: float, request_timeout_s: float, batch_token_budget: int, batch_small_channel_tokens: int, batch_max_channels: int, token_counter: TokenCounter|None, prompt_budget_tokens: int, max_output_tokens: int, context_retry_attempts: int, map_reduce_group_tokens: int - 0 disables map-reduce, retry_attempts: int, retry_backoff_s: float, hedge_quantile: float, breaker_failures: int, breaker_reset_s: float, rpm_limit: int, tpm_limit: int, min_concurrency: int, latency_target_s: float, usage_sink: Callable[[LLMCallRecord], None]|None }
     #   OUTPUTS: { None }
-    #   SIDE_EFFECTS: creates OpenAI client instance
+    #   SIDE_EFFECTS: creates AsyncOpenAI clients and shared httpx connection pool (no network I/O yet)
     #   LINKS: M-SUMMARIZER-LLM
     # END_CONTRACT: Summarizer.__init__
-    def __init__(self, api_key: str, model: str, base_url: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str,
+        *,
+        endpoints: list[tuple[str, str]] | None = None,
+        max_concurrency: int = 8,
+        max_connections: int = 16,
+        max_keepalive_connections: int = 8,
+        keepalive_expiry_s: float = 60.0,
+        connect_timeout_s: float = 5.0,
+        request_timeout_s: float = 120.0,
+        batch_token_budget: int = 0,
+        batch_small_channel_tokens: int = 600,
+        batch_max_channels: int = 8,
+        token_counter: TokenCounter | None = None,
+        prompt_budget_tokens: int = 6000,
+        max_output_tokens: int = 1024,
+        context_retry_attempts: int = 2,
+        map_reduce_group_tokens: int = 0,
+        retry_attempts: int = 3,
+        retry_backoff_s: float = 0.5,
+        hedge_quantile: float = 0.95,
+        breaker_failures: int = 5,
+        breaker_reset_s: float = 30.0,
+        rpm_limit: int = 0,
+        tpm_limit: int = 0,
+        min_concurrency: int = 1,
+        latency_target_s: float = 0.0,
+        usage_sink: Callable[[LLMCallRecord], None] | None = None,
+    ) -> None:
+        # START_BLOCK_VALIDATE_POOL_LIMITS
+        if max_concurrency < 1:
+            raise ValidationError("max_concurrency must be >= 1")
+        if max_connections < max_concurrency:
+            raise ValidationError("max_connections must be >= max_concurrency")
+        # END_BLOCK_VALIDATE_POOL_LIMITS
+
         # START_BLOCK_INIT_OPENAI_CLIENT
-        self._client = OpenAI(api_key=api_key, base_url=base_url)
+        self._http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(max_keepalive_connections, max_connections),
+                keepalive_expiry=keepalive_expiry_s,
+            ),
+            timeout=httpx.Timeout(request_timeout_s, connect=connect_timeout_s),
+        )
         self._model = model
+        self._max_concurrency = max_concurrency
+        self._governor = LLMGovernor(
+            rpm_limit=rpm_limit,
+            tpm_limit=tpm_limit,
+            max_concurrency=max_concurrency,
+            min_concurrency=min_concurrency,
+            latency_target_s=latency_target_s,
+        )
         # END_BLOCK_INIT_OPENAI_CLIENT
 
-    # START_CONTRACT: Summarizer.summarize_channel
-    #   PURPOSE: Summarize transformed channel posts into concise Russian digest text.
+        # START_BLOCK_INIT_ENDPOINT_POOL
+        targets = [(base_url, api_key)] + [(url, key) for url, key in endpoints or [] if url != base_url]
+        self._pool: EndpointPool[AsyncOpenAI] = EndpointPool(
+            [
+                Endpoint(
+                    f"{i}:{url}",
+                    AsyncOpenAI(api_key=key, base_url=url, http_client=self._http_client, max_retries=0),
+                    breaker=CircuitBreaker(failure_threshold=breaker_failures, reset_timeout_s=breaker_reset_s),
+                )
+                for i, (url, key) in enumerate(targets)
+            ],
+            is_retryable=_is_retryable_error,
+            max_attempts=retry_attempts,
+            backoff_base_s=retry_backoff_s,
+            hedge_quantile=hedge_quantile,
+        )
+        # END_BLOCK_INIT_ENDPOINT_POOL
+
+        self._usage_sink = usage_sink
+        self._rate_limit_attempts = max(1, retry_attempts)
+
+        # START_BLOCK_INIT_TOKEN_BUDGET_SETTINGS
+        self._counter = token_counter or build_token_counter("heuristic")
+        self._prompt_budget_tokens = prompt_budget_tokens
+        self._max_output_tokens = max_output_tokens
+        self._context_retry_attempts = max(0, context_retry_attempts)
+        self._map_reduce_group_tokens = min(max(0, map_reduce_group_tokens), prompt_budget_tokens)
+        # END_BLOCK_INIT_TOKEN_BUDGET_SETTINGS
+
+        # START_BLOCK_INIT_BATCHING_SETTINGS
+        self._batch_token_budget = min(max(0, batch_token_budget), prompt_budget_tokens)
+        self._batch_small_channel_tokens = min(batch_small_channel_tokens, self._batch_token_budget)
+        self._batch_max_channels = max(1, batch_max_channels)
+        # END_BLOCK_INIT_BATCHING_SETTINGS
+
+    # START_CONTRACT: Summarizer.warmup
+    #   PURPOSE: Pre-open keep-alive connections to every LLM endpoint so first summaries skip TCP/TLS setup.
+    #   INPUTS: { connections: int - number of parallel warm-up requests per endpoint }
+    #   OUTPUTS: { int - number of successful warm-up requests }
+    #   SIDE_EFFECTS: network I/O to models endpoint; failures are logged, never raised
+    #   LINKS: M-SUMMARIZER-LLM
+    # END_CONTRACT: Summarizer.warmup
+    async def warmup(self, connections: int = 1) -> int:
+        # START_BLOCK_OPEN_WARM_CONNECTIONS
+        count = max(1, min(connections, self._max_concurrency))
+        results = await asyncio.gather(
+            *[ep.client.models.list() for ep in self._pool.endpoints for _ in range(count)],
+            return_exceptions=True,
+        )
+        ok = sum(1 for r in results if not isinstance(r, BaseException))
+        count *= len(self._pool.endpoints)
+        if ok < count:
+            logger.warning(
+                "[Summarizer][warmup][OPEN_WARM_CONNECTIONS] warm-up incomplete ok=%s requested=%s",
+                ok,
+                count,
+            )
+        return ok
+        # END_BLOCK_OPEN_WARM_CONNECTIONS
+
+    # START_CONTRACT: Summarizer.aclose
+    #   PURPOSE: Close pooled HTTP connections held by the async client.
+    #   INPUTS: {}
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: closes httpx connection pool
+    #   LINKS: M-SUMMARIZER-LLM
+    # END_CONTRACT: Summarizer.aclose
+    async def aclose(self) -> None:
+        await self._http_client.aclose()
+
+    # START_CONTRACT: Summarizer._request_text
+    #   PURPOSE: Send one prompt under the governor's quota and concurrency limits and return non-empty output text, streaming deltas when a callback is given.
+    #   INPUTS: { prompt: str, on_delta: DeltaCallback|None }
+    #   OUTPUTS: { str - stripped output text }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API; awaits on_delta per streamed delta
+    #   LINKS: M-SUMMARIZER-LLM
+    # END_CONTRACT: Summarizer._request_text
+    @traced("llm.request")
+    async def _request_text(self, prompt: str, on_delta: DeltaCallback | None = None) -> str:
+        # START_BLOCK_ACCUMULATE_STREAMED_TEXT
+        if on_delta is not None:
+            parts: list[str] = []
+            # aclosing: a failing on_delta must not leave the stream and its governor slot open until GC.
+            async with aclosing(self._stream_deltas(prompt)) as deltas:
+                async for delta in deltas:
+                    parts.append(delta)
+                    await on_delta(delta)
+            return "".join(parts).strip()
+        # END_BLOCK_ACCUMULATE_STREAMED_TEXT
+
+        try:
+            # START_BLOCK_CALL_OPENAI_AND_VALIDATE_RESPONSE
+            for admission in range(self._rate_limit_attempts):
+                reservation = await self._governor.acquire(self._estimate_tokens(prompt))
+                resp = None
+                attempted: list[str] = []
+                started = time.monotonic()
+                try:
+                    endpoint, resp = await self._pool.call(
+                        lambda ep: self._call_endpoint(
+                            ep.name,
+                            ep.client.responses.create(
+                                model=self._model,
+                                input=prompt,
+                                max_output_tokens=self._max_output_tokens,
+                            ),
+                            attempted,
+                        ),
+                        hedge_admit=lambda: self._hedge_reservation(prompt),
+                    )
+                    break
+                except openai.RateLimitError:
+                    # Released below; the next acquire waits out Retry-After under the reduced limit.
+                    if admission + 1 >= self._rate_limit_attempts:
+                        raise
+                finally:
+                    self._governor.release(reservation, actual_tokens=_usage_tokens(resp), succeeded=resp is not None)
+                    self._record_usage(started, attempted, resp)
+            text = (resp.output_text or "").strip()
+            if not text:
+                raise SummarizeError("empty summary from LLM")
+            return text
+            # END_BLOCK_CALL_OPENAI_AND_VALIDATE_RESPONSE
+        except Exception as e:
+            raise SummarizeError(str(e)) from e
+
+    def _estimate_tokens(self, prompt: str) -> int:
+        return self._counter.count(prompt, cache=False) + self._max_output_tokens
+
+    @asynccontextmanager
+    async def _hedge_reservation(self, prompt: str) -> AsyncIterator[None]:
+        # The hedge is a second billed request: it needs its own slot and tokens. The estimate stays debited
+        # because a cancelled loser may still have been charged.
+        reservation = await self._governor.acquire(self._estimate_tokens(prompt))
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self._governor.release(reservation, succeeded=succeeded)
+
+    async def _call_endpoint(self, name: str, call: Awaitable[T], attempted: list[str]) -> tuple[str, T]:
+        attempted.append(name)
+        try:
+            return name, await call
+        except openai.RateLimitError as e:
+            LLM_RATE_LIMITED.inc(endpoint=name)
+            self._governor.on_throttle(_retry_after_s(e))
+            raise
+
+    # START_CONTRACT: Summarizer._record_usage
+    #   PURPOSE: Emit one LLMCallRecord for a finished call, attributed by the current usage scope and prompt version, and tag the current trace span with its usage; never raises.
+    #   INPUTS: { started: float - monotonic start, attempted: list[str] - endpoint names tried, resp: Response|None - None on failure, first_delta_at: float|None - monotonic time of first streamed delta }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: calls usage_sink
+    #   LINKS: M-SUMMARIZER-LLM, M-DOMAIN-USAGE, M-DOMAIN-DTO
+    # END_CONTRACT: Summarizer._record_usage
+    def _record_usage(self, started: float, attempted: list[str], resp, *, first_delta_at: float | None = None) -> None:
+        prompt_tokens, completion_tokens, cached_tokens = _usage_breakdown(resp)
+        current_span().set_attributes(
+            endpoint=attempted[-1] if attempted else None,
+            attempts=len(attempted),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            ttft_ms=int((first_delta_at - started) * 1000) if first_delta_at is not None else None,
+        )
+        # START_BLOCK_LOG_PREFIX_CACHE_HIT
+        if prompt_tokens:
+            LLM_PROMPT_TOKENS.inc(cached_tokens or 0, cached="true")
+            LLM_PROMPT_TOKENS.inc(prompt_tokens - (cached_tokens or 0), cached="false")
+            logger.debug(
+                "[Summarizer][_record_usage][LOG_PREFIX_CACHE_HIT] prompt_version=%s prompt_tokens=%s cached_tokens=%s",
+                PROMPT_VERSION,
+                prompt_tokens,
+                cached_tokens or 0,
+            )
+        # END_BLOCK_LOG_PREFIX_CACHE_HIT
+        if self._usage_sink is None:
+            return
+        # START_BLOCK_BUILD_AND_EMIT_USAGE_RECORD
+        scope = current_usage_scope()
+        try:
+            self._usage_sink(
+                LLMCallRecord(
+                    run_key=scope.run_key,
+                    tg_user_id=scope.tg_user_id,
+                    channel_handle=scope.channel_handle,
+                    kind=scope.kind,
+                    model=self._model,
+                    endpoint=attempted[-1] if attempted else "",
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    cached_tokens=cached_tokens,
+                    latency_ms=int((time.monotonic() - started) * 1000),
+                    status="ok" if resp is not None else "error",
+                    created_at=datetime.now(timezone.utc),
+                    prompt_version=PROMPT_VERSION,
+                    ttft_ms=int((first_delta_at - started) * 1000) if first_delta_at is not None else None,
+                )
+            )
+        except Exception:
+            logger.warning("[Summarizer][_record_usage][BUILD_AND_EMIT_USAGE_RECORD] usage sink failed", exc_info=True)
+        # END_BLOCK_BUILD_AND_EMIT_USAGE_RECORD
+
+    # START_CONTRACT: Summarizer._stream_deltas
+    #   PURPOSE: Stream output text deltas for one prompt under the governor's quota and concurrency limits; a 429 on open is re-admitted through the governor.
+    #   INPUTS: { prompt: str }
+    #   OUTPUTS: { AsyncIterator[str] - text deltas in arrival order; consume under aclosing() so an abandoned stream frees its slot }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API (server-sent events); closes the HTTP stream and releases the reservation on completion, error, or aclose
+    #   LINKS: M-SUMMARIZER-LLM
+    # END_CONTRACT: Summarizer._stream_deltas
+    async def _stream_deltas(self, prompt: str) -> AsyncIterator[str]:
+        emitted = False
+        try:
+            # START_BLOCK_ITERATE_RESPONSE_EVENTS
+            for admission in range(self._rate_limit_attempts):
+                reservation = await self._governor.acquire(self._estimate_tokens(prompt))
+                completed = None
+                stream = None
+                attempted: list[str] = []
+                started = time.monotonic()
+                first_delta_at: float | None = None
+                # The finally also runs on aclose()/GeneratorExit at a yield, so the slot is never held by a dead consumer.
+                try:
+                    try:
+                        _, stream = await self._pool.call(
+                            lambda ep: self._call_endpoint(
+                                ep.name,
+                                ep.client.responses.create(
+                                    model=self._model,
+                                    input=prompt,
+                                    max_output_tokens=self._max_output_tokens,
+                                    stream=True,
+                                ),
+                                attempted,
+                            ),
+                            hedge=False,
+                        )
+                    except openai.RateLimitError:
+                        if admission + 1 >= self._rate_limit_attempts:
+                            raise
+                        continue
+                    async for event in stream:
+                        if event.type == "response.output_text.delta" and event.delta:
+                            first_delta_at = first_delta_at or time.monotonic()
+                            emitted = emitted or bool(event.delta.strip())
+                            yield event.delta
+                        elif event.type == "response.completed":
+                            completed = event.response
+                        elif event.type in ("response.failed", "error"):
+                            raise SummarizeError(f"stream failed: {getattr(event, 'message', event.type)}")
+                    break
+                finally:
+                    self._governor.release(reservation, actual_tokens=_usage_tokens(completed), succeeded=emitted)
+                    self._record_usage(started, attempted, completed, first_delta_at=first_delta_at)
+                    if stream is not None:
+                        await stream.close()
+            if not emitted:
+                raise SummarizeError("empty summary from LLM")
+            # END_BLOCK_ITERATE_RESPONSE_EVENTS
+        except Exception as e:
+            raise SummarizeError(str(e)) from e
+
+    # START_CONTRACT: Summarizer.stream_channel
+    #   PURPOSE: Stream a channel summary as text deltas so callers can render it before completion.
     #   INPUTS: { channel_handle: ChannelHandle, channel_link: str, posts: list[PostDTO] }
-    #   OUTPUTS: { str - non-empty summary text }
+    #   OUTPUTS: { AsyncIterator[str] - summary text deltas }
     #   SIDE_EFFECTS: network I/O to OpenAI Responses API
     #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS
+    # END_CONTRACT: Summarizer.stream_channel
+    async def stream_channel(
+        self,
+        channel_handle: ChannelHandle,
+        channel_link: str,
+        posts: list[PostDTO],
+    ) -> AsyncIterator[str]:
+        if not posts:
+            raise ValidationError("posts is empty")
+        built = build_budgeted_summary_prompt(
+            channel_handle,
+            channel_link,
+            posts,
+            counter=self._counter,
+            budget_tokens=self._prompt_budget_tokens,
+        )
+        async with aclosing(self._stream_deltas(built.prompt)) as deltas:
+            async for delta in deltas:
+                yield delta
+
+    # START_CONTRACT: Summarizer.summarize_channel
+    #   PURPOSE: Summarize transformed channel posts into concise Russian digest text within the prompt token budget.
+    #   INPUTS: { channel_handle: ChannelHandle, channel_link: str, posts: list[PostDTO], on_delta: DeltaCallback|None - enables streaming }
+    #   OUTPUTS: { str - non-empty summary text }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API; map-reduces channels larger than one map group; retries with smaller budget on context-length errors before any delta is emitted
+    #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS, M-SUMMARIZER-TOKENS
     # END_CONTRACT: Summarizer.summarize_channel
     async def summarize_channel(
         self,
         channel_handle: ChannelHandle,
         channel_link: str,
         posts: list[PostDTO],
+        *,
+        on_delta: DeltaCallback | None = None,
     ) -> str:
-        # START_BLOCK_VALIDATE_INPUT_AND_BUILD_PROMPT
+        # START_BLOCK_VALIDATE_INPUT
         if not posts:
             raise ValidationError("posts is empty")
+        budget = self._prompt_budget_tokens
+        streamed = False
+
+        async def _track(delta: str) -> None:
+            nonlocal streamed
+            streamed = True
+            await on_delta(delta)
+        # END_BLOCK_VALIDATE_INPUT
 
-        prompt = build_summary_prompt(channel_handle, channel_link, posts)
-        # END_BLOCK_VALIDATE_INPUT_AND_BUILD_PROMPT
+        # START_BLOCK_ROUTE_LARGE_CHANNELS_TO_MAP_REDUCE
+        if self._map_reduce_group_tokens and len(posts) > 1:
+            overhead = self._counter.count(
+                build_map_summary_prompt(channel_handle, channel_link, [], part=1, total=1),
+                cache=False,
+            )
+            groups = split_posts_into_groups(
+                posts,
+                counter=self._counter,
+                group_budget_tokens=max(1, self._map_reduce_group_tokens - overhead),
+            )
+            if len(groups) > 1:
+                return await self._map_reduce(channel_handle, channel_link, groups, on_delta)
+        # END_BLOCK_ROUTE_LARGE_CHANNELS_TO_MAP_REDUCE
+
+        # START_BLOCK_BUILD_PROMPT_AND_RETRY_ON_CONTEXT_OVERFLOW
+        for attempt in range(self._context_retry_attempts + 1):
+            built = build_budgeted_summary_prompt(
+                channel_handle,
+                channel_link,
+                posts,
+                counter=self._counter,
+                budget_tokens=budget,
+            )
+            try:
+                return await self._request_text(built.prompt, _track if on_delta is not None else None)
+            except SummarizeError as e:
+                if streamed or attempt >= self._context_retry_attempts or not _is_context_length_error(e.__cause__):
+                    raise
+                budget = int(min(budget, built.tokens) * _CONTEXT_RETRY_SHRINK)
+                logger.warning(
+                    "[Summarizer][summarize_channel][BUILD_PROMPT_AND_RETRY_ON_CONTEXT_OVERFLOW] "
+                    "context overflow handle=%s prompt_tokens=%s retry_budget=%s",
+                    str(channel_handle),
+                    built.tokens,
+                    budget,
+                )
+        raise SummarizeError("context budget retries exhausted")
+        # END_BLOCK_BUILD_PROMPT_AND_RETRY_ON_CONTEXT_OVERFLOW
 
+    # START_CONTRACT: Summarizer._map_reduce
+    #   PURPOSE: Summarize post groups concurrently (map), then merge partial summaries into the final digest (reduce).
+    #   INPUTS: { channel_handle: ChannelHandle, channel_link: str, groups: list[list[PostDTO]], on_delta: DeltaCallback|None - streams the final reduce only }
+    #   OUTPUTS: { str - final summary text }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API; tolerates partial map failures when at least one group succeeds
+    #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS
+    # END_CONTRACT: Summarizer._map_reduce
+    async def _map_reduce(
+        self,
+        channel_handle: ChannelHandle,
+        channel_link: str,
+        groups: list[list[PostDTO]],
+        on_delta: DeltaCallback | None = None,
+    ) -> str:
+        # START_BLOCK_MAP_GROUPS_CONCURRENTLY
+        total = len(groups)
+        with bind_usage_scope(kind="map"):
+            mapped = await asyncio.gather(
+                *[
+                    self._request_text(
+                        build_map_summary_prompt(channel_handle, channel_link, group, part=i + 1, total=total)
+                    )
+                    for i, group in enumerate(groups)
+                ],
+                return_exceptions=True,
+            )
+        partials = [r for r in mapped if isinstance(r, str)]
+        errors = [r for r in mapped if isinstance(r, BaseException)]
+        if not partials:
+            raise errors[0]
+        if errors:
+            logger.warning(
+                "[Summarizer][_map_reduce][MAP_GROUPS_CONCURRENTLY] partial map failure handle=%s failed=%s of=%s",
+                str(channel_handle),
+                len(errors),
+                total,
+            )
+        # END_BLOCK_MAP_GROUPS_CONCURRENTLY
+
+        # START_BLOCK_REDUCE_UNTIL_PROMPT_FITS
+        with bind_usage_scope(kind="reduce"):
+            return await self._reduce(channel_handle, channel_link, partials, on_delta)
+        # END_BLOCK_REDUCE_UNTIL_PROMPT_FITS
+
+    async def _reduce(
+        self,
+        channel_handle: ChannelHandle,
+        channel_link: str,
+        partials: list[str],
+        on_delta: DeltaCallback | None,
+    ) -> str:
+        # START_BLOCK_MERGE_PARTIALS_IN_ROUNDS
+        while True:
+            prompt = build_reduce_summary_prompt(channel_handle, channel_link, partials)
+            if len(partials) == 1 or self._counter.count(prompt, cache=False) <= self._prompt_budget_tokens:
+                return await self._request_text(prompt, on_delta)
+            chunks = self._group_partials(channel_handle, channel_link, partials)
+            merged = await asyncio.gather(
+                *[
+                    self._request_text(build_reduce_summary_prompt(channel_handle, channel_link, chunk, final=False))
+                    if len(chunk) > 1
+                    else _resolved(chunk[0])
+                    for chunk in chunks
+                ]
+            )
+            logger.info(
+                "[Summarizer][_reduce][MERGE_PARTIALS_IN_ROUNDS] intermediate reduce handle=%s partials=%s->%s",
+                str(channel_handle),
+                len(partials),
+                len(merged),
+            )
+            partials = list(merged)
+        # END_BLOCK_MERGE_PARTIALS_IN_ROUNDS
+
+    def _group_partials(
+        self,
+        channel_handle: ChannelHandle,
+        channel_link: str,
+        partials: list[str],
+    ) -> list[list[str]]:
+        # START_BLOCK_PACK_PARTIALS_INTO_REDUCE_CHUNKS
+        room = self._prompt_budget_tokens - self._counter.count(
+            build_reduce_summary_prompt(channel_handle, channel_link, [], final=False),
+            cache=False,
+        )
+        chunks: list[list[str]] = []
+        current: list[str] = []
+        used = 0
+        for text in partials:
+            cost = self._counter.count(text, cache=False) + 4
+            if current and used + cost > room:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(text)
+            used += cost
+        if current:
+            chunks.append(current)
+        if len(chunks) == len(partials):
+            # Guarantee progress when single partials are already near the budget.
+            chunks = [partials[i : i + 2] for i in range(0, len(partials), 2)]
+        return chunks
+        # END_BLOCK_PACK_PARTIALS_INTO_REDUCE_CHUNKS
+
+    # START_CONTRACT: Summarizer.summarize_channels
+    #   PURPOSE: Summarize many channels concurrently, packing small ones into token-budgeted batch requests; incremental requests always run singly.
+    #   INPUTS: { requests: list[SummaryRequest] - channels with non-empty post lists, on_delta: Callable[[ChannelHandle, str], Awaitable[None]]|None - streams single-channel requests, on_result: Callable[[int, ChannelSummaryDTO | SummarizeError], Awaitable[None]]|None - called with the request index as each result lands }
+    #   OUTPUTS: { list[ChannelSummaryDTO | SummarizeError] - one result per request in input order }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API; raises SummarizeError if a request got no result
+    #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS, M-DOMAIN-DTO
+    # END_CONTRACT: Summarizer.summarize_channels
+    async def summarize_channels(
+        self,
+        requests: list[SummaryRequest],
+        *,
+        on_delta: Callable[[ChannelHandle, str], Awaitable[None]] | None = None,
+        on_result: Callable[[int, ChannelSummaryDTO | SummarizeError], Awaitable[None]] | None = None,
+    ) -> list[ChannelSummaryDTO | SummarizeError]:
+        # START_BLOCK_PARTITION_SMALL_AND_LARGE_CHANNELS
+        results: list[ChannelSummaryDTO | SummarizeError | None] = [None] * len(requests)
+        small: list[tuple[int, int]] = []
+        large: list[int] = []
+        for idx, req in enumerate(requests):
+            if not req.posts:
+                raise ValidationError("posts is empty")
+            if req.previous_summary is not None:
+                large.append(idx)
+                continue
+            try:
+                cost = build_budgeted_summary_prompt(
+                    req.channel_handle,
+                    req.channel_link,
+                    req.posts,
+                    counter=self._counter,
+                    budget_tokens=self._prompt_budget_tokens,
+                ).tokens
+            except SummarizeError:
+                # The single path reports this as the channel's own error.
+                large.append(idx)
+                continue
+            if self._batch_token_budget and cost <= self._batch_small_channel_tokens:
+                small.append((idx, cost))
+            else:
+                large.append(idx)
+        # END_BLOCK_PARTITION_SMALL_AND_LARGE_CHANNELS
+
+        # START_BLOCK_PACK_SMALL_CHANNELS_BY_TOKEN_BUDGET
+        batches: list[list[int]] = []
+        current: list[int] = []
+        used = 0
+        for idx, cost in small:
+            if current and (used + cost > self._batch_token_budget or len(current) >= self._batch_max_channels):
+                batches.append(current)
+                current, used = [], 0
+            current.append(idx)
+            used += cost
+        if current:
+            batches.append(current)
+        # END_BLOCK_PACK_SMALL_CHANNELS_BY_TOKEN_BUDGET
+
+        # START_BLOCK_RUN_BATCHES_AND_SINGLES_CONCURRENTLY
+        async def _single(idx: int) -> None:
+            req = requests[idx]
+            forward = None
+            if on_delta is not None:
+                async def forward(delta: str) -> None:
+                    await on_delta(req.channel_handle, delta)
+            results[idx] = await self._summarize_request(req, forward)
+            if on_result is not None:
+                await on_result(idx, results[idx])
+
+        async def _batch(indices: list[int]) -> None:
+            if len(indices) == 1:
+                await _single(indices[0])
+                return
+            for idx, result in zip(indices, await self._summarize_batch([requests[i] for i in indices])):
+                results[idx] = result
+                if on_result is not None:
+                    await on_result(idx, result)
+
+        await asyncio.gather(*[_batch(b) for b in batches], *[_single(i) for i in large])
+        # Callers zip results with their requests; dropping a slot would shift every later summary.
+        missing = [str(requests[i].channel_handle) for i, r in enumerate(results) if r is None]
+        if missing:
+            raise SummarizeError(f"no summary result for channels: {', '.join(missing)}")
+        return results
+        # END_BLOCK_RUN_BATCHES_AND_SINGLES_CONCURRENTLY
+
+    async def _summarize_request(
+        self,
+        req: SummaryRequest,
+        on_delta: DeltaCallback | None = None,
+    ) -> ChannelSummaryDTO | SummarizeError:
+        with (
+            bind_usage_scope(channel_handle=req.channel_handle, kind="single"),
+            start_span("llm.summarize_channel", channel=str(req.channel_handle), posts=len(req.posts)),
+        ):
+            # START_BLOCK_TRY_INCREMENTAL_UPDATE
+            if req.previous_summary is not None and req.new_posts:
+                try:
+                    with bind_usage_scope(kind="incremental"):
+                        return _to_summary_dto(req, await self._summarize_incremental(req, on_delta))
+                except SummarizeError:
+                    logger.warning(
+                        "[Summarizer][_summarize_request][TRY_INCREMENTAL_UPDATE] incremental update failed handle=%s, running full summary",
+                        str(req.channel_handle),
+                        exc_info=True,
+                    )
+            # END_BLOCK_TRY_INCREMENTAL_UPDATE
+
+            try:
+                text = await self.summarize_channel(req.channel_handle, req.channel_link, req.posts, on_delta=on_delta)
+            except SummarizeError as e:
+                return e
+            return _to_summary_dto(req, text)
+
+    # START_CONTRACT: Summarizer._summarize_incremental
+    #   PURPOSE: Update the previous summary with only the new posts; refuse when the update prompt exceeds the prompt budget.
+    #   INPUTS: { req: SummaryRequest - with previous_summary and new_posts, on_delta: DeltaCallback|None }
+    #   OUTPUTS: { str - updated summary text }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API
+    #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS
+    # END_CONTRACT: Summarizer._summarize_incremental
+    async def _summarize_incremental(self, req: SummaryRequest, on_delta: DeltaCallback | None = None) -> str:
+        prompt = build_incremental_summary_prompt(
+            req.channel_handle,
+            req.channel_link,
+            req.previous_summary or "",
+            req.new_posts or [],
+        )
+        if self._counter.count(prompt, cache=False) > self._prompt_budget_tokens:
+            raise SummarizeError("incremental prompt exceeds token budget")
+        return await self._request_text(prompt, on_delta)
+
+    # START_CONTRACT: Summarizer._summarize_batch
+    #   PURPOSE: Summarize several channels in one request and fall back to per-channel calls for unparsed sections.
+    #   INPUTS: { batch: list[SummaryRequest] }
+    #   OUTPUTS: { list[ChannelSummaryDTO | SummarizeError] - one result per batch item in order }
+    #   SIDE_EFFECTS: network I/O to OpenAI Responses API
+    #   LINKS: M-SUMMARIZER-LLM, M-SUMMARIZER-PROMPTS
+    # END_CONTRACT: Summarizer._summarize_batch
+    async def _summarize_batch(self, batch: list[SummaryRequest]) -> list[ChannelSummaryDTO | SummarizeError]:
+        # START_BLOCK_REQUEST_AND_PARSE_BATCH
+        sections = [
+            BatchPromptSection(
+                section_id=f"C{i + 1}",
+                channel_handle=req.channel_handle,
+                channel_link=req.channel_link,
+                posts=req.posts,
+            )
+            for i, req in enumerate(batch)
+        ]
+        section_ids = [section.section_id for section in sections]
+        parsed: dict[str, str] = {}
         try:
-            # START_BLOCK_CALL_OPENAI_AND_VALIDATE_RESPONSE
-            resp = await asyncio.to_thread(
-                self._client.responses.create,
-                model=self._model,
-                input=prompt,
+            with (
+                bind_usage_scope(channel_handle=None, kind="batch"),
+                start_span("llm.summarize_batch", channels=len(batch)),
+            ):
+                raw = await self._request_text(build_batch_summary_prompt(sections))
+            parsed = parse_batch_summary_response(raw, section_ids)
+        except SummarizeError:
+            logger.warning(
+                "[Summarizer][_summarize_batch][REQUEST_AND_PARSE_BATCH] batch request failed channels=%s",
+                len(batch),
+                exc_info=True,
             )
-            text = (resp.output_text or "").strip()
-            if not text:
-                raise SummarizeError("empty summary from LLM")
-            return text
-            # END_BLOCK_CALL_OPENAI_AND_VALIDATE_RESPONSE
-        except Exception as e:
-            raise SummarizeError(str(e)) from e
+        # END_BLOCK_REQUEST_AND_PARSE_BATCH
+
+        # START_BLOCK_FALLBACK_FOR_UNPARSED_SECTIONS
+        missing = [i for i, section_id in enumerate(section_ids) if section_id not in parsed]
+        if missing:
+            logger.info(
+                "[Summarizer][_summarize_batch][FALLBACK_FOR_UNPARSED_SECTIONS] per-channel fallback missing=%s of=%s",
+                len(missing),
+                len(batch),
+            )
+        fallback = await asyncio.gather(*[self._summarize_request(batch[i]) for i in missing])
+        by_index = dict(zip(missing, fallback))
+        return [
+            by_index[i] if i in by_index else _to_summary_dto(req, parsed[section_ids[i]])
+            for i, req in enumerate(batch)
+        ]
+        # END_BLOCK_FALLBACK_FOR_UNPARSED_SECTIONS
+
+
+async def _resolved(text: str) -> str:
+    return text
+
+
+def _to_summary_dto(req: SummaryRequest, summary_text: str) -> ChannelSummaryDTO:
+    return ChannelSummaryDTO(
+        channel_handle=req.channel_handle,
+        channel_link=req.channel_link,
+        summary_text=summary_text,
+        post_links=[p.permalink for p in req.posts if p.permalink],
+    )
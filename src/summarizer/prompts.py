@@ -1,26 +1,126 @@
 # FILE: src/summarizer/prompts.py
-# VERSION: 1.0.0
+# VERSION: 1.5.1
 # START_MODULE_CONTRACT
-#   PURPOSE: Build deterministic Russian prompt template for channel summarization.
-#   SCOPE: Serialize channel context and transformed posts into one LLM input string.
-#   DEPENDS: M-DOMAIN-TYPES, M-DOMAIN-DTO
+#   PURPOSE: Build deterministic Russian prompt templates for channel summarization with a fixed, versioned instruction prefix.
+#   SCOPE: Serialize channel context and transformed posts into one LLM input string; fit posts into a token budget by priority; pack several channels into one delimited batch prompt and parse its structured output; split large channels into map groups and build map/reduce prompts; update a previous summary with new posts.
+#   DEPENDS: M-DOMAIN-TYPES, M-DOMAIN-DTO, M-SUMMARIZER-TOKENS, M-ERRORS
 #   LINKS: docs/development-plan.xml#M-SUMMARIZER-PROMPTS, docs/knowledge-graph.xml#M-SUMMARIZER-PROMPTS
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
+#   PROMPT_VERSION — Version of the instruction prefixes; bump on any instruction text change.
 #   build_summary_prompt — Construct LLM prompt for one channel from normalized post list.
+#   BudgetedPrompt — Prompt text with selected posts and its token count.
+#   build_budgeted_summary_prompt — Fill a token budget with newest/highest-value posts and build the prompt.
+#   BatchPromptSection — One channel section inside a batched prompt.
+#   build_batch_summary_prompt — Construct one prompt covering several delimited channel sections.
+#   parse_batch_summary_response — Split structured batch output into per-section summaries.
+#   split_posts_into_groups — Pack chronological posts into token-bounded map groups.
+#   build_map_summary_prompt — Construct prompt extracting key facts from one group of posts.
+#   build_reduce_summary_prompt — Construct prompt merging partial summaries into the final digest bullets.
+#   build_incremental_summary_prompt — Construct prompt updating a previous summary with only the new posts.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.5.1 - Refused to build a budgeted prompt with no posts when not even one fits the budget.
 # END_CHANGE_SUMMARY
 
+import json
+import re
+from dataclasses import dataclass, replace
+
+from src.app.errors import SummarizeError
 from src.domain.dto import PostDTO
 from src.domain.types import ChannelHandle
 
+from .tokens import TokenCounter
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+_DIGIT_RE = re.compile(r"\d")
+_MIN_TRUNCATED_POST_TOKENS = 48
+
+# Instruction prefixes are byte-identical across channels and runs so provider-side and
+# vLLM-style prefix caches can reuse their KV state; everything variable goes after them.
+PROMPT_VERSION = "2"
+
+_DIGEST_RULES = (
+    "- Без воды, без повторов\n"
+    "- Если есть цифры/факты/анонсы/сроки — обязательно упомяни\n"
+    "- Язык: русский\n"
+)
+
+_SUMMARY_INSTRUCTIONS = (
+    "Ты делаешь дайджест телеграм-канала.\n"
+    "Ниже даны канал и его последние посты. Суммаризируй последние посты.\n"
+    "Требования:\n"
+    "- 4-8 буллетов, коротко и по делу\n" + _DIGEST_RULES + "\n"
+)
+
+_BATCH_INSTRUCTIONS = (
+    "Ты делаешь дайджест нескольких телеграм-каналов.\n"
+    "Каждый канал дан отдельной секцией между строками === BEGIN <id> === и === END <id> ===.\n"
+    "Суммаризируй последние посты каждого канала независимо от остальных.\n"
+    "Требования к каждому summary:\n"
+    "- 4-8 буллетов, коротко и по делу\n" + _DIGEST_RULES + "\n"
+    "Формат ответа: только JSON-объект без пояснений и без markdown:\n"
+    '{"channels": [{"id": "<id секции>", "summary": "<буллеты через \\n>"}]}\n\n'
+)
+
+_MAP_INSTRUCTIONS = (
+    "Ты готовишь материал для дайджеста телеграм-канала.\n"
+    "Ниже дана одна часть последних постов канала. Выпиши ключевые факты этой части.\n"
+    "Требования:\n"
+    "- 3-6 буллетов, коротко и по делу\n"
+    "- Сохраняй цифры/факты/анонсы/сроки дословно\n"
+    "- Язык: русский\n\n"
+)
+
+
+def _reduce_instructions(size: str) -> str:
+    return (
+        "Ты делаешь дайджест телеграм-канала.\n"
+        "Ниже даны канал и краткие выжимки по частям его последних постов в хронологическом порядке.\n"
+        "Объедини их в один итоговый дайджест.\n"
+        "Требования:\n"
+        f"- {size}, коротко и по делу\n"
+        "- Без воды, без повторов; объединяй повторяющиеся темы\n"
+        "- Если есть цифры/факты/анонсы/сроки — обязательно упомяни\n"
+        "- Язык: русский\n\n"
+    )
+
+
+_REDUCE_FINAL_INSTRUCTIONS = _reduce_instructions("4-8 буллетов")
+_REDUCE_PARTIAL_INSTRUCTIONS = _reduce_instructions("3-8 буллетов")
+
+_INCREMENTAL_INSTRUCTIONS = (
+    "Ты обновляешь дайджест телеграм-канала.\n"
+    "Ниже даны канал, предыдущий дайджест и только новые посты, вышедшие после него.\n"
+    "Обнови дайджест: добавь важное из новых постов, убери самые старые и наименее важные пункты.\n"
+    "Требования:\n"
+    "- 4-8 буллетов, коротко и по делу\n" + _DIGEST_RULES + "- Верни только обновлённый дайджест\n\n"
+)
+
+
+def _channel_header(channel_handle: ChannelHandle, channel_link: str) -> str:
+    return f"Канал: {str(channel_handle)}\nСсылка: {channel_link}\n\n"
+
+
+def _post_header(index: int, post: PostDTO) -> str:
+    return f"POST #{index + 1} ({post.permalink or 'no-link'}):\n"
+
+
+def _serialize_post(index: int, post: PostDTO) -> str:
+    return _post_header(index, post) + post.text
+
+
+def _serialize_posts(posts: list[PostDTO]) -> str:
+    return "\n\n".join([_serialize_post(i, p) for i, p in enumerate(posts)])
+
 
 # START_CONTRACT: build_summary_prompt
-#   PURPOSE: Generate one stable summarization prompt containing channel metadata and recent posts.
+#   PURPOSE: Generate one summarization prompt: fixed instruction prefix, then channel metadata and recent posts.
 #   INPUTS: { channel_handle: ChannelHandle, channel_link: str, posts: list[PostDTO] }
 #   OUTPUTS: { str - prompt text for LLM request }
 #   SIDE_EFFECTS: none
@@ -32,22 +132,267 @@ def build_summary_prompt(
     posts: list[PostDTO],
 ) -> str:
     # START_BLOCK_SERIALIZE_POSTS_FOR_PROMPT
-    joined = "\n\n".join(
-        [f"POST #{i + 1} ({p.permalink or 'no-link'}):\n{p.text}" for i, p in enumerate(posts)]
-    )
+    joined = _serialize_posts(posts)
     # END_BLOCK_SERIALIZE_POSTS_FOR_PROMPT
 
     # START_BLOCK_BUILD_PROMPT_TEMPLATE
+    return _SUMMARY_INSTRUCTIONS + _channel_header(channel_handle, channel_link) + f"Посты:\n{joined}\n"
+    # END_BLOCK_BUILD_PROMPT_TEMPLATE
+
+
+@dataclass(frozen=True)
+class BudgetedPrompt:
+    prompt: str
+    posts: list[PostDTO]
+    tokens: int
+
+
+def _post_priority(post: PostDTO, recency_rank: int) -> float:
+    # Newest first; digits (numbers, dates, prices) mark fact-dense posts worth keeping.
+    score = 1.0 / (1 + recency_rank)
+    if _DIGIT_RE.search(post.text):
+        score += 0.35
+    if len(post.text) < 40:
+        score -= 0.25
+    return score
+
+
+# START_CONTRACT: build_budgeted_summary_prompt
+#   PURPOSE: Build the channel prompt from as many posts as fit the token budget, preferring newest and fact-dense posts.
+#   INPUTS: { channel_handle: ChannelHandle, channel_link: str, posts: list[PostDTO] - chronological, counter: TokenCounter, budget_tokens: int }
+#   OUTPUTS: { BudgetedPrompt - prompt, chronologically ordered selected posts, and prompt token count }
+#   SIDE_EFFECTS: raises SummarizeError when posts are given but not even one fits the budget
+#   LINKS: M-SUMMARIZER-PROMPTS, M-SUMMARIZER-TOKENS, M-DOMAIN-DTO, M-ERRORS
+# END_CONTRACT: build_budgeted_summary_prompt
+def build_budgeted_summary_prompt(
+    channel_handle: ChannelHandle,
+    channel_link: str,
+    posts: list[PostDTO],
+    *,
+    counter: TokenCounter,
+    budget_tokens: int,
+) -> BudgetedPrompt:
+    # START_BLOCK_COUNT_HEADER_AND_POST_COSTS
+    base = counter.count(build_summary_prompt(channel_handle, channel_link, []), cache=False)
+
+    def header_cost(i: int) -> int:
+        # Separator plus "POST #n (link):" header; post bodies are cached separately.
+        return counter.count(_post_header(i, posts[i]), cache=False) + 1
+
+    costs = [header_cost(i) + counter.count(p.text) for i, p in enumerate(posts)]
+    # END_BLOCK_COUNT_HEADER_AND_POST_COSTS
+
+    # START_BLOCK_FAST_PATH_WHEN_EVERYTHING_FITS
+    if base + sum(costs) <= budget_tokens:
+        prompt = build_summary_prompt(channel_handle, channel_link, posts)
+        return BudgetedPrompt(prompt=prompt, posts=list(posts), tokens=base + sum(costs))
+    # END_BLOCK_FAST_PATH_WHEN_EVERYTHING_FITS
+
+    # START_BLOCK_RANK_POSTS_BY_PRIORITY
+    remaining = budget_tokens - base
+    last = len(posts) - 1
+    ranked = sorted(range(len(posts)), key=lambda i: _post_priority(posts[i], last - i), reverse=True)
+    # END_BLOCK_RANK_POSTS_BY_PRIORITY
+
+    # START_BLOCK_GREEDY_FILL_BUDGET
+    chosen: dict[int, PostDTO] = {}
+    for i in ranked:
+        if costs[i] <= remaining:
+            chosen[i] = posts[i]
+            remaining -= costs[i]
+            continue
+        room = remaining - header_cost(i)
+        if room >= _MIN_TRUNCATED_POST_TOKENS or not chosen:
+            text = counter.truncate(posts[i].text, room)
+            if text:
+                chosen[i] = replace(posts[i], text=text)
+                remaining -= header_cost(i) + counter.count(text, cache=False)
+    # END_BLOCK_GREEDY_FILL_BUDGET
+
+    # START_BLOCK_RESTORE_ORDER_AND_BUILD_PROMPT
+    if posts and not chosen:
+        # Reachable after context-length retries shrink the budget below the fixed prompt; an empty prompt is still billed.
+        raise SummarizeError(f"prompt budget {budget_tokens} leaves no room for posts (fixed part {base} tokens)")
+    selected = [chosen[i] for i in sorted(chosen)]
+    prompt = build_summary_prompt(channel_handle, channel_link, selected)
+    return BudgetedPrompt(prompt=prompt, posts=selected, tokens=counter.count(prompt, cache=False))
+    # END_BLOCK_RESTORE_ORDER_AND_BUILD_PROMPT
+
+
+@dataclass(frozen=True)
+class BatchPromptSection:
+    section_id: str
+    channel_handle: ChannelHandle
+    channel_link: str
+    posts: list[PostDTO]
+
+
+# START_CONTRACT: build_batch_summary_prompt
+#   PURPOSE: Pack several small channels into one prompt with delimited sections and a JSON output contract.
+#   INPUTS: { sections: list[BatchPromptSection] }
+#   OUTPUTS: { str - prompt text for one batched LLM request }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS, M-DOMAIN-DTO
+# END_CONTRACT: build_batch_summary_prompt
+def build_batch_summary_prompt(sections: list[BatchPromptSection]) -> str:
+    # START_BLOCK_SERIALIZE_BATCH_SECTIONS
+    blocks = [
+        (
+            f"=== BEGIN {s.section_id} ===\n"
+            f"Канал: {str(s.channel_handle)}\n"
+            f"Ссылка: {s.channel_link}\n\n"
+            f"Посты:\n{_serialize_posts(s.posts)}\n"
+            f"=== END {s.section_id} ==="
+        )
+        for s in sections
+    ]
+    ids = ", ".join(s.section_id for s in sections)
+    # END_BLOCK_SERIALIZE_BATCH_SECTIONS
+
+    # START_BLOCK_BUILD_BATCH_PROMPT_TEMPLATE
     return (
-        "Ты делаешь дайджест телеграм-канала.\n"
-        f"Канал: {str(channel_handle)}\n"
-        f"Ссылка: {channel_link}\n\n"
-        "Суммаризируй последние посты.\n"
-        "Требования:\n"
-        "- 4-8 буллетов, коротко и по делу\n"
-        "- Без воды, без повторов\n"
-        "- Если есть цифры/факты/анонсы/сроки — обязательно упомяни\n"
-        "- Язык: русский\n\n"
-        f"Посты:\n{joined}\n"
+        _BATCH_INSTRUCTIONS
+        + f"Верни ровно по одному элементу на каждую секцию: {ids}.\n\n"
+        + "\n\n".join(blocks)
+        + "\n"
+    )
+    # END_BLOCK_BUILD_BATCH_PROMPT_TEMPLATE
+
+
+# START_CONTRACT: parse_batch_summary_response
+#   PURPOSE: Extract per-section summaries from batched LLM output, ignoring unknown ids and empty summaries.
+#   INPUTS: { text: str - raw LLM output, section_ids: list[str] - expected section ids }
+#   OUTPUTS: { dict[str, str] - section_id to summary text for successfully parsed sections }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS
+# END_CONTRACT: parse_batch_summary_response
+def parse_batch_summary_response(text: str, section_ids: list[str]) -> dict[str, str]:
+    # START_BLOCK_LOCATE_AND_DECODE_JSON
+    match = _JSON_OBJECT_RE.search(text or "")
+    if match is None:
+        return {}
+    try:
+        payload = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    items = payload.get("channels") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return {}
+    # END_BLOCK_LOCATE_AND_DECODE_JSON
+
+    # START_BLOCK_COLLECT_KNOWN_SECTIONS
+    expected = set(section_ids)
+    out: dict[str, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        section_id = str(item.get("id", "")).strip()
+        summary = item.get("summary")
+        if isinstance(summary, list):
+            summary = "\n".join(str(line) for line in summary)
+        if section_id not in expected or not isinstance(summary, str) or not summary.strip():
+            continue
+        out.setdefault(section_id, summary.strip())
+    return out
+    # END_BLOCK_COLLECT_KNOWN_SECTIONS
+
+
+# START_CONTRACT: split_posts_into_groups
+#   PURPOSE: Pack chronological posts into consecutive groups whose serialized size fits group_budget_tokens; oversized posts are truncated into their own group.
+#   INPUTS: { posts: list[PostDTO], counter: TokenCounter, group_budget_tokens: int }
+#   OUTPUTS: { list[list[PostDTO]] - non-empty groups in chronological order }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS, M-SUMMARIZER-TOKENS
+# END_CONTRACT: split_posts_into_groups
+def split_posts_into_groups(
+    posts: list[PostDTO],
+    *,
+    counter: TokenCounter,
+    group_budget_tokens: int,
+) -> list[list[PostDTO]]:
+    # START_BLOCK_GREEDY_PACK_CONSECUTIVE_POSTS
+    groups: list[list[PostDTO]] = []
+    current: list[PostDTO] = []
+    used = 0
+    for post in posts:
+        header = counter.count(_post_header(len(current), post), cache=False) + 1
+        cost = header + counter.count(post.text)
+        if cost > group_budget_tokens:
+            post = replace(post, text=counter.truncate(post.text, max(1, group_budget_tokens - header)))
+            cost = group_budget_tokens
+        if current and used + cost > group_budget_tokens:
+            groups.append(current)
+            current, used = [], 0
+        current.append(post)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+    # END_BLOCK_GREEDY_PACK_CONSECUTIVE_POSTS
+
+
+# START_CONTRACT: build_map_summary_prompt
+#   PURPOSE: Build the map-step prompt that extracts key facts from one group of a channel's posts.
+#   INPUTS: { channel_handle: ChannelHandle, channel_link: str, posts: list[PostDTO], part: int - 1-based, total: int }
+#   OUTPUTS: { str - prompt text }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS, M-DOMAIN-DTO
+# END_CONTRACT: build_map_summary_prompt
+def build_map_summary_prompt(
+    channel_handle: ChannelHandle,
+    channel_link: str,
+    posts: list[PostDTO],
+    *,
+    part: int,
+    total: int,
+) -> str:
+    return (
+        _MAP_INSTRUCTIONS
+        + _channel_header(channel_handle, channel_link)
+        + f"Часть {part} из {total}.\n\nПосты:\n{_serialize_posts(posts)}\n"
+    )
+
+
+# START_CONTRACT: build_reduce_summary_prompt
+#   PURPOSE: Build the reduce-step prompt merging partial summaries into the final 4-8 bullet digest (or into an intermediate merge when final is False).
+#   INPUTS: { channel_handle: ChannelHandle, channel_link: str, partials: list[str], final: bool }
+#   OUTPUTS: { str - prompt text }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS
+# END_CONTRACT: build_reduce_summary_prompt
+def build_reduce_summary_prompt(
+    channel_handle: ChannelHandle,
+    channel_link: str,
+    partials: list[str],
+    *,
+    final: bool = True,
+) -> str:
+    # START_BLOCK_SERIALIZE_PARTIAL_SUMMARIES
+    joined = "\n\n".join(f"ЧАСТЬ #{i + 1}:\n{text}" for i, text in enumerate(partials))
+    instructions = _REDUCE_FINAL_INSTRUCTIONS if final else _REDUCE_PARTIAL_INSTRUCTIONS
+    # END_BLOCK_SERIALIZE_PARTIAL_SUMMARIES
+
+    # START_BLOCK_BUILD_REDUCE_PROMPT_TEMPLATE
+    return instructions + _channel_header(channel_handle, channel_link) + f"Выжимки:\n{joined}\n"
+    # END_BLOCK_BUILD_REDUCE_PROMPT_TEMPLATE
+
+
+# START_CONTRACT: build_incremental_summary_prompt
+#   PURPOSE: Build a prompt that updates the previous channel summary with only the posts published since it was made.
+#   INPUTS: { channel_handle: ChannelHandle, channel_link: str, previous_summary: str, new_posts: list[PostDTO] }
+#   OUTPUTS: { str - prompt text }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-PROMPTS, M-DOMAIN-DTO
+# END_CONTRACT: build_incremental_summary_prompt
+def build_incremental_summary_prompt(
+    channel_handle: ChannelHandle,
+    channel_link: str,
+    previous_summary: str,
+    new_posts: list[PostDTO],
+) -> str:
+    return (
+        _INCREMENTAL_INSTRUCTIONS
+        + _channel_header(channel_handle, channel_link)
+        + f"Предыдущий дайджест:\n{previous_summary.strip()}\n\n"
+        + f"Новые посты:\n{_serialize_posts(new_posts)}\n"
     )
-    # END_BLOCK_BUILD_PROMPT_TEMPLATE
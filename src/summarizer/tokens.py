@@ -0,0 +1,203 @@
+# FILE: src/summarizer/tokens.py
+# VERSION: 1.1.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Count prompt tokens with a pluggable local tokenizer and cache per-text counts.
+#   SCOPE: Heuristic, tiktoken, and HuggingFace tokenizers behind one counter; per-model context window lookup.
+#   DEPENDS: M-ERRORS, M-APP-METRICS
+#   LINKS: docs/knowledge-graph.xml#M-SUMMARIZER-TOKENS
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   MODEL_CONTEXT_TOKENS — Known context window sizes by model name prefix.
+#   heuristic_token_count — Dependency-free token estimate tuned for mixed Cyrillic/Latin text.
+#   TokenCounter — LRU-cached token counter over an encode-length function.
+#   build_token_counter — Build TokenCounter from a tokenizer spec string.
+#   resolve_prompt_budget — Compute prompt token budget from model context and reserved output.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.0 - Counted token count cache hits and misses.
+# END_CHANGE_SUMMARY
+
+import math
+import re
+from collections import OrderedDict
+from typing import Callable
+
+from src.app.errors import ValidationError
+from src.app.metrics import CACHE_LOOKUPS
+
+DEFAULT_CONTEXT_TOKENS = 8192
+
+MODEL_CONTEXT_TOKENS: dict[str, int] = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1000000,
+    "gpt-3.5-turbo": 16385,
+    "qwen2.5": 32768,
+    "qwen-coder": 32768,
+    "llama-3": 8192,
+    "mistral": 32768,
+}
+
+_TOKEN_PIECE_RE = re.compile(r"[А-Яа-яЁё]+|[A-Za-z]+|\d+|\s+|[^\sA-Za-zА-Яа-яЁё\d]")
+
+
+# START_CONTRACT: heuristic_token_count
+#   PURPOSE: Estimate BPE token count without a tokenizer; Cyrillic words split roughly every 3 chars, Latin every 4.
+#   INPUTS: { text: str }
+#   OUTPUTS: { int - estimated token count }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-TOKENS
+# END_CONTRACT: heuristic_token_count
+def heuristic_token_count(text: str) -> int:
+    # START_BLOCK_SUM_PIECE_ESTIMATES
+    total = 0
+    for piece in _TOKEN_PIECE_RE.findall(text or ""):
+        ch = piece[0]
+        if ch.isspace():
+            total += 1 if "\n" in piece else 0
+        elif ch.isdigit():
+            total += math.ceil(len(piece) / 3)
+        elif ch.isascii() and ch.isalpha():
+            total += math.ceil(len(piece) / 4)
+        elif ch.isalpha():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1
+    return total
+    # END_BLOCK_SUM_PIECE_ESTIMATES
+
+
+class TokenCounter:
+    # START_CONTRACT: TokenCounter.__init__
+    #   PURPOSE: Wrap a text-to-token-count function with an LRU cache.
+    #   INPUTS: { count_fn: Callable[[str], int], name: str, cache_size: int }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-TOKENS
+    # END_CONTRACT: TokenCounter.__init__
+    def __init__(self, count_fn: Callable[[str], int], *, name: str, cache_size: int = 4096) -> None:
+        self._count_fn = count_fn
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._cache_size = max(0, cache_size)
+        self.name = name
+
+    # START_CONTRACT: TokenCounter.count
+    #   PURPOSE: Return token count for text, serving repeated texts (post bodies) from the LRU cache.
+    #   INPUTS: { text: str, cache: bool - False for one-off strings such as whole prompts }
+    #   OUTPUTS: { int - token count }
+    #   SIDE_EFFECTS: updates in-memory cache and cache lookup metrics
+    #   LINKS: M-SUMMARIZER-TOKENS, M-APP-METRICS
+    # END_CONTRACT: TokenCounter.count
+    def count(self, text: str, *, cache: bool = True) -> int:
+        # START_BLOCK_LOOKUP_OR_COUNT
+        if not text:
+            return 0
+        if not cache:
+            return int(self._count_fn(text))
+        cached = self._cache.get(text)
+        if cached is not None:
+            CACHE_LOOKUPS.inc(cache="token_count", result="hit")
+            self._cache.move_to_end(text)
+            return cached
+        CACHE_LOOKUPS.inc(cache="token_count", result="miss")
+        value = int(self._count_fn(text))
+        if self._cache_size:
+            self._cache[text] = value
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return value
+        # END_BLOCK_LOOKUP_OR_COUNT
+
+    # START_CONTRACT: TokenCounter.truncate
+    #   PURPOSE: Cut text to the longest prefix whose token count fits max_tokens, appending an ellipsis when cut.
+    #   INPUTS: { text: str, max_tokens: int }
+    #   OUTPUTS: { str - original or truncated text }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-SUMMARIZER-TOKENS
+    # END_CONTRACT: TokenCounter.truncate
+    def truncate(self, text: str, max_tokens: int) -> str:
+        # START_BLOCK_BINARY_SEARCH_PREFIX
+        if max_tokens <= 0:
+            return ""
+        if self._count_fn(text) <= max_tokens:
+            return text
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._count_fn(text[:mid]) + 1 <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo].rstrip() + "…" if lo else ""
+        # END_BLOCK_BINARY_SEARCH_PREFIX
+
+
+# START_CONTRACT: build_token_counter
+#   PURPOSE: Build a TokenCounter from spec `heuristic`, `tiktoken:<encoding>`, or `hf:<tokenizer.json path>`.
+#   INPUTS: { spec: str, cache_size: int }
+#   OUTPUTS: { TokenCounter }
+#   SIDE_EFFECTS: may load tokenizer files from disk
+#   LINKS: M-SUMMARIZER-TOKENS, M-ERRORS
+# END_CONTRACT: build_token_counter
+def build_token_counter(spec: str = "heuristic", *, cache_size: int = 4096) -> TokenCounter:
+    # START_BLOCK_RESOLVE_TOKENIZER_BACKEND
+    kind, _, arg = (spec or "heuristic").partition(":")
+    kind = kind.strip().lower()
+
+    if kind == "heuristic":
+        return TokenCounter(heuristic_token_count, name="heuristic", cache_size=cache_size)
+
+    if kind == "tiktoken":
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ValidationError("LLM_TOKENIZER=tiktoken requires the `tiktoken` package") from e
+        encoding = tiktoken.get_encoding(arg or "cl100k_base")
+        return TokenCounter(
+            lambda text: len(encoding.encode(text, disallowed_special=())),
+            name=f"tiktoken:{encoding.name}",
+            cache_size=cache_size,
+        )
+
+    if kind == "hf":
+        if not arg:
+            raise ValidationError("LLM_TOKENIZER=hf:<path> requires a tokenizer.json path")
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ValidationError("LLM_TOKENIZER=hf requires the `tokenizers` package") from e
+        tokenizer = Tokenizer.from_file(arg)
+        return TokenCounter(
+            lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids),
+            name=f"hf:{arg}",
+            cache_size=cache_size,
+        )
+
+    raise ValidationError(f"Unknown tokenizer spec: {spec}")
+    # END_BLOCK_RESOLVE_TOKENIZER_BACKEND
+
+
+# START_CONTRACT: resolve_prompt_budget
+#   PURPOSE: Compute prompt token budget as model context minus reserved output and a safety margin.
+#   INPUTS: { model: str, context_tokens: int - explicit override or 0, max_output_tokens: int, safety_ratio: float }
+#   OUTPUTS: { int - prompt token budget, at least 256 }
+#   SIDE_EFFECTS: none
+#   LINKS: M-SUMMARIZER-TOKENS
+# END_CONTRACT: resolve_prompt_budget
+def resolve_prompt_budget(
+    model: str,
+    *,
+    context_tokens: int = 0,
+    max_output_tokens: int = 1024,
+    safety_ratio: float = 0.05,
+) -> int:
+    # START_BLOCK_LOOKUP_MODEL_CONTEXT
+    context = context_tokens
+    if context <= 0:
+        low = (model or "").lower()
+        matches = [prefix for prefix in MODEL_CONTEXT_TOKENS if low.startswith(prefix)]
+        context = MODEL_CONTEXT_TOKENS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_TOKENS
+    # END_BLOCK_LOOKUP_MODEL_CONTEXT
+
+    return max(256, int(context * (1 - safety_ratio)) - max_output_tokens)
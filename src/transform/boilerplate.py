@@ -0,0 +1,183 @@
+# FILE: src/transform/boilerplate.py
+# VERSION: 1.1.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Learn per-channel repeated post headers/footers (signatures, subscribe links, ad disclaimers, hashtag tails) and strip them before prompting.
+#   SCOPE: Exponentially decayed document-frequency counts of leading/trailing word n-grams per channel; JSON-serializable state for persistence; capped stripping. No I/O.
+#   DEPENDS: M-DOMAIN-DTO
+#   LINKS: docs/knowledge-graph.xml#M-TRANSFORM-BOILERPLATE
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   BoilerplateModel — Per-channel edge n-gram counts with observe/strip and state round-trip.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.1.0 - Decayed n-gram counts and the post weight together so changed signatures are relearned; pruning keeps newer n-grams on ties.
+# END_CHANGE_SUMMARY
+
+import heapq
+from typing import Iterable
+
+from src.domain.dto import PostDTO
+
+_STATE_VERSION = 1
+_MIN_COUNT = 0.05
+
+
+class BoilerplateModel:
+    # START_CONTRACT: BoilerplateModel.__init__
+    #   PURPOSE: Configure learning thresholds; a pattern is active once it occurs at the same post edge in min_share of at least min_posts observed posts, weighted toward recent posts.
+    #   INPUTS: { min_posts: int, min_share: float, min_ngram: int, max_ngram: int - words, max_patterns: int - per edge, max_removal_ratio: float - cap on stripped share of one post, decay: float - weight kept by older posts per newly observed post, 1 = never forget }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-TRANSFORM-BOILERPLATE
+    # END_CONTRACT: BoilerplateModel.__init__
+    def __init__(
+        self,
+        *,
+        min_posts: int = 5,
+        min_share: float = 0.6,
+        min_ngram: int = 3,
+        max_ngram: int = 24,
+        max_patterns: int = 2000,
+        max_removal_ratio: float = 0.5,
+        decay: float = 0.99,
+    ) -> None:
+        self._min_posts = max(2, min_posts)
+        self._min_share = min_share
+        self._min_ngram = max(1, min_ngram)
+        self._max_ngram = max(self._min_ngram, max_ngram)
+        self._max_patterns = max_patterns
+        self._max_removal_ratio = max_removal_ratio
+        self._decay = min(1.0, max(0.5, decay))
+        self.posts_seen = 0
+        self._weight = 0.0
+        self.last_msg_id = 0
+        self._heads: dict[str, float] = {}
+        self._tails: dict[str, float] = {}
+        self._active: tuple[frozenset[str], frozenset[str]] | None = None
+
+    # START_CONTRACT: BoilerplateModel.observe
+    #   PURPOSE: Decay existing counts, then count edge n-grams of posts newer than the last observed message id; already-counted posts are ignored.
+    #   INPUTS: { posts: Iterable[PostDTO] - whitespace-normalized text }
+    #   OUTPUTS: { int - number of newly observed posts }
+    #   SIDE_EFFECTS: mutates counts and watermark
+    #   LINKS: M-TRANSFORM-BOILERPLATE, M-DOMAIN-DTO
+    # END_CONTRACT: BoilerplateModel.observe
+    def observe(self, posts: Iterable[PostDTO]) -> int:
+        fresh = [post for post in posts if post.tg_msg_id > self.last_msg_id]
+        if not fresh:
+            return 0
+
+        # START_BLOCK_DECAY_OLD_COUNTS
+        # Counts and the total post weight shrink by the same factor, so shares stay comparable and a dropped
+        # signature fades out. Posts of one batch share a weight; posts_seen stays a plain count for min_posts.
+        factor = self._decay ** len(fresh)
+        if factor < 1.0:
+            self._weight *= factor
+            self._heads = self._decayed(self._heads, factor)
+            self._tails = self._decayed(self._tails, factor)
+        # END_BLOCK_DECAY_OLD_COUNTS
+
+        # START_BLOCK_COUNT_EDGE_NGRAMS
+        for post in fresh:
+            words = post.text.split(" ")
+            top = min(self._max_ngram, len(words) - 1)
+            for n in range(self._min_ngram, top + 1):
+                head = " ".join(words[:n])
+                tail = " ".join(words[-n:])
+                self._heads[head] = self._heads.get(head, 0.0) + 1.0
+                self._tails[tail] = self._tails.get(tail, 0.0) + 1.0
+            self.last_msg_id = max(self.last_msg_id, post.tg_msg_id)
+        # END_BLOCK_COUNT_EDGE_NGRAMS
+
+        # START_BLOCK_PRUNE_RARE_NGRAMS
+        self.posts_seen += len(fresh)
+        self._weight += len(fresh)
+        self._heads = self._prune(self._heads)
+        self._tails = self._prune(self._tails)
+        self._active = None
+        return len(fresh)
+        # END_BLOCK_PRUNE_RARE_NGRAMS
+
+    @staticmethod
+    def _decayed(counts: dict[str, float], factor: float) -> dict[str, float]:
+        return {k: v * factor for k, v in counts.items() if v * factor >= _MIN_COUNT}
+
+    def _prune(self, counts: dict[str, float]) -> dict[str, float]:
+        if len(counts) <= self._max_patterns:
+            return counts
+        # New n-grams are inserted last; on equal counts prefer them over stale ones.
+        ranked = heapq.nlargest(self._max_patterns, enumerate(counts.items()), key=lambda e: (e[1][1], e[0]))
+        return {k: v for _, (k, v) in sorted(ranked)}
+
+    def _patterns(self) -> tuple[frozenset[str], frozenset[str]]:
+        if self._active is None:
+            if self.posts_seen < self._min_posts:
+                self._active = (frozenset(), frozenset())
+            else:
+                need = self._weight * self._min_share
+                self._active = (
+                    frozenset(k for k, v in self._heads.items() if v >= need),
+                    frozenset(k for k, v in self._tails.items() if v >= need),
+                )
+        return self._active
+
+    # START_CONTRACT: BoilerplateModel.strip
+    #   PURPOSE: Remove the longest learned header and footer from one post text unless that would drop more than max_removal_ratio of it.
+    #   INPUTS: { text: str - whitespace-normalized }
+    #   OUTPUTS: { str - stripped text, or the same object when nothing was removed }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-TRANSFORM-BOILERPLATE
+    # END_CONTRACT: BoilerplateModel.strip
+    def strip(self, text: str) -> str:
+        heads, tails = self._patterns()
+        if not heads and not tails:
+            return text
+
+        # START_BLOCK_MATCH_LONGEST_EDGES
+        words = text.split(" ")
+        top = min(self._max_ngram, len(words) - 1)
+        start = next((n for n in range(top, self._min_ngram - 1, -1) if " ".join(words[:n]) in heads), 0)
+        end = len(words) - next(
+            (n for n in range(top, self._min_ngram - 1, -1) if " ".join(words[-n:]) in tails), 0
+        )
+        if start == 0 and end == len(words):
+            return text
+        # END_BLOCK_MATCH_LONGEST_EDGES
+
+        # START_BLOCK_APPLY_REMOVAL_CAP
+        kept = " ".join(words[start:end]) if start < end else ""
+        if not kept or len(text) - len(kept) > len(text) * self._max_removal_ratio:
+            return text
+        return kept
+        # END_BLOCK_APPLY_REMOVAL_CAP
+
+    def to_state(self) -> dict:
+        return {
+            "version": _STATE_VERSION,
+            "posts_seen": self.posts_seen,
+            "weight": round(self._weight, 4),
+            "last_msg_id": self.last_msg_id,
+            "heads": {k: round(v, 4) for k, v in self._heads.items()},
+            "tails": {k: round(v, 4) for k, v in self._tails.items()},
+        }
+
+    # START_CONTRACT: BoilerplateModel.from_state
+    #   PURPOSE: Restore a model from persisted state; unknown or malformed state yields an empty model.
+    #   INPUTS: { state: dict|None, **settings - same keyword settings as __init__ }
+    #   OUTPUTS: { BoilerplateModel }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-TRANSFORM-BOILERPLATE
+    # END_CONTRACT: BoilerplateModel.from_state
+    @classmethod
+    def from_state(cls, state: dict | None, **settings) -> "BoilerplateModel":
+        model = cls(**settings)
+        if not isinstance(state, dict) or state.get("version") != _STATE_VERSION:
+            return model
+        model.posts_seen = int(state.get("posts_seen", 0))
+        model._weight = float(state.get("weight", model.posts_seen))
+        model.last_msg_id = int(state.get("last_msg_id", 0))
+        model._heads = {str(k): float(v) for k, v in dict(state.get("heads") or {}).items()}
+        model._tails = {str(k): float(v) for k, v in dict(state.get("tails") or {}).items()}
+        return model
@@ -1,56 +1,100 @@
 # FILE: src/transform/posts.py
-# VERSION: 1.0.0
+# VERSION: 1.3.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Normalize extracted posts for summarization by cleaning and truncating text payloads.
-#   SCOPE: Apply text hygiene and minimum-length filtering while preserving post metadata.
-#   DEPENDS: M-DOMAIN-DTO, M-TRANSFORM-TEXT
+#   SCOPE: Apply text hygiene and minimum-length filtering while preserving post metadata; stream posts one at a time and reallocate only changed ones.
+#   DEPENDS: M-DOMAIN-DTO, M-TRANSFORM-TEXT, M-TRANSFORM-BOILERPLATE
 #   LINKS: docs/development-plan.xml#M-TRANSFORM-POSTS, docs/knowledge-graph.xml#M-TRANSFORM-POSTS
 # END_MODULE_CONTRACT
 #
 # START_MODULE_MAP
+#   iter_transform_posts — Lazily clean/truncate posts, skipping already-clean text and reusing unchanged DTOs.
 #   transform_posts — Clean/truncate post text and drop posts below minimal text length.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.3.0 - Added optional prompt compaction with URL placeholders and per-post tokens-saved logging.
 # END_CHANGE_SUMMARY
 
+import logging
+from dataclasses import replace
+from typing import Callable, Iterable, Iterator
+
 from src.domain.dto import PostDTO
 
-from .text import clean_text, truncate_text
+from .boilerplate import BoilerplateModel
+from .text import clean_text, normalize_for_prompt, truncate_text
+
+logger = logging.getLogger(__name__)
+
+
+# START_CONTRACT: iter_transform_posts
+#   PURPOSE: Stream posts through cleaning, learned boilerplate stripping, optional prompt compaction, and truncation; posts flagged clean are not re-cleaned and unchanged posts are yielded as-is.
+#   INPUTS: { posts: Iterable[PostDTO], max_chars_per_post: int, min_chars_per_post: int, boilerplate: BoilerplateModel|None, compact: bool, url_map: dict[str, str]|None - channel-wide URL placeholders, count_tokens: Callable[[str], int]|None }
+#   OUTPUTS: { Iterator[PostDTO] - transformed posts flagged clean, in input order }
+#   SIDE_EFFECTS: none
+#   LINKS: M-TRANSFORM-POSTS, M-TRANSFORM-TEXT
+# END_CONTRACT: iter_transform_posts
+def iter_transform_posts(
+    posts: Iterable[PostDTO],
+    *,
+    max_chars_per_post: int = 1500,
+    min_chars_per_post: int = 1,
+    boilerplate: BoilerplateModel | None = None,
+    compact: bool = False,
+    url_map: dict[str, str] | None = None,
+    count_tokens: Callable[[str], int] | None = None,
+) -> Iterator[PostDTO]:
+    # START_BLOCK_TRANSFORM_AND_FILTER_POSTS
+    for p in posts:
+        text = p.text if p.clean else clean_text(p.text)
+        if boilerplate is not None:
+            # Learned patterns are raw post edges, so strip before compaction rewrites URLs.
+            text = boilerplate.strip(text)
+        if compact:
+            normalized = normalize_for_prompt(text, url_map=url_map, count_tokens=count_tokens)
+            text = text if normalized.text == text else normalized.text
+            logger.debug(
+                "[TransformPosts][iter_transform_posts][TRANSFORM_AND_FILTER_POSTS] msg_id=%s chars_saved=%s tokens_saved=%s",
+                p.tg_msg_id,
+                normalized.chars_saved,
+                normalized.tokens_saved,
+            )
+        text = truncate_text(text, max_chars_per_post)
+        if len(text) < min_chars_per_post:
+            continue
+        if p.clean and text is p.text:
+            yield p
+        else:
+            yield replace(p, text=text, clean=True)
+    # END_BLOCK_TRANSFORM_AND_FILTER_POSTS
 
 
 # START_CONTRACT: transform_posts
 #   PURPOSE: Prepare extracted posts for summarizer input by cleaning and truncating text content.
-#   INPUTS: { posts: list[PostDTO], max_chars_per_post: int, min_chars_per_post: int }
+#   INPUTS: { posts: Iterable[PostDTO], max_chars_per_post: int, min_chars_per_post: int, boilerplate: BoilerplateModel|None, compact: bool, url_map: dict[str, str]|None, count_tokens: Callable[[str], int]|None }
 #   OUTPUTS: { list[PostDTO] - transformed post list preserving source metadata }
 #   SIDE_EFFECTS: none
 #   LINKS: M-TRANSFORM-POSTS, M-TRANSFORM-TEXT
 # END_CONTRACT: transform_posts
 def transform_posts(
-    posts: list[PostDTO],
+    posts: Iterable[PostDTO],
     *,
     max_chars_per_post: int = 1500,
     min_chars_per_post: int = 1,
+    boilerplate: BoilerplateModel | None = None,
+    compact: bool = False,
+    url_map: dict[str, str] | None = None,
+    count_tokens: Callable[[str], int] | None = None,
 ) -> list[PostDTO]:
-    # START_BLOCK_INIT_TRANSFORM_OUTPUT
-    out: list[PostDTO] = []
-    # END_BLOCK_INIT_TRANSFORM_OUTPUT
-
-    # START_BLOCK_TRANSFORM_AND_FILTER_POSTS
-    for p in posts:
-        text = truncate_text(clean_text(p.text), max_chars_per_post)
-        if len(text) < min_chars_per_post:
-            continue
-        out.append(
-            PostDTO(
-                channel_handle=p.channel_handle,
-                tg_msg_id=p.tg_msg_id,
-                date=p.date,
-                text=text,
-                permalink=p.permalink,
-            )
+    return list(
+        iter_transform_posts(
+            posts,
+            max_chars_per_post=max_chars_per_post,
+            min_chars_per_post=min_chars_per_post,
+            boilerplate=boilerplate,
+            compact=compact,
+            url_map=url_map,
+            count_tokens=count_tokens,
         )
-    # END_BLOCK_TRANSFORM_AND_FILTER_POSTS
-
-    return out
+    )
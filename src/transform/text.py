@@ -1,8 +1,8 @@
 # FILE: src/transform/text.py
-# VERSION: 1.0.0
+# VERSION: 1.1.0
 # START_MODULE_CONTRACT
 #   PURPOSE: Provide reusable text normalization primitives for ETL pipeline.
-#   SCOPE: Clean whitespace and truncate strings with ellipsis behavior.
+#   SCOPE: Clean whitespace, truncate strings with ellipsis behavior, and compact prompt text in one compiled pass.
 #   DEPENDS: none
 #   LINKS: docs/development-plan.xml#M-TRANSFORM-TEXT, docs/knowledge-graph.xml#M-TRANSFORM-TEXT
 # END_MODULE_CONTRACT
@@ -10,16 +10,35 @@
 # START_MODULE_MAP
 #   clean_text — Collapse whitespace and strip text.
 #   truncate_text — Truncate text to max length with trailing ellipsis.
+#   NormalizedText — Compacted text with characters and tokens saved.
+#   normalize_for_prompt — NFKC plus single-pass URL placeholders, emoji/punctuation run collapse, invisible and Markdown stripping.
+#   expand_url_placeholders — Restore original URLs for placeholders in model output.
 # END_MODULE_MAP
 #
 # START_CHANGE_SUMMARY
-#   LAST_CHANGE: v1.0.0 - Added GRACE contracts and semantic block markers.
+#   LAST_CHANGE: v1.1.0 - Added token-compaction normalizer with URL placeholders.
 # END_CHANGE_SUMMARY
 
 import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable
 
 _WS_RE = re.compile(r"\s+")
 
+_URL_TRAILING = ".,;:!?»\"')"
+_EMOJI = "\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\uFE0F\u200D"
+_COMPACT_RE = re.compile(
+    r"(?P<mdlink>\[(?P<label>[^\]\n]{1,200})\]\((?P<target>https?://[^\s)]+)\))"
+    r"|(?P<url>(?:https?://|www\.)[^\s<>\[\]()]+)"
+    rf"|(?P<emoji>[{_EMOJI}]{{2,}})"
+    r"|(?P<invisible>[\u00AD\u034F\u180E\u200B-\u200F\u2060-\u2064\uFEFF])"
+    r"|(?P<md>```|\*\*|__|~~|`)"
+    r"|(?P<punct>(?P<pch>[!?.,;:\-–—_*=~#+])(?P=pch){2,})"
+    r"|(?P<ws>\s+)"
+)
+_PLACEHOLDER_RE = re.compile(r"\[L(\d+)\]")
+
 
 # START_CONTRACT: clean_text
 #   PURPOSE: Normalize arbitrary text by collapsing whitespace into single spaces.
@@ -51,3 +70,76 @@ def truncate_text(text: str, max_chars: int) -> str:
         return text
     return text[: max(0, max_chars - 1)].rstrip() + "…"
     # END_BLOCK_TRUNCATE_WITH_ELLIPSIS
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedText:
+    text: str
+    chars_saved: int
+    tokens_saved: int | None
+
+
+def _placeholder(url: str, url_map: dict[str, str]) -> str:
+    token = url_map.get(url)
+    if token is None:
+        token = f"[L{len(url_map) + 1}]"
+        url_map[url] = token
+    return token
+
+
+# START_CONTRACT: normalize_for_prompt
+#   PURPOSE: Compact post text for LLM input: NFKC, then one regex pass that swaps URLs for short [Ln] placeholders, keeps Markdown link labels, collapses emoji and punctuation runs, drops invisible characters and Markdown markers, and collapses whitespace.
+#   INPUTS: { text: str, url_map: dict[str, str]|None - url to placeholder, shared per channel and extended in place, count_tokens: Callable[[str], int]|None }
+#   OUTPUTS: { NormalizedText - compacted text, chars saved, tokens saved when count_tokens is given }
+#   SIDE_EFFECTS: adds new URLs to url_map
+#   LINKS: M-TRANSFORM-TEXT
+# END_CONTRACT: normalize_for_prompt
+def normalize_for_prompt(
+    text: str,
+    *,
+    url_map: dict[str, str] | None = None,
+    count_tokens: Callable[[str], int] | None = None,
+) -> NormalizedText:
+    if not text:
+        return NormalizedText(text="", chars_saved=0, tokens_saved=0 if count_tokens else None)
+    links = url_map if url_map is not None else {}
+
+    # START_BLOCK_SINGLE_PASS_REPLACE
+    def _sub(m: re.Match) -> str:
+        kind = m.lastgroup
+        if kind == "ws":
+            return " "
+        if kind in ("invisible", "md"):
+            return ""
+        if kind == "emoji":
+            return m.group(0)[0]
+        if kind == "punct":
+            ch = m.group("pch")
+            return "…" if ch == "." else ch
+        if kind == "mdlink":
+            return f"{m.group('label')} {_placeholder(m.group('target'), links)}"
+        url = m.group("url")
+        stripped = url.rstrip(_URL_TRAILING)
+        return _placeholder(stripped, links) + url[len(stripped):] if stripped else url
+
+    compact = _COMPACT_RE.sub(_sub, unicodedata.normalize("NFKC", text)).strip()
+    # END_BLOCK_SINGLE_PASS_REPLACE
+
+    # START_BLOCK_REPORT_SAVINGS
+    tokens_saved = max(0, count_tokens(text) - count_tokens(compact)) if count_tokens else None
+    return NormalizedText(text=compact, chars_saved=max(0, len(text) - len(compact)), tokens_saved=tokens_saved)
+    # END_BLOCK_REPORT_SAVINGS
+
+
+# START_CONTRACT: expand_url_placeholders
+#   PURPOSE: Replace [Ln] placeholders in model output with the original URLs; unknown placeholders are left as-is.
+#   INPUTS: { text: str, url_map: dict[str, str] - url to placeholder as built by normalize_for_prompt }
+#   OUTPUTS: { str }
+#   SIDE_EFFECTS: none
+#   LINKS: M-TRANSFORM-TEXT
+# END_CONTRACT: expand_url_placeholders
+def expand_url_placeholders(text: str, url_map: dict[str, str]) -> str:
+    if not url_map or "[L" not in text:
+        return text
+    by_token = {token: url for url, token in url_map.items()}
+    return _PLACEHOLDER_RE.sub(lambda m: by_token.get(m.group(0), m.group(0)), text)
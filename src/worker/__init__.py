@@ -0,0 +1,16 @@
+# FILE: src/worker/__init__.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Declare worker package boundary for the queue worker entry point.
+#   SCOPE: Namespace marker for worker submodules; contains no runtime logic.
+#   DEPENDS: none
+#   LINKS: docs/knowledge-graph.xml#M-WORKER-RUNNER
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   package-worker — Namespace package marker.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added worker package for `python -m src.worker`.
+# END_CHANGE_SUMMARY
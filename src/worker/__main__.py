@@ -0,0 +1,20 @@
+# FILE: src/worker/__main__.py
+# VERSION: 1.0.0
+# START_MODULE_CONTRACT
+#   PURPOSE: Make `python -m src.worker` start the queue worker.
+#   SCOPE: Delegate to M-WORKER-RUNNER run().
+#   DEPENDS: M-WORKER-RUNNER
+#   LINKS: docs/knowledge-graph.xml#M-WORKER-RUNNER
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   module-entry — Calls run() when executed as a module.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.0.0 - Added module entry point for the queue worker.
+# END_CHANGE_SUMMARY
+
+from src.worker.runner import run
+
+run()
@@ -0,0 +1,255 @@
+# FILE: src/worker/runner.py
+# VERSION: 1.3.1
+# START_MODULE_CONTRACT
+#   PURPOSE: Run queued digest jobs outside the bot process so extraction and summarization capacity scales independently.
+#   SCOPE: Claim jobs with SKIP LOCKED, heartbeat leases, run the analytic pipeline with per-channel checkpoints, retry with exponential backoff, requeue in-flight jobs on shutdown.
+#   DEPENDS: M-APP-LOGGING, M-ERROR-LOGGING, M-CONFIG, M-APP-RUNTIME, M-SVC-ANALYTIC, M-STORAGE-JOBS, M-ERRORS, M-APP-TRACING, M-APP-LOOP-MONITOR
+#   LINKS: docs/knowledge-graph.xml#M-WORKER-RUNNER
+# END_MODULE_CONTRACT
+#
+# START_MODULE_MAP
+#   JobWorker — Concurrent claim/run loop over the jobs table.
+#   serve — Open a bot-less runtime and run JobWorker until a stop signal.
+#   run — Process entry point for `python -m src.worker`.
+# END_MODULE_MAP
+#
+# START_CHANGE_SUMMARY
+#   LAST_CHANGE: v1.3.1 - Served worker metrics on WORKER_METRICS_PORT so a worker next to the bot does not fight over METRICS_PORT.
+# END_CHANGE_SUMMARY
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+
+from src.app.config import Config, load_config
+from src.app.error_logging import (
+    install_asyncio_exception_handler,
+    install_global_exception_hooks,
+    setup_runtime_logging,
+)
+from src.app.errors import StorageError, ValidationError
+from src.app.loop_monitor import install_loop_monitor
+from src.app.runtime import Runtime, close_runtime, open_runtime
+from src.app.tracing import current_span, traced
+from src.domain.dto import ChannelSummaryDTO, JobDTO
+from src.services.analytic import analytic_usecase
+from src.storage.jobs import (
+    JOB_ANALYTIC,
+    JOBS_NEW_CHANNEL,
+    JobSignal,
+    claim_job,
+    complete_job,
+    extend_job_lease,
+    fail_job,
+    release_job,
+    save_job_checkpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    # START_CONTRACT: JobWorker.__init__
+    #   PURPOSE: Bind runtime clients and queue settings; worker_id prefixes lease tokens for debugging.
+    #   INPUTS: { rt: Runtime, cfg: Config, worker_id: str|None }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: none
+    #   LINKS: M-WORKER-RUNNER
+    # END_CONTRACT: JobWorker.__init__
+    def __init__(self, rt: Runtime, cfg: Config, *, worker_id: str | None = None) -> None:
+        self._rt = rt
+        self._cfg = cfg
+        self._worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._visibility_s = max(1.0, cfg.job_visibility_timeout_s)
+        self._poll_interval_s = max(0.1, cfg.job_poll_interval_s)
+        self._signal = JobSignal(rt.pool, JOBS_NEW_CHANNEL)
+
+    # START_CONTRACT: JobWorker.run
+    #   PURPOSE: Run WORKER_CONCURRENCY claim loops until stop is set, then requeue whatever they were running.
+    #   INPUTS: { stop: asyncio.Event }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: claims and updates jobs; holds one LISTEN connection
+    #   LINKS: M-WORKER-RUNNER, M-STORAGE-JOBS
+    # END_CONTRACT: JobWorker.run
+    async def run(self, stop: asyncio.Event) -> None:
+        await self._signal.start()
+        slots = [asyncio.create_task(self._slot(i)) for i in range(max(1, self._cfg.worker_concurrency))]
+        logger.info("[JobWorker][run][START_SLOTS] worker_id=%s slots=%s", self._worker_id, len(slots))
+        try:
+            await stop.wait()
+        finally:
+            for task in slots:
+                task.cancel()
+            await asyncio.gather(*slots, return_exceptions=True)
+            await self._signal.aclose()
+
+    async def _slot(self, index: int) -> None:
+        while True:
+            try:
+                job = await claim_job(
+                    self._rt.pool,
+                    f"{self._worker_id}:{index}:{uuid.uuid4().hex[:8]}",
+                    visibility_timeout_s=self._visibility_s,
+                )
+            except StorageError:
+                logger.exception("[JobWorker][_slot][CLAIM] claim failed")
+                job = None
+            if job is None:
+                await self._signal.wait(self._poll_interval_s)
+                continue
+            await self.process(job)
+
+    # START_CONTRACT: JobWorker.process
+    #   PURPOSE: Run one claimed job under a lease heartbeat and record its outcome; a lost lease abandons the run, cancellation requeues it.
+    #   INPUTS: { job: JobDTO }
+    #   OUTPUTS: { None }
+    #   SIDE_EFFECTS: runs the analytic pipeline; completes, fails, or releases the job
+    #   LINKS: M-WORKER-RUNNER, M-STORAGE-JOBS, M-SVC-ANALYTIC, M-APP-TRACING
+    # END_CONTRACT: JobWorker.process
+    @traced("worker.process_job")
+    async def process(self, job: JobDTO) -> None:
+        current_span().set_attributes(job_id=job.id, kind=job.kind, attempt=job.attempts, tg_user_id=job.tg_user_id)
+        logger.info(
+            "[JobWorker][process][START] job_id=%s attempt=%s/%s resumed_channels=%s",
+            job.id,
+            job.attempts,
+            job.max_attempts,
+            len(job.checkpoint),
+        )
+        # START_BLOCK_RUN_UNDER_LEASE_HEARTBEAT
+        work = asyncio.create_task(self._execute(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, work))
+        try:
+            chunks = await work
+        except asyncio.CancelledError:
+            if heartbeat.done():
+                logger.warning("[JobWorker][process][RUN_UNDER_LEASE_HEARTBEAT] lease lost job_id=%s", job.id)
+                return
+            await self._release(job)
+            raise
+        except Exception as e:
+            await self._retry_or_fail(job, e)
+            return
+        finally:
+            heartbeat.cancel()
+        # END_BLOCK_RUN_UNDER_LEASE_HEARTBEAT
+
+        # START_BLOCK_STORE_RESULT
+        try:
+            stored = await complete_job(self._rt.pool, job, chunks)
+        except StorageError:
+            logger.exception("[JobWorker][process][STORE_RESULT] job_id=%s", job.id)
+            return
+        if not stored:
+            logger.warning("[JobWorker][process][STORE_RESULT] lease lost before completion job_id=%s", job.id)
+            return
+        logger.info("[JobWorker][process][STORE_RESULT] done job_id=%s chunks=%s", job.id, len(chunks))
+        # END_BLOCK_STORE_RESULT
+
+    async def _execute(self, job: JobDTO) -> list[str]:
+        if job.kind != JOB_ANALYTIC:
+            raise ValidationError(f"unknown job kind: {job.kind}")
+        cfg = self._cfg
+
+        async def checkpoint(summary: ChannelSummaryDTO) -> None:
+            try:
+                await save_job_checkpoint(self._rt.pool, job, summary)
+            except StorageError:
+                logger.warning("[JobWorker][_execute][CHECKPOINT] job_id=%s", job.id, exc_info=True)
+
+        resp = await analytic_usecase(
+            pool=self._rt.pool,
+            tg_user_id=job.tg_user_id,
+            tg_client=self._rt.tg_client,
+            summarizer=self._rt.summarizer,
+            posts_per_channel=cfg.posts_per_channel,
+            max_channels_per_call=cfg.max_channels_per_analytic_call,
+            max_chars_per_post=cfg.max_chars_per_post,
+            tg_message_max_len=cfg.tg_message_max_len,
+            include_post_links=cfg.include_post_links,
+            incremental_summaries=cfg.incremental_summaries,
+            incremental_max_delta_posts=cfg.incremental_max_delta_posts,
+            usage_recorder=self._rt.usage_recorder,
+            boilerplate_stripping=cfg.boilerplate_stripping,
+            boilerplate_min_share=cfg.boilerplate_min_share,
+            boilerplate_max_removal_ratio=cfg.boilerplate_max_removal_ratio,
+            prompt_compaction=cfg.prompt_compaction,
+            channel_locks=self._rt.channel_locks,
+            channel_lock_wait_s=cfg.channel_lock_wait_s,
+            completed=job.checkpoint,
+            on_channel_done=checkpoint,
+        )
+        return resp.chunks
+
+    async def _heartbeat(self, job: JobDTO, work: asyncio.Task) -> None:
+        # Three beats per timeout leave room for one slow or failed update.
+        while True:
+            await asyncio.sleep(self._visibility_s / 3)
+            try:
+                held = await extend_job_lease(self._rt.pool, job, visibility_timeout_s=self._visibility_s)
+            except StorageError:
+                logger.warning("[JobWorker][_heartbeat][EXTEND_LEASE] job_id=%s", job.id, exc_info=True)
+                continue
+            if not held:
+                work.cancel()
+                return
+
+    async def _retry_or_fail(self, job: JobDTO, error: Exception) -> None:
+        logger.error("[JobWorker][_retry_or_fail][JOB_ERROR] job_id=%s", job.id, exc_info=error)
+        current_span().record_error(error)
+        delay = self._cfg.job_retry_backoff_s * 2 ** max(0, job.attempts - 1)
+        try:
+            status = await fail_job(self._rt.pool, job, str(error) or type(error).__name__, retry_delay_s=delay)
+        except StorageError:
+            logger.exception("[JobWorker][_retry_or_fail][RECORD_FAILURE] job_id=%s", job.id)
+            return
+        logger.info(
+            "[JobWorker][_retry_or_fail][RECORD_FAILURE] job_id=%s status=%s retry_in_s=%.0f",
+            job.id,
+            status,
+            delay,
+        )
+
+    async def _release(self, job: JobDTO) -> None:
+        try:
+            await release_job(self._rt.pool, job)
+        except StorageError:
+            logger.warning("[JobWorker][_release][REQUEUE] job_id=%s", job.id, exc_info=True)
+        else:
+            logger.info("[JobWorker][_release][REQUEUE] job_id=%s requeued on shutdown", job.id)
+
+
+# START_CONTRACT: serve
+#   PURPOSE: Open runtime clients without the bot side and process jobs until SIGTERM/SIGINT.
+#   INPUTS: { cfg: Config }
+#   OUTPUTS: { None }
+#   SIDE_EFFECTS: opens DB/MTProto/LLM clients; claims and runs jobs
+#   LINKS: M-WORKER-RUNNER, M-APP-RUNTIME
+# END_CONTRACT: serve
+async def serve(cfg: Config) -> None:
+    loop = asyncio.get_running_loop()
+    install_asyncio_exception_handler(loop)
+    loop_monitor = install_loop_monitor(
+        interval_s=cfg.loop_monitor_interval_s, slow_callback_s=cfg.loop_slow_callback_s
+    )
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    # METRICS_PORT belongs to the bot (or webhook worker 0) on the same host.
+    rt = await open_runtime(cfg, with_bot=False, metrics_port=cfg.worker_metrics_port)
+    try:
+        await JobWorker(rt, cfg).run(stop)
+    finally:
+        await close_runtime(rt)
+        if loop_monitor is not None:
+            loop_monitor.stop()
+
+
+def run() -> None:
+    cfg = load_config()
+    setup_runtime_logging(cfg)
+    install_global_exception_hooks()
+    asyncio.run(serve(cfg))
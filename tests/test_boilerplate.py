@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from src.domain.dto import PostDTO
+from src.domain.types import ChannelHandle
+from src.transform.boilerplate import BoilerplateModel
+
+_FOOTER = "Подписывайтесь на @alpha | Реклама: ООО Ромашка erid 2Vtzq"
+
+
+def _post(msg_id: int, text: str) -> PostDTO:
+    return PostDTO(
+        channel_handle=ChannelHandle("alpha"),
+        tg_msg_id=msg_id,
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=text,
+        permalink=None,
+        clean=True,
+    )
+
+
+def _posts() -> list[PostDTO]:
+    bodies = [
+        "Запустили новый тариф за 990 рублей в месяц",
+        "Итоги квартала: выручка выросла на 12 процентов",
+        "В пятницу проведём эфир с командой продукта",
+        "Обновили приложение, исправили вход по коду",
+        "Открыли набор на стажировку до 1 марта",
+    ]
+    return [_post(i + 1, f"{body} {_FOOTER}") for i, body in enumerate(bodies)]
+
+
+def test_learned_footer_is_stripped_and_state_round_trips():
+    model = BoilerplateModel(min_posts=5)
+    assert model.observe(_posts()) == 5
+    assert model.observe(_posts()) == 0
+
+    restored = BoilerplateModel.from_state(model.to_state(), min_posts=5)
+    body = "Новый пост про скидки до 30 процентов на все тарифы для команд до конца месяца"
+    assert restored.strip(f"{body} {_FOOTER}") == body
+
+
+def test_strip_is_capped_and_noop_before_enough_posts():
+    model = BoilerplateModel(min_posts=5, max_removal_ratio=0.5)
+    assert model.strip(f"Коротко {_FOOTER}") == f"Коротко {_FOOTER}"
+
+    model.observe(_posts())
+    short = f"Коротко {_FOOTER}"
+    assert model.strip(short) is short
+
+
+def test_changed_footer_is_relearned_as_old_counts_decay():
+    old_footer = "Подписывайтесь на @alpha | Реклама: ООО Ромашка erid 2Vtzq"
+    new_footer = "Наш новый канал @beta, ставьте реакции и делитесь с друзьями"
+    model = BoilerplateModel(min_posts=5, decay=0.8)
+    for i in range(1, 21):
+        model.observe([_post(i, f"Новость номер {i} о важных событиях этого дня {old_footer}")])
+    for i in range(21, 29):
+        model.observe([_post(i, f"Новость номер {i} о важных событиях этого дня {new_footer}")])
+
+    body = "Свежий разбор рынка: что изменилось за неделю и чего ждать от регуляторов в новом квартале"
+    assert model.strip(f"{body} {new_footer}") == body
+    assert model.strip(f"{body} {old_footer}") == f"{body} {old_footer}"
@@ -1,5 +1,5 @@
 from src.digest.assembler import DELIMITER
-from src.digest.chunking import chunk_text_for_telegram
+from src.digest.chunking import TelegramChunker, chunk_blocks_for_telegram, chunk_text_for_telegram, utf16_len
 
 
 def test_chunking_short():
@@ -19,3 +19,21 @@ def test_chunking_long_single_block():
     chunks = chunk_text_for_telegram(text, max_len=30)
     assert all(0 < len(chunk) <= 30 for chunk in chunks)
     assert "".join(chunks) == text
+
+
+def test_chunking_counts_utf16_and_splits_oversized_block_on_lines():
+    emoji_block = "🔥" * 6  # 12 UTF-16 code units
+    bullets = "\n".join(f"- пункт {i}" for i in range(6))
+    chunks = chunk_blocks_for_telegram([emoji_block, bullets], max_len=20)
+
+    assert chunks[0] == emoji_block
+    assert all(utf16_len(chunk) <= 20 for chunk in chunks)
+    assert all(line.startswith("- пункт") for chunk in chunks[1:] for line in chunk.split("\n"))
+    assert "\n".join(chunks[1:]) == bullets
+
+
+def test_chunker_emits_incrementally():
+    chunker = TelegramChunker(max_len=20)
+    assert chunker.add("block1") == []
+    assert chunker.add("x" * 15) == ["block1"]
+    assert chunker.finish() == ["x" * 15]
@@ -1,7 +1,10 @@
 from datetime import datetime, timezone
+import json
 import logging
+import threading
 
 from src.app.error_logging import build_error_log_path, setup_error_file_logging
+from src.app.logging import BoundedQueueHandler
 
 
 def test_build_error_log_path_uses_utc_timestamp():
@@ -26,3 +29,50 @@ def test_setup_error_file_logging_writes_errors(tmp_path):
 
     content = path.read_text(encoding="utf-8")
     assert "test-error-line" in content
+
+
+def test_full_log_queue_drops_instead_of_blocking():
+    entered, release = threading.Event(), threading.Event()
+    seen = []
+
+    class _SlowSink(logging.Handler):
+        def emit(self, record):
+            entered.set()
+            release.wait(5)
+            seen.append(record.getMessage())
+
+    handler = BoundedQueueHandler([_SlowSink()], queue_size=1, sink="test")
+    logger = logging.getLogger("tests.error_logging.queue")
+    logger.handlers = [handler]
+    logger.propagate = False
+    try:
+        logger.error("first %s", 1)
+        assert entered.wait(5)
+        for n in (2, 3, 4):
+            logger.error("next %s", n)
+        assert handler.dropped == 2
+    finally:
+        release.set()
+        handler.close()
+        logger.handlers = []
+    assert seen == ["first 1", "next 2"]
+
+
+def test_error_file_json_format_with_size_rotation(tmp_path):
+    logger = logging.getLogger("tests.error_logging.json")
+    logger.handlers = []
+    logger.propagate = False
+
+    path = setup_error_file_logging(base_dir=tmp_path, logger=logger, json_format=True, max_bytes=300, backup_count=1)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed %s", "digest")
+    logger.error("second")
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = []
+
+    rotated = json.loads(path.with_name(path.name + ".1").read_text(encoding="utf-8"))
+    assert rotated["message"] == "failed digest" and "ValueError: boom" in rotated["exc"]
+    assert json.loads(path.read_text(encoding="utf-8"))["message"] == "second"
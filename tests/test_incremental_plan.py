@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from src.domain.dto import PostDTO, StoredSummaryDTO
+from src.domain.types import ChannelHandle
+from src.services.incremental import PLAN_FULL, PLAN_INCREMENTAL, PLAN_REUSE, plan_summary_update
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _posts(*ids: int) -> list[PostDTO]:
+    return [PostDTO(ChannelHandle("alpha"), i, NOW, f"post {i}", None) for i in ids]
+
+
+def _stored(*ids: int) -> StoredSummaryDTO:
+    return StoredSummaryDTO(ChannelHandle("alpha"), "- old summary", list(ids), NOW)
+
+
+def test_full_without_previous_summary():
+    plan = plan_summary_update(None, _posts(1, 2, 3), max_delta_posts=3)
+    assert plan.mode == PLAN_FULL
+    assert [p.tg_msg_id for p in plan.new_posts] == [1, 2, 3]
+
+
+def test_reuse_when_nothing_new():
+    plan = plan_summary_update(_stored(1, 2, 3), _posts(1, 2, 3), max_delta_posts=3)
+    assert plan.mode == PLAN_REUSE
+    assert plan.new_posts == []
+
+
+def test_incremental_sends_only_delta_posts():
+    plan = plan_summary_update(_stored(1, 2, 3, 4, 5), _posts(3, 4, 5, 6, 7), max_delta_posts=3)
+    assert plan.mode == PLAN_INCREMENTAL
+    assert [p.tg_msg_id for p in plan.new_posts] == [6, 7]
+    assert plan.previous.summary_text == "- old summary"
+
+
+def test_full_when_delta_is_large_or_window_rolled_over():
+    assert plan_summary_update(_stored(1, 2), _posts(2, 3, 4, 5, 6), max_delta_posts=3).mode == PLAN_FULL
+    assert plan_summary_update(_stored(1, 2), _posts(8, 9), max_delta_posts=3).mode == PLAN_FULL
@@ -0,0 +1,125 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.summarizer.endpoints import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    Endpoint,
+    EndpointPool,
+    parse_endpoints,
+)
+
+
+class Transient(Exception):
+    pass
+
+
+def _pool(*names: str, **kwargs) -> EndpointPool:
+    endpoints = [Endpoint(name, name, breaker=CircuitBreaker(failure_threshold=2)) for name in names]
+    kwargs.setdefault("backoff_base_s", 0.0)
+    return EndpointPool(
+        endpoints,
+        is_retryable=lambda e: isinstance(e, Transient),
+        rng=random.Random(0),
+        **kwargs,
+    )
+
+
+def test_breaker_opens_then_admits_single_half_open_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_pool_fails_over_to_next_endpoint_on_retryable_error():
+    pool = _pool("a", "b")
+    calls: list[str] = []
+
+    async def fn(ep):
+        calls.append(ep.name)
+        if ep.name == "a":
+            raise Transient("503")
+        return ep.name
+
+    assert asyncio.run(pool.call(fn, hedge=False)) == "b"
+    assert calls == ["a", "b"]
+
+
+def test_pool_does_not_retry_non_retryable_error():
+    pool = _pool("a", "b")
+    calls: list[str] = []
+
+    async def fn(ep):
+        calls.append(ep.name)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(pool.call(fn))
+    assert calls == ["a"]
+
+
+def test_hedged_request_takes_faster_endpoint_and_cancels_slow_one():
+    pool = _pool("slow", "fast", hedge_quantile=0.5, hedge_min_samples=1)
+    slow, fast = pool.endpoints
+    slow.record_latency(0.01)
+    fast.record_latency(0.02)
+    cancelled: list[str] = []
+
+    async def fn(ep):
+        try:
+            await asyncio.sleep(5 if ep.name == "slow" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(ep.name)
+            raise
+        return ep.name
+
+    assert asyncio.run(pool.call(fn)) == "fast"
+    assert cancelled == ["slow"]
+    assert slow.in_flight == 0 and fast.in_flight == 0
+
+
+def test_parse_endpoints_defaults_missing_key():
+    assert parse_endpoints("https://a/v1|k1, https://b/v1", "dflt") == [
+        ("https://a/v1", "k1"),
+        ("https://b/v1", "dflt"),
+    ]
+    assert parse_endpoints("", "dflt") == []
+
+
+def test_hedged_request_runs_inside_its_own_admission():
+    pool = _pool("slow", "fast", hedge_quantile=0.5, hedge_min_samples=1)
+    slow, fast = pool.endpoints
+    slow.record_latency(0.01)
+    fast.record_latency(0.02)
+    admitted: list[str] = []
+
+    @asynccontextmanager
+    async def admit():
+        admitted.append("enter")
+        try:
+            yield
+        finally:
+            admitted.append("exit")
+
+    async def fn(ep):
+        await asyncio.sleep(5 if ep.name == "slow" else 0.01)
+        return ep.name
+
+    assert asyncio.run(pool.call(fn, hedge_admit=admit)) == "fast"
+    assert admitted == ["enter", "exit"]
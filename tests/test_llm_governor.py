@@ -0,0 +1,61 @@
+import asyncio
+
+from src.summarizer.governor import LLMGovernor
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_tpm_reservation_queues_until_refill_and_reconciles_actual_usage():
+    clock = FakeClock()
+
+    async def scenario():
+        governor = LLMGovernor(tpm_limit=600, max_concurrency=4, clock=clock)
+        first = await governor.acquire(500)
+        governor.release(first, actual_tokens=100)
+
+        # 400 tokens were refunded, so the next 500-token call is admitted immediately.
+        second = await governor.acquire(500)
+
+        waiter = asyncio.create_task(governor.acquire(500))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        clock.now += 60
+        governor.release(second, actual_tokens=500)
+        await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_slot_is_queued_not_failed():
+    async def scenario():
+        governor = LLMGovernor(max_concurrency=1)
+        held = await governor.acquire(0)
+        waiter = asyncio.create_task(governor.acquire(0))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        governor.release(held)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert governor.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_throttle_halves_limit_and_successes_grow_it_back():
+    async def scenario():
+        governor = LLMGovernor(max_concurrency=8, min_concurrency=1)
+        governor.on_throttle()
+        assert governor.limit == 4
+        governor.on_throttle()
+        assert governor.limit == 2
+        for _ in range(10):
+            governor.release(await governor.acquire(0), succeeded=True)
+        assert 2 < governor.limit <= 8
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+import time
+
+from src.app.loop_monitor import LoopMonitor
+from src.app.metrics import LOOP_LAG
+
+
+def _lag_count() -> float:
+    return sum(v for name, _, v in LOOP_LAG.samples() if name.endswith("_count"))
+
+
+def test_blocking_call_is_sampled_with_stack_and_lag_recorded(caplog):
+    def block_the_loop():
+        time.sleep(0.3)
+
+    async def digest_handler():
+        await asyncio.sleep(0.05)
+        block_the_loop()
+        await asyncio.sleep(0.05)
+
+    async def run():
+        monitor = LoopMonitor(asyncio.get_running_loop(), interval_s=0.01, slow_callback_s=0.1)
+        monitor.start()
+        try:
+            await asyncio.create_task(digest_handler(), name="analytic-42")
+        finally:
+            monitor.stop()
+
+    before = _lag_count()
+    with caplog.at_level(logging.WARNING, logger="src.app.loop_monitor"):
+        asyncio.run(run())
+
+    (record,) = [r for r in caplog.records if "event loop blocked" in r.getMessage()]
+    message = record.getMessage()
+    assert "analytic-42" in message and "digest_handler" in message
+    assert "block_the_loop" in message and "time.sleep" in message
+    assert _lag_count() > before
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.app.metrics import HealthChecker, Registry
+
+
+def test_render_counters_gauges_and_cumulative_histogram_buckets():
+    registry = Registry()
+    waits = registry.counter("flood_wait_total", "FloodWaits.", ("operation",))
+    depth = registry.gauge("queue_depth", "Queued.")
+    latency = registry.histogram("command_seconds", "Latency.", ("command",), buckets=(0.1, 1.0))
+    waits.inc(operation='fetch "last"')
+    waits.inc(2, operation='fetch "last"')
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, command="analytic")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE flood_wait_total counter" in lines
+    assert 'flood_wait_total{operation="fetch \\"last\\""} 3' in lines
+    assert "queue_depth 7" in lines
+    assert 'command_seconds_bucket{command="analytic",le="0.1"} 2' in lines
+    assert 'command_seconds_bucket{command="analytic",le="1"} 3' in lines
+    assert 'command_seconds_bucket{command="analytic",le="+Inf"} 4' in lines
+    assert 'command_seconds_count{command="analytic"} 4' in lines
+    assert 'command_seconds_sum{command="analytic"} 3.65' in lines
+
+
+def test_label_set_must_match_declaration():
+    counter = Registry().counter("x_total", "X.", ("cache", "result"))
+    with pytest.raises(ValueError):
+        counter.inc(cache="token_count")
+    with pytest.raises(ValueError):
+        counter.inc(cache="token_count", result="hit", extra=1)
+
+
+def test_health_results_are_cached_until_ttl_and_timeouts_fail():
+    now = [0.0]
+    calls = {"db": 0}
+
+    async def db():
+        calls["db"] += 1
+
+    async def llm():
+        await asyncio.sleep(1)
+
+    checker = HealthChecker({"db": db, "llm": llm}, ttl_s=10, timeout_s=0.1, clock=lambda: now[0])
+
+    async def run():
+        first = await checker.check()
+        await checker.check()
+        now[0] = 11.0
+        await checker.check()
+        return first
+
+    first = asyncio.run(run())
+    assert first["db"].ok and not first["llm"].ok
+    assert first["llm"].detail.startswith("timeout")
+    assert calls["db"] == 2
@@ -0,0 +1,59 @@
+import asyncio
+
+from src.bot.outbound import OutboundDispatcher
+
+
+class FloodWait(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"retry after {retry_after}")
+        self.retry_after = retry_after
+
+
+def test_chats_keep_order_are_interleaved_and_retry_after_is_honoured():
+    async def scenario():
+        sent: list[tuple[int, str]] = []
+        flood_once = {"a1"}
+
+        async def fake_send(chat_id: int, text: str) -> str:
+            if text in flood_once:
+                flood_once.discard(text)
+                raise FloodWait(0.05)
+            sent.append((chat_id, text))
+            return text
+
+        outbound = OutboundDispatcher(global_rate=1000, chat_interval_s=0.01)
+        outbound.start()
+        jobs = [
+            outbound.send(chat_id, lambda c=chat_id, t=text: fake_send(c, t))
+            for chat_id, prefix in ((1, "a"), (2, "b"))
+            for text in (f"{prefix}{i}" for i in range(3))
+        ]
+        results = await asyncio.wait_for(asyncio.gather(*jobs), timeout=5)
+        await outbound.aclose()
+
+        assert results == ["a0", "a1", "a2", "b0", "b1", "b2"]
+        assert [t for c, t in sent if c == 1] == ["a0", "a1", "a2"]
+        assert sent[:2] == [(1, "a0"), (2, "b0")]
+        assert outbound.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_aclose_cancels_callers_of_in_flight_sends():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang() -> None:
+            started.set()
+            await asyncio.sleep(60)
+
+        outbound = OutboundDispatcher(global_rate=1000, chat_interval_s=0.0)
+        outbound.start()
+        caller = asyncio.create_task(outbound.send(1, hang))
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await outbound.aclose(drain_timeout_s=0.01)
+
+        done, _ = await asyncio.wait({caller}, timeout=5)
+        assert caller in done and caller.cancelled()
+
+    asyncio.run(scenario())
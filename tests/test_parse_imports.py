@@ -0,0 +1,37 @@
+import pytest
+
+from src.app.errors import ValidationError
+from src.parsing.imports import batch_import_handles, detect_import_format, iter_import_tokens
+
+
+def test_detect_format_by_extension_then_content():
+    assert detect_import_format("channels.CSV", "@a") == "csv"
+    assert detect_import_format(None, '\ufeff  {"channels": []}') == "json"
+    assert detect_import_format("list", "@durov") == "txt"
+
+
+def test_txt_tokens_skip_comments_and_split_lines():
+    lines = ["# team list\n", "@durov, t.me/hello_world\n", "\n", "bad\n"]
+    assert list(iter_import_tokens(lines, "txt")) == ["@durov", "t.me/hello_world", "bad"]
+
+
+def test_csv_uses_handle_column_when_header_names_one():
+    lines = ["name,username\n", "Daily news,@daily_news\n", "Channel,https://t.me/durov\n"]
+    assert list(iter_import_tokens(lines, "csv")) == ["@daily_news", "https://t.me/durov"]
+
+
+def test_json_takes_list_items_and_handle_fields_only():
+    lines = ['{"title": "technology", "channels": ["@durov", {"name": "tech", "link": "t.me/hello_world"}]}']
+    assert list(iter_import_tokens(lines, "json")) == ["@durov", "t.me/hello_world"]
+
+
+def test_batches_dedupe_across_whole_upload():
+    tokens = ["@alpha1", "alpha1", "??", "@alpha2", "@alpha3", "t.me/alpha2"]
+    batches = list(batch_import_handles(tokens, batch_size=2))
+    assert [[str(h) for h in b.handles] for b in batches] == [["alpha1", "alpha2"], ["alpha3"]]
+    assert [b.invalid_tokens for b in batches] == [["??"], []]
+
+
+def test_malformed_json_raises_validation_error():
+    with pytest.raises(ValidationError):
+        list(iter_import_tokens(['{"channels": ['], "json"))
@@ -0,0 +1,91 @@
+import asyncio
+import math
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from src.services.quota import COMMAND_ADD, QuotaDecision, QuotaPolicy, admit, estimate_analytic_cost  # noqa: E402
+
+
+class _Transaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeConn:
+    def __init__(self, elapsed_s: float) -> None:
+        self.buckets: dict[tuple[int, str], float] = {}
+        self.elapsed_s = elapsed_s
+
+    def transaction(self) -> _Transaction:
+        return _Transaction()
+
+    async def fetchrow(self, sql, tg_user_id, command, capacity):
+        tokens = self.buckets.setdefault((tg_user_id, command), capacity)
+        return {"tokens": tokens, "elapsed_s": self.elapsed_s}
+
+    async def execute(self, sql, tg_user_id, command, tokens):
+        self.buckets[(tg_user_id, command)] = tokens
+
+
+class _FakePool:
+    def __init__(self, elapsed_s: float = 0.0) -> None:
+        self.conn = _FakeConn(elapsed_s)
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def test_estimate_analytic_cost_caps_channels_per_call():
+    assert estimate_analytic_cost(12, posts_per_channel=10, max_channels_per_call=5) == 50
+    assert estimate_analytic_cost(3, posts_per_channel=10, max_channels_per_call=5) == 30
+    assert estimate_analytic_cost(0, posts_per_channel=10, max_channels_per_call=5) == 0
+
+
+def test_admit_debits_then_rejects_with_wait_hint():
+    pool = _FakePool()
+    policy = QuotaPolicy(capacity=100, refill_per_hour=360)
+
+    first = asyncio.run(admit(pool, 1, COMMAND_ADD, 60, policy))
+    assert first.allowed and first.remaining == pytest.approx(40)
+
+    second = asyncio.run(admit(pool, 1, COMMAND_ADD, 60, policy))
+    assert not second.allowed
+    assert second.remaining == pytest.approx(40)
+    assert second.retry_after_s == pytest.approx(200)
+
+
+def test_admit_clamps_oversized_cost_and_reports_no_refill():
+    pool = _FakePool()
+    policy = QuotaPolicy(capacity=100, refill_per_hour=0)
+
+    full = asyncio.run(admit(pool, 1, COMMAND_ADD, 500, policy))
+    assert full.allowed and full.cost == 100 and full.remaining == pytest.approx(0)
+
+    denied = asyncio.run(admit(pool, 1, COMMAND_ADD, 1, policy))
+    assert not denied.allowed and math.isinf(denied.retry_after_s)
+
+
+def test_format_quota_denied_rounds_wait_to_minutes():
+    pytest.importorskip("aiogram")
+    from src.bot.handlers import format_quota_denied
+
+    def decision(retry_after_s: float) -> QuotaDecision:
+        return QuotaDecision(allowed=False, cost=1, remaining=0, retry_after_s=retry_after_s)
+
+    assert format_quota_denied("/add", decision(math.inf)) == "⏳ Лимит на /add исчерпан."
+    assert format_quota_denied("/add", decision(10)) == "⏳ Лимит на /add исчерпан. Попробуйте через 1 мин."
+    assert format_quota_denied("/analytic", decision(200)) == "⏳ Лимит на /analytic исчерпан. Попробуйте через 3 мин."
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.app.errors import SummarizeError
+from src.domain.dto import PostDTO
+from src.domain.types import ChannelHandle
+from src.summarizer.prompts import (
+    BatchPromptSection,
+    build_batch_summary_prompt,
+    build_budgeted_summary_prompt,
+    build_map_summary_prompt,
+    build_reduce_summary_prompt,
+    build_summary_prompt,
+    parse_batch_summary_response,
+    split_posts_into_groups,
+)
+from src.summarizer.tokens import build_token_counter
+
+
+def _post(handle: str, msg_id: int, text: str) -> PostDTO:
+    return PostDTO(
+        channel_handle=ChannelHandle(handle),
+        tg_msg_id=msg_id,
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=text,
+        permalink=f"https://t.me/{handle}/{msg_id}",
+    )
+
+
+def test_batch_prompt_delimits_each_section():
+    sections = [
+        BatchPromptSection("C1", ChannelHandle("alpha"), "https://t.me/alpha", [_post("alpha", 1, "one")]),
+        BatchPromptSection("C2", ChannelHandle("bravo"), "https://t.me/bravo", [_post("bravo", 2, "two")]),
+    ]
+    prompt = build_batch_summary_prompt(sections)
+    assert "=== BEGIN C1 ===" in prompt and "=== END C1 ===" in prompt
+    assert "=== BEGIN C2 ===" in prompt and "=== END C2 ===" in prompt
+    assert prompt.index("one") < prompt.index("=== END C1 ===") < prompt.index("two")
+
+
+def test_parse_batch_response_handles_fences_and_unknown_ids():
+    raw = '```json\n{"channels": [{"id": "C1", "summary": "- a"}, {"id": "C9", "summary": "- x"}]}\n```'
+    assert parse_batch_summary_response(raw, ["C1", "C2"]) == {"C1": "- a"}
+
+
+def test_parse_batch_response_returns_empty_on_garbage():
+    assert parse_batch_summary_response("not json at all", ["C1"]) == {}
+
+
+def test_budgeted_prompt_keeps_everything_when_it_fits():
+    counter = build_token_counter("heuristic")
+    posts = [_post("alpha", i, f"post {i}") for i in range(1, 4)]
+    built = build_budgeted_summary_prompt(
+        ChannelHandle("alpha"), "https://t.me/alpha", posts, counter=counter, budget_tokens=10_000
+    )
+    assert built.posts == posts
+    assert built.prompt == build_summary_prompt(ChannelHandle("alpha"), "https://t.me/alpha", posts)
+
+
+def test_budgeted_prompt_prefers_newest_and_stays_within_budget():
+    counter = build_token_counter("heuristic")
+    posts = [_post("alpha", i, "слово " * 200) for i in range(1, 6)]
+    budget = 300
+    built = build_budgeted_summary_prompt(
+        ChannelHandle("alpha"), "https://t.me/alpha", posts, counter=counter, budget_tokens=budget
+    )
+    assert built.tokens <= budget
+    assert built.posts and built.posts[-1].tg_msg_id == 5
+    assert [p.tg_msg_id for p in built.posts] == sorted(p.tg_msg_id for p in built.posts)
+
+
+def test_token_counter_truncate_fits_budget():
+    counter = build_token_counter("heuristic")
+    text = "тестовое предложение " * 50
+    cut = counter.truncate(text, 20)
+    assert cut.endswith("…")
+    assert counter.count(cut) <= 20
+
+
+def test_split_posts_into_groups_respects_budget_and_order():
+    counter = build_token_counter("heuristic")
+    posts = [_post("alpha", i, f"Новость номер {i} " * 20) for i in range(1, 11)]
+    groups = split_posts_into_groups(posts, counter=counter, group_budget_tokens=200)
+
+    assert len(groups) > 1
+    assert [p.tg_msg_id for g in groups for p in g] == list(range(1, 11))
+    for group in groups:
+        cost = sum(counter.count(p.text) for p in group)
+        assert cost <= 200
+
+
+def test_split_posts_into_groups_truncates_oversized_post():
+    counter = build_token_counter("heuristic")
+    posts = [_post("alpha", 1, "слово " * 500), _post("alpha", 2, "short")]
+    groups = split_posts_into_groups(posts, counter=counter, group_budget_tokens=100)
+
+    assert groups[0][0].text.endswith("…")
+    assert counter.count(groups[0][0].text) <= 100
+
+
+def test_reduce_prompt_lists_partials_in_order():
+    prompt = build_reduce_summary_prompt(ChannelHandle("alpha"), "https://t.me/alpha", ["- a", "- b"])
+    assert prompt.index("ЧАСТЬ #1:\n- a") < prompt.index("ЧАСТЬ #2:\n- b")
+    assert "4-8 буллетов" in prompt
+
+
+def test_prompts_for_different_channels_share_instruction_prefix():
+    a = build_summary_prompt(ChannelHandle("alpha"), "https://t.me/alpha", [_post("alpha", 1, "one")])
+    b = build_summary_prompt(ChannelHandle("bravo"), "https://t.me/bravo", [_post("bravo", 2, "two")])
+    shared = a[: next(i for i, (x, y) in enumerate(zip(a, b)) if x != y)]
+    assert shared.endswith("Канал: ") and "Язык: русский" in shared
+
+    m1 = build_map_summary_prompt(ChannelHandle("alpha"), "https://t.me/alpha", [], part=1, total=3)
+    m2 = build_map_summary_prompt(ChannelHandle("bravo"), "https://t.me/bravo", [], part=2, total=3)
+    assert m1.index("Канал: alpha") == m2.index("Канал: bravo")
+
+
+def test_budgeted_prompt_refuses_budget_below_fixed_prompt():
+    counter = build_token_counter("heuristic")
+    posts = [_post("alpha", 1, "слово " * 50)]
+    with pytest.raises(SummarizeError):
+        build_budgeted_summary_prompt(
+            ChannelHandle("alpha"), "https://t.me/alpha", posts, counter=counter, budget_tokens=10
+        )
@@ -0,0 +1,21 @@
+from src.summarizer.tokens import heuristic_token_count
+from src.transform.text import expand_url_placeholders, normalize_for_prompt
+
+
+def test_normalizer_compacts_noise_and_reports_savings():
+    url = "https://example.com/article?utm_source=tg&utm_medium=social&utm_campaign=spring"
+    raw = f"**Новости**​!!!!! 🔥🔥🔥🔥 Читайте {url}.\n\n\n [Анонс](https://t.me/alpha/5)... ｆｕｌｌ"
+
+    out = normalize_for_prompt(raw, url_map={}, count_tokens=heuristic_token_count)
+
+    assert out.text == "Новости! 🔥 Читайте [L1]. Анонс [L2]… full"
+    assert out.chars_saved > 0 and out.tokens_saved > 0
+
+
+def test_url_placeholders_are_shared_per_channel_and_expand_back():
+    url_map: dict[str, str] = {}
+    first = normalize_for_prompt("see https://a.example/x", url_map=url_map)
+    second = normalize_for_prompt("again https://a.example/x and https://b.example/y", url_map=url_map)
+
+    assert first.text == "see [L1]" and second.text == "again [L1] and [L2]"
+    assert expand_url_placeholders("- [L2] и [L1] [L7]", url_map) == "- https://b.example/y и https://a.example/x [L7]"
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from src.app.tracing import OtlpJsonLinesExporter, Tracer, install_tracer, start_span, traced
+
+
+class _Collect:
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(spans)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def exporter():
+    collect = _Collect()
+    install_tracer(Tracer(collect, sample_ratio=1.0))
+    yield collect
+    install_tracer(None)
+
+
+def test_trace_is_exported_once_when_root_ends_with_task_children(exporter):
+    @traced("child")
+    async def child(n):
+        with start_span("leaf", n=n):
+            await asyncio.sleep(0)
+
+    async def run():
+        with start_span("root", channels=2):
+            await asyncio.gather(child(1), child(2))
+
+    asyncio.run(run())
+    assert len(exporter.batches) == 1
+    spans = {s.span_id: s for s in exporter.batches[0]}
+    root = next(s for s in spans.values() if s.name == "root")
+    children = [s for s in spans.values() if s.name == "child"]
+    assert {s.trace_id for s in spans.values()} == {root.trace_id}
+    assert all(c.parent_id == root.span_id for c in children)
+    assert sorted(spans[s.parent_id].name for s in spans.values() if s.name == "leaf") == ["child", "child"]
+    assert all(s.end_unix_ns >= s.start_unix_ns for s in spans.values())
+
+
+def test_unsampled_root_drops_whole_trace():
+    collect = _Collect()
+    install_tracer(Tracer(collect, sample_ratio=0.0))
+    try:
+        with start_span("root") as root:
+            with start_span("child") as child:
+                child.set_attributes(x=1)
+    finally:
+        install_tracer(None)
+    assert not root.sampled and child is root
+    assert collect.batches == []
+
+
+def test_otlp_json_line_shape_and_error_status(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer(OtlpJsonLinesExporter(path), sample_ratio=1.0)
+    install_tracer(tracer)
+    try:
+        with pytest.raises(ValueError):
+            with start_span("root", channel="durov", tokens=12, hit=True):
+                with start_span("llm.request"):
+                    raise ValueError("boom")
+    finally:
+        install_tracer(None)
+        tracer.close()
+
+    (line,) = path.read_text(encoding="utf-8").splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root = next(s for s in spans if s["name"] == "root")
+    child = next(s for s in spans if s["name"] == "llm.request")
+    assert child["parentSpanId"] == root["spanId"] and "parentSpanId" not in root
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert {"key": "tokens", "value": {"intValue": "12"}} in root["attributes"]
+    assert {"key": "hit", "value": {"boolValue": True}} in root["attributes"]
+    assert child["status"] == {"code": 2, "message": "boom"}
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from src.domain.dto import PostDTO
+from src.domain.types import ChannelHandle
+from src.transform.posts import iter_transform_posts, transform_posts
+
+
+def _post(msg_id: int, text: str, *, clean: bool = False) -> PostDTO:
+    return PostDTO(
+        channel_handle=ChannelHandle("alpha"),
+        tg_msg_id=msg_id,
+        date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        text=text,
+        permalink=None,
+        clean=clean,
+    )
+
+
+def test_clean_unchanged_post_is_reused_and_dirty_post_is_rebuilt():
+    already = _post(1, "short and clean", clean=True)
+    dirty = _post(2, "  messy \n\n text  ")
+
+    out = transform_posts([already, dirty], max_chars_per_post=100)
+
+    assert out[0] is already
+    assert out[1].text == "messy text" and out[1].clean
+    assert not hasattr(out[1], "__dict__")
+
+
+def test_iter_transform_posts_is_lazy_and_filters_short_posts():
+    source = iter([_post(1, "ok", clean=True), _post(2, "long enough text", clean=True)])
+    stream = iter_transform_posts(source, min_chars_per_post=5)
+
+    assert next(stream).tg_msg_id == 2